@@ -0,0 +1,129 @@
+"""
+Numeric Extractor Micro-Benchmark.
+
+Week 12: TruthBoundaryGate.parse_numerical_output (linear-time scan) vs the
+legacy backtracking regex, on realistic stdout and adversarial inputs.
+
+Each case is run at growing sizes; a linear extractor keeps a flat
+microseconds-per-KB column, the legacy regex does not. Legacy runs are
+skipped above --legacy-max-bytes (they can take minutes).
+
+Usage:
+    python scripts/benchmark_numeric_extractor.py
+    python scripts/benchmark_numeric_extractor.py --sizes 1000 10000 100000 1000000 --output extractor_bench.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.truth_boundary.numeric_extractor import extract_numbers
+
+
+LEGACY_PATTERN = r'([a-zA-Z_][\w\s\-]*?)[\s:=]+(-?\d+\.?\d*(?:[eE][+-]?\d+)?%?)'
+
+
+def legacy_extract(stdout: str) -> Dict[str, float]:
+    """parse_numerical_output before Week 12 (pattern rebuilt per call)."""
+    results = {}
+    for key, value_str in re.findall(LEGACY_PATTERN, stdout):
+        key_clean = key.strip().replace(' ', '_').replace('-', '_')
+        try:
+            results[key_clean] = float(value_str.replace('%', ''))
+        except ValueError:
+            continue
+    return results
+
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+# name -> size -> text
+CASES: Dict[str, Callable[[int], str]] = {
+    # Realistic
+    "key_value_report": lambda n: _repeat(
+        "Sharpe Ratio: 1.42\nMean Return = 0.0234\nVolatility 15.2%\nP-value: 1e-05\n", n),
+    "dataframe_dump": lambda n: _repeat(
+        "2024-01-02    472.65    474.30    470.10    473.88    71843200\n", n),
+    # Adversarial
+    "whitespace_run": lambda n: "a" + " " * (n - 2) + "x",
+    "tab_newline_run": lambda n: "key" + _repeat("\t \n", n - 4) + "x",
+    "words_no_numbers": lambda n: _repeat("alpha beta gamma ", n),
+    "separators_no_numbers": lambda n: _repeat("key :=: ", n),
+    "dangling_exponent": lambda n: _repeat("a 1e", n),
+    "unclosed_keys": lambda n: _repeat("a(", n),
+    "many_matches": lambda n: _repeat("k 1 ", n),
+}
+
+
+def time_call(fn: Callable[[str], Any], text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(sizes: List[int], legacy_max_bytes: int, repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for name, make in CASES.items():
+        for size in sizes:
+            text = make(size)
+            row = {
+                "case": name,
+                "bytes": len(text),
+                "extractor_ms": round(time_call(extract_numbers, text, repeat) * 1000, 3),
+                "legacy_ms": None,
+            }
+            if len(text) <= legacy_max_bytes:
+                row["legacy_ms"] = round(time_call(legacy_extract, text, repeat) * 1000, 3)
+                # Same answers on every input we can afford to check
+                assert extract_numbers(text) == legacy_extract(text), f"Mismatch on {name}"
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark numeric extraction from VEE stdout")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000],
+                        help='Input sizes in bytes')
+    parser.add_argument('--legacy-max-bytes', type=int, default=10_000,
+                        help='Largest input to run the legacy regex on')
+    parser.add_argument('--repeat', type=int, default=3, help='Best-of repetitions')
+    parser.add_argument('--output', type=str, help='Optional JSON output path')
+
+    args = parser.parse_args()
+
+    results = benchmark(args.sizes, args.legacy_max_bytes, args.repeat)
+
+    print(f"{'case':<24}{'bytes':>10}{'extractor ms':>14}{'us/KB':>9}{'legacy ms':>12}")
+    for r in results:
+        per_kb = r["extractor_ms"] * 1000 / max(1, r["bytes"] / 1024)
+        legacy = f"{r['legacy_ms']:.3f}" if r["legacy_ms"] is not None else "-"
+        print(f"{r['case']:<24}{r['bytes']:>10}{r['extractor_ms']:>14.3f}{per_kb:>9.1f}{legacy:>12}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "metadata": {
+                    "run_date": datetime.now(UTC).isoformat(),
+                    "sizes": args.sizes,
+                    "legacy_max_bytes": args.legacy_max_bytes,
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+TIM Batch Throughput Benchmark.
+
+Week 12: TemporalIntegrityChecker.check_batch vs one-at-a-time check_code
+over a synthetic corpus of generated plan snippets.
+
+Modes:
+- sequential: check_code per snippet (cached analyzer, as golden-set runs did)
+- batch: check_batch in-process (dedup by hash, windowed streaming)
+- batch_pool: check_batch with a process pool
+
+Usage:
+    python scripts/benchmark_tim_batch.py --snippets 100000 --duplicates 0.3
+    python scripts/benchmark_tim_batch.py --snippets 100000 --workers 8 --output tim_bench.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.temporal.integrity_checker import TemporalIntegrityChecker
+from src.validation.code_analysis import CodeAnalyzer
+
+
+TICKERS = ["SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TLT", "GLD", "IWM"]
+
+TEMPLATES = [
+    """
+import yfinance as yf
+import pandas as pd
+
+df = yf.download('{ticker}', start='{start}', end='{end}')
+df['return'] = df['Close'].pct_change()
+df['lagged'] = df['return'].shift({shift})
+print(df['return'].corr(df['lagged']))
+""",
+    """
+import yfinance as yf
+import numpy as np
+
+prices = yf.download('{ticker}', start='{start}', end='{end}')['Close']
+returns = prices.pct_change().dropna()
+sharpe = returns.mean() / returns.std() * np.sqrt(252)
+print(f"sharpe: {{sharpe}}")
+""",
+    """
+import yfinance as yf
+
+df = yf.download('{ticker}', start='{start}', end='{end}')
+df['ma'] = df['Close'].rolling({window}, center={center}).mean()
+last = df.iloc[-1]
+print(last['ma'])
+""",
+    """
+import yfinance as yf
+import pandas as pd
+
+data = yf.download(['{ticker}', 'SPY'], start='{start}', end='{end}')['Close']
+returns = data.pct_change().dropna()
+beta = returns['{ticker}'].cov(returns['SPY']) / returns['SPY'].var()
+print(json.dumps({{'beta': float(beta)}}))
+""",
+]
+
+
+def generate_corpus(n: int, duplicates: float, seed: int = 42) -> List[str]:
+    """Synthetic plan snippets; `duplicates` of them repeat earlier ones."""
+    rng = random.Random(seed)
+    corpus: List[str] = []
+    for _ in range(n):
+        if corpus and rng.random() < duplicates:
+            corpus.append(rng.choice(corpus))
+            continue
+        year = rng.randint(2015, 2025)
+        corpus.append(rng.choice(TEMPLATES).format(
+            ticker=rng.choice(TICKERS),
+            start=f"{year - rng.randint(1, 5)}-01-01",
+            end=f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            shift=rng.choice([1, 5, 20, -1, -5]),
+            window=rng.randint(5, 200),
+            center=rng.random() < 0.1,
+        ))
+    return corpus
+
+
+def run_mode(name: str, check: Callable[[Iterable[str]], Iterable[Any]], corpus: List[str]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    violations = sum(1 for result in check(corpus) if result.has_violations)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": name,
+        "seconds": round(elapsed, 3),
+        "snippets_per_sec": round(len(corpus) / elapsed, 1),
+        "with_violations": violations,
+    }
+
+
+def benchmark(corpus: List[str], workers: int, query_date: datetime) -> List[Dict[str, Any]]:
+    results = []
+
+    tim = TemporalIntegrityChecker(analyzer=CodeAnalyzer())
+    results.append(run_mode(
+        "sequential",
+        lambda codes: (tim.check_code(code, query_date) for code in codes),
+        corpus
+    ))
+
+    tim = TemporalIntegrityChecker(analyzer=CodeAnalyzer())
+    results.append(run_mode(
+        "batch",
+        lambda codes: tim.check_batch(codes, query_date, max_workers=1),
+        corpus
+    ))
+
+    if workers > 1:
+        tim = TemporalIntegrityChecker(analyzer=CodeAnalyzer())
+        results.append(run_mode(
+            f"batch_pool[{workers}]",
+            lambda codes: tim.check_batch(codes, query_date, max_workers=workers),
+            corpus
+        ))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TIM batch checking")
+    parser.add_argument('--snippets', type=int, default=100_000, help='Corpus size')
+    parser.add_argument('--duplicates', type=float, default=0.3, help='Fraction of repeated snippets')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Pool size for batch_pool')
+    parser.add_argument('--query-date', type=str, default='2024-01-15', help='Query date (ISO 8601)')
+    parser.add_argument('--output', type=str, help='Optional JSON output path')
+
+    args = parser.parse_args()
+
+    print(f"Generating {args.snippets} snippets ({args.duplicates:.0%} duplicates)...")
+    corpus = generate_corpus(args.snippets, args.duplicates)
+    results = benchmark(corpus, args.workers, datetime.fromisoformat(args.query_date))
+
+    baseline = results[0]["seconds"]
+    print(f"\n{'mode':<16}{'seconds':>10}{'snippets/s':>14}{'speedup':>10}")
+    for r in results:
+        print(f"{r['mode']:<16}{r['seconds']:>10.2f}{r['snippets_per_sec']:>14.0f}{baseline / r['seconds']:>9.2f}x")
+
+    # Every mode must agree on which snippets violate
+    assert len({r["with_violations"] for r in results}) == 1, "Modes disagree"
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "metadata": {
+                    "run_date": datetime.now(UTC).isoformat(),
+                    "snippets": args.snippets,
+                    "duplicates": args.duplicates,
+                    "cpu_count": os.cpu_count(),
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,14 @@
 
 Week 2 Day 2: YFinance adapter for market data ingestion.
 Week 11: AlphaVantage adapter with circuit breaker for production resilience.
+Week 12: Background prefetcher overlapping data download with PLAN,
+         including speculative prefetch from raw query text.
 """
 
 from .yfinance_adapter import YFinanceAdapter, MarketData
 from .alpha_vantage_adapter import AlphaVantageAdapter, CircuitBreaker
 from .data_source_router import DataSourceRouter, DataSourcePriority
+from .market_data_prefetcher import MarketDataPrefetcher, PrefetchHints, extract_prefetch_hints
 
 __all__ = [
     "YFinanceAdapter",
@@ -14,5 +17,8 @@ __all__ = [
     "AlphaVantageAdapter",
     "CircuitBreaker",
     "DataSourceRouter",
-    "DataSourcePriority"
+    "DataSourcePriority",
+    "MarketDataPrefetcher",
+    "PrefetchHints",
+    "extract_prefetch_hints"
 ]
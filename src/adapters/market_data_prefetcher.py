@@ -0,0 +1,354 @@
+"""
+Market data prefetcher for the FETCH node.
+
+Week 12: Overlap market data download with LLM plan generation.
+
+Design:
+- Background thread pool calls YFinanceAdapter.fetch_ohlcv, which warms
+  the adapter's TTL cache
+- Requests are deduplicated while in flight (single-flight per key)
+- FETCH calls get() to reuse an in-flight or finished prefetch instead of
+  issuing a second download
+- speculate() runs on the raw query text before PLAN has produced anything:
+  likely tickers and a (generous) date window are downloaded, and get()
+  serves any PLAN range the speculative window covers by slicing it.
+  Hit/waste counters show whether speculation pays for itself.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import re
+import threading
+
+import pandas as pd
+
+from .yfinance_adapter import YFinanceAdapter
+
+
+logger = logging.getLogger(__name__)
+
+PrefetchKey = Tuple[str, str, str, str]
+
+# Uppercase words that look like tickers but are not (union of the stop-word
+# lists used by the query decomposers, plus common finance acronyms).
+_NON_TICKERS = {
+    'A', 'I', 'AND', 'OR', 'THE', 'FOR', 'IN', 'ON', 'AT', 'TO', 'FROM', 'IS',
+    'AS', 'ARE', 'OF', 'VS', 'PE', 'EPS', 'ROE', 'ROI', 'ROA', 'ETF', 'CAGR',
+    'YTD', 'USD', 'EUR', 'GDP', 'CPI', 'FED', 'IPO', 'CEO', 'CFO', 'EBIT',
+    'EBITDA', 'NAV', 'VAR', 'CVAR', 'API', 'US', 'USA', 'AI', 'DCF', 'FCF',
+}
+_TICKER_PATTERN = re.compile(r'\b[A-Z]{1,5}(?:\.[A-Z])?\b')
+_YEAR_PATTERN = re.compile(r'\b(19[5-9]\d|20\d{2})\b')
+_LOOKBACK_PATTERN = re.compile(
+    r'\b(?:last|past|previous|trailing)\s+(\d+)\s*(year|yr|month|week|day)s?\b',
+    re.IGNORECASE
+)
+_LOOKBACK_DAYS = {'year': 365, 'yr': 365, 'month': 31, 'week': 7, 'day': 1}
+
+
+@dataclass
+class PrefetchHints:
+    """Tickers and date window guessed from raw query text."""
+    tickers: List[str] = field(default_factory=list)
+    start_date: str = ""
+    end_date: str = ""
+
+
+def extract_prefetch_hints(
+    query_text: str,
+    today: Optional[date] = None,
+    default_lookback_years: int = 5,
+    max_tickers: int = 5
+) -> PrefetchHints:
+    """
+    Guess which OHLCV requests PLAN is likely to emit for a query.
+
+    The window is deliberately wide: a superset of PLAN's eventual range is
+    still a cache hit (served by slicing), a narrower one is not.
+
+    Args:
+        query_text: Raw user query
+        today: Reference date (defaults to date.today())
+        default_lookback_years: Window when the query names no period
+        max_tickers: Upper bound on speculative downloads per query
+
+    Returns:
+        PrefetchHints (tickers empty if nothing looks like a symbol)
+    """
+    today = today or date.today()
+    end = today + timedelta(days=1)  # yfinance end_date is exclusive
+
+    tickers: List[str] = []
+    for match in _TICKER_PATTERN.findall(query_text):
+        if match not in _NON_TICKERS and match not in tickers:
+            tickers.append(match)
+
+    years = [int(y) for y in _YEAR_PATTERN.findall(query_text)]
+    lookback = _LOOKBACK_PATTERN.search(query_text)
+
+    if years:
+        start = date(min(years), 1, 1)
+        end = min(end, date(max(years) + 1, 1, 1))
+    elif lookback:
+        days = int(lookback.group(1)) * _LOOKBACK_DAYS[lookback.group(2).lower()]
+        # Slack for PLAN rounding "last year" to calendar boundaries
+        start = today - timedelta(days=days + 31)
+    elif 'ytd' in query_text.lower() or 'year to date' in query_text.lower():
+        start = date(today.year - 1, 12, 1)
+    else:
+        start = date(today.year - default_lookback_years, 1, 1)
+
+    return PrefetchHints(
+        tickers=tickers[:max_tickers],
+        start_date=start.isoformat(),
+        end_date=end.isoformat()
+    )
+
+
+class MarketDataPrefetcher:
+    """
+    Background OHLCV prefetcher with in-flight deduplication.
+
+    Usage:
+        prefetcher = MarketDataPrefetcher(adapter)
+        prefetcher.prefetch("SPY", "2023-01-01", "2023-12-31")
+        ...
+        df = prefetcher.get("SPY", "2023-01-01", "2023-12-31")  # waits if in flight
+    """
+
+    def __init__(
+        self,
+        adapter: YFinanceAdapter,
+        max_workers: int = 4,
+        max_tracked: int = 256
+    ):
+        """
+        Initialize prefetcher.
+
+        Args:
+            adapter: Adapter whose cache is warmed
+            max_workers: Concurrent downloads
+            max_tracked: Finished prefetches remembered for get() (oldest dropped)
+        """
+        self.adapter = adapter
+        self.max_tracked = max_tracked
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="prefetch"
+        )
+        self._futures: Dict[PrefetchKey, Future] = {}
+        self._speculative: Set[PrefetchKey] = set()
+        self._speculative_used: Set[PrefetchKey] = set()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "requested": 0,
+            "deduplicated": 0,
+            "served": 0,
+            "failed": 0,
+            "speculated": 0,
+            "speculative_hits": 0,
+        }
+
+    @staticmethod
+    def _key(ticker: str, start_date: str, end_date: str, interval: str) -> PrefetchKey:
+        return (ticker.upper(), start_date, end_date, interval)
+
+    def prefetch(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        interval: str = '1d'
+    ) -> Future:
+        """
+        Start downloading OHLCV in the background (no-op if already started).
+
+        Returns:
+            Future resolving to the DataFrame
+        """
+        return self._submit(ticker, start_date, end_date, interval)
+
+    def _submit(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        speculative: bool = False
+    ) -> Future:
+        """Start (or join) a download; speculative ones count towards hit/waste."""
+        key = self._key(ticker, start_date, end_date, interval)
+
+        with self._lock:
+            self.stats["requested"] += 1
+            future = self._futures.get(key)
+            if future is not None:
+                self.stats["deduplicated"] += 1
+                return future
+
+            future = self._executor.submit(
+                self.adapter.fetch_ohlcv, ticker, start_date, end_date, interval
+            )
+            self._futures[key] = future
+            if speculative:
+                self._speculative.add(key)
+                self.stats["speculated"] += 1
+            self._evict_finished()
+
+        logger.debug(f"Prefetching {ticker} {start_date}..{end_date}")
+        return future
+
+    def prefetch_requirements(self, requirements: Iterable[Any]) -> int:
+        """
+        Prefetch every OHLCV requirement of a plan.
+
+        Args:
+            requirements: DataRequirement models or plan dicts
+
+        Returns:
+            Number of prefetches started (or joined)
+        """
+        count = 0
+        for req in requirements:
+            if not isinstance(req, dict):
+                req = req.model_dump()
+
+            source = (req.get('source') or 'yfinance').lower()
+            data_type = (req.get('data_type') or 'ohlcv').lower()
+            if source == 'fred' or data_type != 'ohlcv':
+                continue
+            if not req.get('ticker') or not req.get('start_date') or not req.get('end_date'):
+                continue
+
+            self.prefetch(req['ticker'], req['start_date'], req['end_date'], req.get('interval', '1d'))
+            count += 1
+
+        return count
+
+    def speculate(self, query_text: str, today: Optional[date] = None) -> List[str]:
+        """
+        Start downloads for tickers guessed from the raw query text.
+
+        Called as soon as a query is accepted, before PLAN has produced
+        anything. Whatever PLAN later asks for inside the guessed window is
+        served from these downloads.
+
+        Args:
+            query_text: Raw user query
+            today: Reference date (for tests)
+
+        Returns:
+            Tickers being prefetched
+        """
+        hints = extract_prefetch_hints(query_text, today=today)
+
+        for ticker in hints.tickers:
+            self._submit(ticker, hints.start_date, hints.end_date, '1d', speculative=True)
+
+        if hints.tickers:
+            logger.info(
+                f"Speculative prefetch: {hints.tickers} "
+                f"{hints.start_date}..{hints.end_date}"
+            )
+        return hints.tickers
+
+    def get(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        interval: str = '1d',
+        timeout: Optional[float] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Result of a prefetch for this request, waiting if it is in flight.
+
+        Returns:
+            DataFrame, or None if nothing was prefetched or the prefetch failed
+        """
+        key = self._key(ticker, start_date, end_date, interval)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                key = self._covering_key(key)
+                future = self._futures.get(key) if key else None
+
+        if future is None:
+            return None
+
+        try:
+            data = future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Prefetch for {ticker} failed: {e}")
+            with self._lock:
+                self.stats["failed"] += 1
+            return None
+
+        if key[1:3] != (start_date, end_date):
+            data = self._slice(data, start_date, end_date)
+
+        with self._lock:
+            self.stats["served"] += 1
+            if key in self._speculative and key not in self._speculative_used:
+                self._speculative_used.add(key)
+                self.stats["speculative_hits"] += 1
+        return data
+
+    def _covering_key(self, key: PrefetchKey) -> Optional[PrefetchKey]:
+        """Speculative prefetch whose window contains key's (caller holds lock)."""
+        ticker, start_date, end_date, interval = key
+        for candidate in self._speculative:
+            if (
+                candidate[0] == ticker
+                and candidate[3] == interval
+                and candidate[1] <= start_date
+                and candidate[2] >= end_date
+                and candidate in self._futures
+            ):
+                return candidate
+        return None
+
+    @staticmethod
+    def _slice(data: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+        """Rows in [start_date, end_date), matching yfinance's end semantics."""
+        index = data.index
+        if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+            index = index.tz_localize(None)
+        mask = (index >= pd.Timestamp(start_date)) & (index < pd.Timestamp(end_date))
+        return data.loc[mask]
+
+    def _evict_finished(self) -> None:
+        """Drop oldest finished futures beyond max_tracked (caller holds lock)."""
+        overflow = len(self._futures) - self.max_tracked
+        if overflow <= 0:
+            return
+        for key in [k for k, f in self._futures.items() if f.done()][:overflow]:
+            del self._futures[key]
+            self._speculative.discard(key)
+            self._speculative_used.discard(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Prefetch counters.
+
+        speculative_hit_ratio: share of speculative downloads FETCH used.
+        speculative_waste_ratio: share not (yet) used - includes downloads
+        for queries still in flight.
+        """
+        with self._lock:
+            speculated = self.stats["speculated"]
+            hit_ratio = self.stats["speculative_hits"] / speculated if speculated else 0.0
+            return {
+                **self.stats,
+                "tracked": len(self._futures),
+                "speculative_hit_ratio": hit_ratio,
+                "speculative_waste_ratio": 1.0 - hit_ratio if speculated else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop worker threads (pending downloads are abandoned)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
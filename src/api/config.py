@@ -59,6 +59,9 @@ class APISettings(BaseSettings):
     neo4j_password: str = Field("ape_neo4j_pass", env="NEO4J_PASSWORD")
     redis_url: str = Field("redis://localhost:6380/0", env="REDIS_URL")
 
+    # WebSocket pub/sub across replicas ("local" = single process, "redis")
+    websocket_pubsub_backend: str = Field("local", env="WEBSOCKET_PUBSUB_BACKEND")
+
     # Query Execution
     query_timeout_seconds: int = Field(120, env="QUERY_TIMEOUT_SECONDS")
     max_concurrent_queries: int = Field(10, env="MAX_CONCURRENT_QUERIES")
@@ -0,0 +1,411 @@
+"""Write-behind ledger for API cost records.
+
+Week 12: Take cost persistence off the request path.
+
+CostTracker used to issue one INSERT per LLM call. With a CostLedger
+attached, records are buffered in memory and flushed in bulk (COPY, or a
+multi-row executemany fallback) when the buffer reaches max_batch or every
+flush_interval_seconds, whichever comes first.
+
+Durability: each buffered record is also appended to a small local spill
+file (JSON lines). The file is rewritten after every successful flush and
+replayed by start(), so a crash loses nothing that was accepted. Delivery is
+at-least-once: a crash between the DB commit and the spill rewrite can
+replay a batch.
+
+Running totals per (day, provider, model) are kept in memory so that
+current-day summaries are served without touching the DB. They are seeded
+from daily_cost_summary on start(); writes from other replicas made after
+that are not reflected.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+COST_COLUMNS = (
+    "request_id", "endpoint", "http_method", "provider", "model",
+    "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens",
+    "cost_usd", "user_id", "ticker", "query_type",
+    "latency_ms", "status_code", "error_message", "created_at",
+)
+
+
+@dataclass
+class CostRecord:
+    """One api_costs row."""
+    request_id: str
+    endpoint: str
+    http_method: str
+    provider: str
+    model: Optional[str]
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: float = 0.0
+    user_id: Optional[str] = None
+    ticker: Optional[str] = None
+    query_type: Optional[str] = None
+    latency_ms: Optional[int] = None
+    status_code: int = 200
+    error_message: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_row(self) -> Tuple:
+        """Row tuple in COST_COLUMNS order, with DB-native types."""
+        return (
+            uuid.UUID(self.request_id), self.endpoint, self.http_method, self.provider, self.model,
+            self.input_tokens, self.output_tokens, self.cache_read_tokens, self.cache_write_tokens,
+            Decimal(str(self.cost_usd)), self.user_id, self.ticker, self.query_type,
+            self.latency_ms, self.status_code, self.error_message,
+            datetime.fromisoformat(self.created_at),
+        )
+
+
+@dataclass
+class _Totals:
+    """Running aggregate for one (day, provider, model)."""
+    request_count: int = 0
+    total_input_tokens: int = 0
+    total_output_tokens: int = 0
+    total_cache_read_tokens: int = 0
+    total_cache_write_tokens: int = 0
+    total_cost_usd: float = 0.0
+    latency_sum_ms: float = 0.0
+    latency_count: int = 0
+
+    @property
+    def avg_latency_ms(self) -> Optional[float]:
+        return self.latency_sum_ms / self.latency_count if self.latency_count else None
+
+
+def breakdown_from_daily(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert daily_cost_summary rows to provider_cost_breakdown format."""
+    return [
+        {
+            "provider": row["provider"],
+            "model": row["model"],
+            "request_count": row["request_count"],
+            "total_input_tokens": row["total_input_tokens"],
+            "total_output_tokens": row["total_output_tokens"],
+            "total_cost_usd": row["total_cost_usd"],
+            "avg_cost_per_request": (
+                float(row["total_cost_usd"]) / row["request_count"] if row["request_count"] else 0.0
+            ),
+            "avg_latency_ms": row["avg_latency_ms"],
+        }
+        for row in rows
+    ]
+
+
+class CostLedger:
+    """Buffered, batched writer for api_costs with in-memory daily totals.
+
+    Usage:
+        ledger = CostLedger(db_pool, spill_path="/var/lib/ape/cost_spill.jsonl")
+        await ledger.start()
+        tracker = CostTracker(db_pool, ledger=ledger)
+        ...
+        await ledger.close()  # final flush
+    """
+
+    def __init__(
+        self,
+        db_pool=None,
+        max_batch: int = 500,
+        flush_interval_seconds: float = 2.0,
+        spill_path: Optional[str] = None,
+        use_copy: bool = True,
+        max_buffer: int = 50000
+    ):
+        """Initialize ledger.
+
+        Args:
+            db_pool: asyncpg-style pool (None = totals only, nothing persisted)
+            max_batch: Buffered records that trigger an immediate flush
+            flush_interval_seconds: Max age of a buffered record
+            spill_path: Local JSON-lines file for crash recovery (None = off)
+            use_copy: Bulk load with COPY (asyncpg copy_records_to_table);
+                      falls back to executemany if COPY fails
+            max_buffer: Records kept while the DB is unreachable (oldest dropped)
+        """
+        self.db_pool = db_pool
+        self.max_batch = max_batch
+        self.flush_interval_seconds = flush_interval_seconds
+        self.spill_path = spill_path
+        self.use_copy = use_copy
+        self.max_buffer = max_buffer
+
+        self._buffer: List[CostRecord] = []
+        self._totals: Dict[Tuple[date, str, Optional[str]], _Totals] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._pending_flush: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "recorded": 0,
+            "flushed": 0,
+            "flushes": 0,
+            "flush_failures": 0,
+            "recovered": 0,
+            "dropped": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Replay the spill file, seed today's totals, start the flusher."""
+        for record in self._read_spill():
+            self._buffer.append(record)
+            self.stats["recovered"] += 1
+        if self.stats["recovered"]:
+            logger.warning(f"Recovered {self.stats['recovered']} unflushed cost records from spill file")
+
+        await self._seed_totals()
+        # Recovered rows are not in the DB yet, so they are not in the seed
+        for record in self._buffer:
+            self._add_to_totals(record)
+
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stop the flusher and write out everything buffered."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def add(self, record: CostRecord):
+        """Buffer a record (no DB round-trip on the caller's path)."""
+        self._buffer.append(record)
+        self._append_spill([record])
+        self._add_to_totals(record)
+        self.stats["recorded"] += 1
+
+        if len(self._buffer) > self.max_buffer:
+            overflow = len(self._buffer) - self.max_buffer
+            del self._buffer[:overflow]
+            self.stats["dropped"] += overflow
+            logger.error(f"Cost ledger buffer full, dropped {overflow} oldest records")
+
+        if len(self._buffer) >= self.max_batch and self.db_pool is not None:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Kick off a size-triggered flush if none is pending."""
+        if self._pending_flush is not None and not self._pending_flush.done():
+            return
+        try:
+            self._pending_flush = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            pass  # No loop: the periodic flusher / close() will pick it up
+
+    async def flush(self) -> int:
+        """Write buffered records to the DB in one bulk operation.
+
+        Returns:
+            Number of records written
+        """
+        if self.db_pool is None:
+            return 0
+
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+
+            batch = self._buffer
+            self._buffer = []
+
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                # Keep the batch (ahead of newer records) for the next attempt
+                self._buffer = batch + self._buffer
+                self.stats["flush_failures"] += 1
+                logger.error(f"Failed to flush {len(batch)} cost records: {e}")
+                return 0
+
+            self.stats["flushes"] += 1
+            self.stats["flushed"] += len(batch)
+            self._rewrite_spill(self._buffer)
+            return len(batch)
+
+    async def _write_batch(self, batch: List[CostRecord]):
+        rows = [record.to_row() for record in batch]
+
+        async with self.db_pool.acquire() as conn:
+            if self.use_copy:
+                try:
+                    await conn.copy_records_to_table(
+                        "api_costs", records=rows, columns=list(COST_COLUMNS)
+                    )
+                    return
+                except Exception as e:
+                    logger.warning(f"COPY into api_costs failed, falling back to INSERT: {e}")
+
+            placeholders = ", ".join(f"${i}" for i in range(1, len(COST_COLUMNS) + 1))
+            await conn.executemany(
+                f"INSERT INTO api_costs ({', '.join(COST_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Cost ledger flush loop error: {e}")
+
+    # ------------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------------
+
+    def _append_spill(self, records: List[CostRecord]):
+        if not self.spill_path:
+            return
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(asdict(record)) + "\n")
+                f.flush()
+        except OSError as e:
+            logger.error(f"Failed to write cost spill file: {e}")
+
+    def _rewrite_spill(self, records: List[CostRecord]):
+        if not self.spill_path:
+            return
+        tmp_path = self.spill_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(asdict(record)) + "\n")
+            os.replace(tmp_path, self.spill_path)
+        except OSError as e:
+            logger.error(f"Failed to rewrite cost spill file: {e}")
+
+    def _read_spill(self) -> List[CostRecord]:
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return []
+
+        records = []
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(CostRecord(**json.loads(line)))
+                except (json.JSONDecodeError, TypeError) as e:
+                    # Torn last line after a crash mid-write
+                    logger.warning(f"Skipping corrupt cost spill line: {e}")
+        return records
+
+    # ------------------------------------------------------------------
+    # In-memory totals
+    # ------------------------------------------------------------------
+
+    def _add_to_totals(self, record: CostRecord):
+        day = datetime.fromisoformat(record.created_at).date()
+        totals = self._totals.setdefault((day, record.provider, record.model), _Totals())
+        totals.request_count += 1
+        totals.total_input_tokens += record.input_tokens
+        totals.total_output_tokens += record.output_tokens
+        totals.total_cache_read_tokens += record.cache_read_tokens
+        totals.total_cache_write_tokens += record.cache_write_tokens
+        totals.total_cost_usd += record.cost_usd
+        if record.latency_ms is not None:
+            totals.latency_sum_ms += record.latency_ms
+            totals.latency_count += 1
+
+        # Only today's totals are ever served; drop older days
+        for key in [k for k in self._totals if k[0] < day]:
+            del self._totals[key]
+
+    async def _seed_totals(self):
+        """Load today's aggregates written before this process started."""
+        if self.db_pool is None:
+            return
+        try:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT date, provider, model, request_count,
+                           total_input_tokens, total_output_tokens,
+                           total_cache_read_tokens, total_cache_write_tokens,
+                           total_cost_usd, avg_latency_ms
+                    FROM daily_cost_summary
+                    WHERE date = CURRENT_DATE
+                    """
+                )
+        except Exception as e:
+            logger.error(f"Failed to seed cost totals: {e}")
+            return
+
+        for row in rows:
+            count = int(row["request_count"] or 0)
+            avg_latency = row["avg_latency_ms"]
+            self._totals[(row["date"], row["provider"], row["model"])] = _Totals(
+                request_count=count,
+                total_input_tokens=int(row["total_input_tokens"] or 0),
+                total_output_tokens=int(row["total_output_tokens"] or 0),
+                total_cache_read_tokens=int(row["total_cache_read_tokens"] or 0),
+                total_cache_write_tokens=int(row["total_cache_write_tokens"] or 0),
+                total_cost_usd=float(row["total_cost_usd"] or 0),
+                latency_sum_ms=float(avg_latency) * count if avg_latency is not None else 0.0,
+                latency_count=count if avg_latency is not None else 0,
+            )
+
+    def today_daily_costs(self) -> List[Dict[str, Any]]:
+        """Today's rows in daily_cost_summary format (highest cost first)."""
+        today = date.today()
+        rows = [
+            {
+                "date": day,
+                "provider": provider,
+                "model": model,
+                "request_count": t.request_count,
+                "total_input_tokens": t.total_input_tokens,
+                "total_output_tokens": t.total_output_tokens,
+                "total_cache_read_tokens": t.total_cache_read_tokens,
+                "total_cache_write_tokens": t.total_cache_write_tokens,
+                "total_cost_usd": round(t.total_cost_usd, 6),
+                "avg_latency_ms": t.avg_latency_ms,
+            }
+            for (day, provider, model), t in self._totals.items()
+            if day == today
+        ]
+        return sorted(rows, key=lambda r: r["total_cost_usd"], reverse=True)
+
+    def today_provider_breakdown(self) -> List[Dict[str, Any]]:
+        """Today's rows in provider_cost_breakdown format."""
+        return breakdown_from_daily(self.today_daily_costs())
+
+    @property
+    def pending(self) -> int:
+        """Records buffered but not yet written."""
+        return len(self._buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "pending": self.pending}
@@ -4,7 +4,7 @@ Week 11 Day 4: API endpoints for cost monitoring and analytics.
 
 Endpoints:
 - GET /api/costs/daily - Daily cost summary
-- GET /api/costs/providers - Provider cost breakdown
+- GET /api/costs/providers - Provider cost breakdown (?today=true for current day)
 - GET /api/costs/total - Total costs (today, week, month)
 """
 
@@ -16,6 +16,7 @@ from decimal import Decimal
 from fastapi import APIRouter, Depends, Query, HTTPException
 from pydantic import BaseModel, Field
 
+from .cost_ledger import CostLedger
 from .cost_tracking import CostTracker
 
 logger = logging.getLogger(__name__)
@@ -90,15 +91,20 @@ def get_cost_tracker() -> CostTracker:
     return _cost_tracker
 
 
-def initialize_cost_tracker(db_pool=None, enable_metrics: bool = True):
+def initialize_cost_tracker(
+    db_pool=None,
+    enable_metrics: bool = True,
+    ledger: Optional[CostLedger] = None
+):
     """Initialize global cost tracker.
 
     Args:
         db_pool: PostgreSQL connection pool
         enable_metrics: Enable Prometheus metrics
+        ledger: Optional write-behind ledger (caller runs ledger.start()/close())
     """
     global _cost_tracker
-    _cost_tracker = CostTracker(db_pool=db_pool, enable_metrics=enable_metrics)
+    _cost_tracker = CostTracker(db_pool=db_pool, enable_metrics=enable_metrics, ledger=ledger)
     logger.info("Cost tracker initialized")
 
 
@@ -134,9 +140,10 @@ async def get_daily_costs(
 
 @router.get("/providers", response_model=List[ProviderCostRecord])
 async def get_provider_breakdown(
+    today: bool = Query(False, description="Current day only"),
     cost_tracker: CostTracker = Depends(get_cost_tracker)
 ):
-    """Get cost breakdown by provider (last 30 days).
+    """Get cost breakdown by provider (last 30 days, or today only).
 
     Returns:
         List of provider cost records sorted by total cost (highest first)
@@ -150,7 +157,7 @@ async def get_provider_breakdown(
         - DeepSeek (deepseek-chat): $0.87
     """
     try:
-        records = await cost_tracker.get_provider_breakdown()
+        records = await cost_tracker.get_provider_breakdown(today_only=today)
         return records
     except Exception as e:
         logger.error(f"Failed to retrieve provider breakdown: {e}")
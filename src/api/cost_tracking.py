@@ -1,11 +1,12 @@
 """Cost tracking middleware for API calls.
 
 Week 11 Day 4: Track LLM and data provider costs with granular metrics.
+Week 12: Optional write-behind CostLedger (batched inserts, in-memory daily totals).
 
 Pricing (as of 2026-02-08):
 - Anthropic Claude Sonnet 4.5: $3/MTok input, $15/MTok output, $0.30/MTok cache read, $3.75/MTok cache write
-- OpenAI GPT-4o: $2.50/MTok input, $10/MTok output
-- DeepSeek Chat: $0.14/MTok input, $0.28/MTok output
+- OpenAI GPT-4o: $2.50/MTok input, $10/MTok output, $1.25/MTok cached input
+- DeepSeek Chat: $0.14/MTok input, $0.28/MTok output, $0.014/MTok cache hit
 - yfinance: Free (but track calls)
 - AlphaVantage: Free tier (5 calls/min), track rate limit usage
 """
@@ -21,6 +22,8 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+from .cost_ledger import CostLedger, CostRecord, breakdown_from_daily
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,29 +52,48 @@ PRICING = {
     "openai": {
         "gpt-4o": {
             "input": 2.50,
-            "output": 10.00
+            "output": 10.00,
+            "cache_read": 1.25
         },
         "gpt-4o-mini": {
             "input": 0.15,
-            "output": 0.60
+            "output": 0.60,
+            "cache_read": 0.075
         }
     },
     "deepseek": {
         "deepseek-chat": {
             "input": 0.14,
-            "output": 0.28
+            "output": 0.28,
+            "cache_read": 0.014
         }
     }
 }
 
 
+def resolve_model_pricing(provider: str, model: str) -> Optional[Dict[str, float]]:
+    """Look up pricing, tolerating dated model ids.
+
+    "claude-sonnet-4-5-20250929" resolves to the "claude-sonnet-4-5" entry
+    (longest matching prefix wins).
+    """
+    models = PRICING.get(provider, {})
+    if model in models:
+        return models[model]
+
+    matches = [name for name in models if model and model.startswith(name)]
+    if not matches:
+        return None
+    return models[max(matches, key=len)]
+
+
 class CostTracker:
     """Tracks API costs and usage metrics.
 
     Features:
     - LLM call tracking (Anthropic, OpenAI, DeepSeek)
     - Data provider tracking (yfinance, AlphaVantage)
-    - PostgreSQL persistence
+    - PostgreSQL persistence (direct, or write-behind via CostLedger)
     - Prometheus metrics
 
     Usage:
@@ -85,15 +107,23 @@ class CostTracker:
         )
     """
 
-    def __init__(self, db_pool=None, enable_metrics: bool = True):
+    def __init__(
+        self,
+        db_pool=None,
+        enable_metrics: bool = True,
+        ledger: Optional[CostLedger] = None
+    ):
         """Initialize cost tracker.
 
         Args:
             db_pool: PostgreSQL connection pool (optional for testing)
             enable_metrics: Enable Prometheus metrics
+            ledger: Write-behind ledger; when set, records are buffered and
+                    flushed in batches instead of one INSERT per call
         """
         self.db_pool = db_pool
         self.enable_metrics = enable_metrics
+        self.ledger = ledger
 
         if enable_metrics:
             try:
@@ -127,13 +157,17 @@ class CostTracker:
             model: Model name
             input_tokens: Input token count
             output_tokens: Output token count
-            cache_read_tokens: Prompt cache read tokens (Anthropic only)
+            cache_read_tokens: Prompt cache read tokens (billed at the cached rate)
             cache_write_tokens: Prompt cache write tokens (Anthropic only)
 
+        Note:
+            input_tokens must EXCLUDE cached tokens; providers that report a
+            combined prompt count (OpenAI, DeepSeek) are split by the client.
+
         Returns:
             Total cost in USD
         """
-        pricing = PRICING.get(provider, {}).get(model)
+        pricing = resolve_model_pricing(provider, model)
         if not pricing:
             logger.warning(f"No pricing for {provider}/{model}, using $0")
             return Decimal("0.00")
@@ -147,9 +181,10 @@ class CostTracker:
         # Output tokens
         cost += Decimal(str(output_tokens)) / Decimal("1000000") * Decimal(str(pricing["output"]))
 
-        # Cache tokens (Anthropic only)
-        if "cache_read" in pricing and cache_read_tokens > 0:
-            cost += Decimal(str(cache_read_tokens)) / Decimal("1000000") * Decimal(str(pricing["cache_read"]))
+        # Cache tokens (providers without a cached rate bill them as input)
+        if cache_read_tokens > 0:
+            cache_read_price = pricing.get("cache_read", pricing["input"])
+            cost += Decimal(str(cache_read_tokens)) / Decimal("1000000") * Decimal(str(cache_read_price))
 
         if "cache_write" in pricing and cache_write_tokens > 0:
             cost += Decimal(str(cache_write_tokens)) / Decimal("1000000") * Decimal(str(pricing["cache_write"]))
@@ -202,7 +237,16 @@ class CostTracker:
         )
 
         # Insert into database
-        if self.db_pool:
+        if self.ledger:
+            self.ledger.add(CostRecord(
+                request_id=str(request_id), endpoint=endpoint, http_method=http_method,
+                provider=provider, model=model,
+                input_tokens=input_tokens, output_tokens=output_tokens,
+                cache_read_tokens=cache_read_tokens, cache_write_tokens=cache_write_tokens,
+                cost_usd=float(cost), user_id=user_id, ticker=ticker, query_type=query_type,
+                latency_ms=latency_ms, status_code=status_code, error_message=error_message
+            ))
+        elif self.db_pool:
             try:
                 async with self.db_pool.acquire() as conn:
                     await conn.execute(
@@ -279,7 +323,14 @@ class CostTracker:
         cost = Decimal("0.00")
 
         # Insert into database
-        if self.db_pool:
+        if self.ledger:
+            self.ledger.add(CostRecord(
+                request_id=str(request_id), endpoint=endpoint, http_method=http_method,
+                provider=provider, model=None,
+                cost_usd=float(cost), ticker=ticker, query_type="data_fetch",
+                latency_ms=latency_ms, status_code=status_code, error_message=error_message
+            ))
+        elif self.db_pool:
             try:
                 async with self.db_pool.acquire() as conn:
                     await conn.execute(
@@ -307,18 +358,32 @@ class CostTracker:
     ) -> list[Dict[str, Any]]:
         """Get daily cost summary for last N days.
 
+        With a ledger, today's rows come from its in-memory totals and only
+        earlier days are read from the DB (days=0 never touches the DB).
+
         Args:
             days: Number of days to retrieve
 
         Returns:
             List of daily cost records
         """
+        if self.ledger:
+            today_rows = self.ledger.today_daily_costs()
+            if days <= 0 or not self.db_pool:
+                return today_rows
+            return today_rows + await self._fetch_daily_costs(days, exclude_today=True)
+
         if not self.db_pool:
             return []
 
+        return await self._fetch_daily_costs(days)
+
+    async def _fetch_daily_costs(self, days: int, exclude_today: bool = False) -> list[Dict[str, Any]]:
+        today_filter = "AND date < CURRENT_DATE" if exclude_today else ""
+
         async with self.db_pool.acquire() as conn:
             rows = await conn.fetch(
-                """
+                f"""
                 SELECT
                     date,
                     provider,
@@ -331,7 +396,7 @@ class CostTracker:
                     total_cost_usd,
                     avg_latency_ms
                 FROM daily_cost_summary
-                WHERE date >= CURRENT_DATE - $1
+                WHERE date >= CURRENT_DATE - $1 {today_filter}
                 ORDER BY date DESC, total_cost_usd DESC
                 """,
                 days
@@ -339,15 +404,24 @@ class CostTracker:
 
             return [dict(row) for row in rows]
 
-    async def get_provider_breakdown(self) -> list[Dict[str, Any]]:
+    async def get_provider_breakdown(self, today_only: bool = False) -> list[Dict[str, Any]]:
         """Get cost breakdown by provider (last 30 days).
 
+        Args:
+            today_only: Current day only (served from the ledger, if any)
+
         Returns:
             List of provider cost records
         """
+        if today_only:
+            return breakdown_from_daily(await self.get_daily_costs(days=0))
+
         if not self.db_pool:
             return []
 
+        if self.ledger:
+            await self.ledger.flush()  # 30-day view must include buffered rows
+
         async with self.db_pool.acquire() as conn:
             rows = await conn.fetch(
                 """
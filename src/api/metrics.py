@@ -121,6 +121,33 @@ websocket_messages_received_total = Counter(
     ['action']  # subscribe, unsubscribe, ping, auth
 )
 
+websocket_outbound_queue_depth = Gauge(
+    'websocket_outbound_queue_depth',
+    'Messages queued for delivery across all WebSocket connections'
+)
+
+websocket_outbound_queue_depth_max = Gauge(
+    'websocket_outbound_queue_depth_max',
+    'Deepest per-connection outbound queue'
+)
+
+websocket_messages_coalesced_total = Counter(
+    'websocket_messages_coalesced_total',
+    'Queued WebSocket status updates superseded by a newer one'
+)
+
+websocket_slow_consumer_disconnects_total = Counter(
+    'websocket_slow_consumer_disconnects_total',
+    'WebSocket connections dropped for falling too far behind'
+)
+
+websocket_delivery_lag_seconds = Histogram(
+    'websocket_delivery_lag_seconds',
+    'Time from query event publish to socket write',
+    ['source'],  # local, remote (published on another replica)
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
 
 # ============================================================================
 # Error Metrics
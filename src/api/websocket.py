@@ -2,6 +2,8 @@
 WebSocket endpoint for real-time query updates.
 
 Week 9 Day 5: WebSocket Backend Implementation
+Week 12: Concurrent fan-out with per-connection outbound queues
+Week 12: Cross-replica delivery via pub/sub (see ws_pubsub.py)
 
 Features:
 - Real-time query status updates
@@ -9,6 +11,15 @@ Features:
 - Subscribe/unsubscribe to specific query IDs
 - Broadcast updates to all subscribers
 - Connection pooling and cleanup
+- Non-blocking fan-out: each connection has a bounded outbound queue drained
+  by its own writer task, so one slow client never delays the others
+- Broadcasts are serialized once and the same payload is queued for every
+  recipient
+- Full queues coalesce status updates (latest progress per query wins);
+  clients still too far behind are disconnected
+- With a pub/sub backbone attached, query events published on any replica
+  reach subscribers on every replica; each replica only subscribes to the
+  query_ids its sockets follow
 
 Protocol:
     Client → Server:
@@ -26,13 +37,27 @@ Protocol:
 import asyncio
 import json
 import logging
-from typing import Dict, Set, Optional
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Set, Optional
 from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+from .metrics import (
+    websocket_delivery_lag_seconds,
+    websocket_messages_coalesced_total,
+    websocket_outbound_queue_depth,
+    websocket_outbound_queue_depth_max,
+    websocket_slow_consumer_disconnects_total,
+)
+from .ws_pubsub import QueryEvent, QueryPubSub, create_pubsub
 
 logger = logging.getLogger(__name__)
 
+# WebSocket close code 1013: "Try Again Later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
 
 # ============================================================================
 # WebSocket Message Types
@@ -50,7 +75,9 @@ class WSMessage:
 
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(asdict(self))
+        # Fields are flat; json.dumps walks nested dicts itself, so the
+        # recursive deep copy done by dataclasses.asdict is unnecessary.
+        return json.dumps(vars(self))
 
 
 @dataclass
@@ -85,6 +112,119 @@ class PongMessage(WSMessage):
     type: str = "pong"
 
 
+# ============================================================================
+# Per-connection Outbound Queue
+# ============================================================================
+
+@dataclass
+class OutboundFrame:
+    """Serialized message, shared by every recipient of a broadcast."""
+    payload: str
+    coalesce_key: Optional[str] = None
+    published_at: Optional[float] = None  # Set for query events (lag tracking)
+    source: str = "local"  # "local" or "remote" (published on another replica)
+
+
+class ConnectionOutbox:
+    """
+    Bounded outbound queue drained by a dedicated writer task.
+
+    put() never awaits the socket. When the queue is full, frames with a
+    coalesce_key supersede older queued frames with the same key; if that
+    does not free room the consumer is reported as too slow.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue_size: int = 100,
+        on_delivered: Optional[Callable[[OutboundFrame, float], None]] = None
+    ):
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.on_delivered = on_delivered
+        self._frames: Deque[OutboundFrame] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def start(self, on_error: Callable[[Exception], Awaitable[None]]):
+        """Start the writer task (call from the event loop)."""
+        self._task = asyncio.create_task(self._run(on_error))
+
+    def put(self, frame: OutboundFrame) -> bool:
+        """
+        Queue a frame for delivery.
+
+        Returns:
+            False if the queue is still full after coalescing (slow consumer)
+        """
+        if len(self._frames) >= self.max_queue_size:
+            self._coalesce(frame.coalesce_key)
+            if len(self._frames) >= self.max_queue_size:
+                return False
+
+        self._frames.append(frame)
+        websocket_outbound_queue_depth.inc()
+        self._ready.set()
+        return True
+
+    def _coalesce(self, incoming_key: Optional[str]):
+        """Drop queued frames superseded by a newer frame with the same key."""
+        latest: Set[str] = set()
+        if incoming_key is not None:
+            latest.add(incoming_key)
+
+        kept: Deque[OutboundFrame] = deque()
+        for frame in reversed(self._frames):
+            if frame.coalesce_key is not None:
+                if frame.coalesce_key in latest:
+                    continue
+                latest.add(frame.coalesce_key)
+            kept.appendleft(frame)
+
+        dropped = len(self._frames) - len(kept)
+        if dropped:
+            self._frames = kept
+            self.coalesced += dropped
+            websocket_messages_coalesced_total.inc(dropped)
+            websocket_outbound_queue_depth.dec(dropped)
+
+    async def _run(self, on_error: Callable[[Exception], Awaitable[None]]):
+        """Writer loop: send queued frames in order until cancelled."""
+        try:
+            while True:
+                await self._ready.wait()
+                while self._frames:
+                    frame = self._frames.popleft()
+                    websocket_outbound_queue_depth.dec()
+                    await self.websocket.send_text(frame.payload)
+                    self.sent += 1
+                    if frame.published_at is not None:
+                        lag = time.time() - frame.published_at
+                        websocket_delivery_lag_seconds.labels(source=frame.source).observe(lag)
+                        if self.on_delivered is not None:
+                            self.on_delivered(frame, lag)
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await on_error(e)
+
+    def close(self):
+        """Stop the writer and discard undelivered frames."""
+        if self._frames:
+            websocket_outbound_queue_depth.dec(len(self._frames))
+            self._frames.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+
 # ============================================================================
 # Connection Manager
 # ============================================================================
@@ -99,12 +239,29 @@ class ConnectionManager:
     - Broadcast messages to subscribers
     - Heartbeat/ping-pong
     - Automatic cleanup of disconnected clients
+    - Per-connection outbound queues with coalescing and slow-consumer eviction
     """
 
-    def __init__(self):
+    def __init__(self, max_queue_size: int = 100):
+        """
+        Args:
+            max_queue_size: Undelivered messages allowed per connection before
+                            status updates are coalesced / the client dropped
+        """
+        self.max_queue_size = max_queue_size
+
         # Active connections: {connection_id: WebSocket}
         self.active_connections: Dict[str, WebSocket] = {}
 
+        # Outbound queues: {connection_id: ConnectionOutbox}
+        self.outboxes: Dict[str, ConnectionOutbox] = {}
+        self.slow_consumer_disconnects = 0
+
+        # Cross-replica backbone (None = single process)
+        self.pubsub: Optional[QueryPubSub] = None
+        self.remote_events_received = 0
+        self._recent_lags: Deque[float] = deque(maxlen=1000)
+
         # Subscriptions: {query_id: Set[connection_id]}
         self.subscriptions: Dict[str, Set[str]] = {}
 
@@ -124,8 +281,21 @@ class ConnectionManager:
         """
         await websocket.accept()
 
+        outbox = ConnectionOutbox(
+            websocket,
+            self.max_queue_size,
+            on_delivered=lambda frame, lag: self._recent_lags.append(lag)
+        )
+
+        async def on_send_error(error: Exception):
+            logger.error(f"Error sending message to {connection_id}: {error}")
+            await self.disconnect(connection_id)
+
+        outbox.start(on_send_error)
+
         async with self._lock:
             self.active_connections[connection_id] = websocket
+            self.outboxes[connection_id] = outbox
             self.connection_meta[connection_id] = {
                 "connected_at": datetime.now(timezone.utc),
                 "last_ping": datetime.now(timezone.utc)
@@ -145,7 +315,12 @@ class ConnectionManager:
             if connection_id in self.active_connections:
                 del self.active_connections[connection_id]
 
+            outbox = self.outboxes.pop(connection_id, None)
+            if outbox is not None:
+                outbox.close()
+
             # Remove from all subscriptions
+            emptied = []
             for query_id in list(self.subscriptions.keys()):
                 if connection_id in self.subscriptions[query_id]:
                     self.subscriptions[query_id].remove(connection_id)
@@ -153,11 +328,15 @@ class ConnectionManager:
                 # Clean up empty subscription sets
                 if not self.subscriptions[query_id]:
                     del self.subscriptions[query_id]
+                    emptied.append(query_id)
 
             # Remove metadata
             if connection_id in self.connection_meta:
                 del self.connection_meta[connection_id]
 
+        for query_id in emptied:
+            await self._pubsub_unsubscribe(query_id)
+
         logger.info(f"WebSocket disconnected: {connection_id}")
 
     async def subscribe(self, connection_id: str, query_id: str):
@@ -169,11 +348,15 @@ class ConnectionManager:
             query_id: Query to subscribe to
         """
         async with self._lock:
-            if query_id not in self.subscriptions:
+            first_subscriber = query_id not in self.subscriptions
+            if first_subscriber:
                 self.subscriptions[query_id] = set()
 
             self.subscriptions[query_id].add(connection_id)
 
+        if first_subscriber and self.pubsub is not None:
+            await self.pubsub.subscribe(query_id)
+
         logger.info(f"Connection {connection_id} subscribed to query {query_id}")
 
     async def unsubscribe(self, connection_id: str, query_id: str):
@@ -184,6 +367,7 @@ class ConnectionManager:
             connection_id: Connection to unsubscribe
             query_id: Query to unsubscribe from
         """
+        emptied = False
         async with self._lock:
             if query_id in self.subscriptions and connection_id in self.subscriptions[query_id]:
                 self.subscriptions[query_id].remove(connection_id)
@@ -191,41 +375,50 @@ class ConnectionManager:
                 # Clean up empty subscription sets
                 if not self.subscriptions[query_id]:
                     del self.subscriptions[query_id]
+                    emptied = True
+
+        if emptied:
+            await self._pubsub_unsubscribe(query_id)
 
         logger.info(f"Connection {connection_id} unsubscribed from query {query_id}")
 
-    async def send_personal_message(self, message: str, connection_id: str):
+    async def send_personal_message(
+        self,
+        message: str,
+        connection_id: str,
+        coalesce_key: Optional[str] = None
+    ):
         """
-        Send message to specific connection.
+        Queue message for a specific connection.
 
         Args:
             message: JSON message to send
             connection_id: Target connection
+            coalesce_key: Messages sharing a key may be collapsed to the latest
         """
-        if connection_id in self.active_connections:
-            websocket = self.active_connections[connection_id]
-            try:
-                await websocket.send_text(message)
-            except Exception as e:
-                logger.error(f"Error sending message to {connection_id}: {e}")
-                await self.disconnect(connection_id)
-
-    async def broadcast_to_query_subscribers(self, message: str, query_id: str):
+        if not self._enqueue(connection_id, OutboundFrame(message, coalesce_key)):
+            await self._drop_slow_consumers([connection_id])
+
+    async def broadcast_to_query_subscribers(
+        self,
+        message: str,
+        query_id: str,
+        coalesce_key: Optional[str] = None
+    ):
         """
         Broadcast message to all subscribers of a query.
 
         Args:
             message: JSON message to send
             query_id: Query whose subscribers should receive message
+            coalesce_key: Messages sharing a key may be collapsed to the latest
         """
         if query_id not in self.subscriptions:
             return
 
         # Get snapshot of subscribers (avoid iteration during modification)
         subscribers = list(self.subscriptions[query_id])
-
-        for connection_id in subscribers:
-            await self.send_personal_message(message, connection_id)
+        await self._fan_out(OutboundFrame(message, coalesce_key), subscribers)
 
     async def broadcast_to_all(self, message: str):
         """
@@ -236,9 +429,116 @@ class ConnectionManager:
         """
         # Get snapshot of connections
         connections = list(self.active_connections.keys())
+        await self._fan_out(OutboundFrame(message), connections)
 
-        for connection_id in connections:
-            await self.send_personal_message(message, connection_id)
+    async def attach_pubsub(self, pubsub: QueryPubSub):
+        """
+        Connect this replica to a cross-replica backbone.
+
+        Args:
+            pubsub: Backend; receives subscriptions for every query_id that
+                    local sockets currently follow
+        """
+        self.pubsub = pubsub
+        await pubsub.start(self._on_remote_event)
+        for query_id in list(self.subscriptions.keys()):
+            await pubsub.subscribe(query_id)
+        logger.info(f"WebSocket pub/sub attached (replica {pubsub.replica_id})")
+
+    async def publish(
+        self,
+        message: str,
+        query_id: str,
+        coalesce_key: Optional[str] = None
+    ):
+        """
+        Deliver a query event to its subscribers on every replica.
+
+        Local subscribers are served directly; other replicas receive the
+        event through the pub/sub backbone (if attached).
+
+        Args:
+            message: JSON message to send
+            query_id: Query the event belongs to
+            coalesce_key: Messages sharing a key may be collapsed to the latest
+        """
+        published_at = time.time()
+
+        if query_id in self.subscriptions:
+            frame = OutboundFrame(message, coalesce_key, published_at=published_at)
+            await self._fan_out(frame, list(self.subscriptions[query_id]))
+
+        if self.pubsub is not None:
+            try:
+                await self.pubsub.publish(QueryEvent(
+                    query_id=query_id,
+                    payload=message,
+                    coalesce_key=coalesce_key,
+                    origin=self.pubsub.replica_id,
+                    published_at=published_at
+                ))
+            except Exception as e:
+                logger.error(f"Failed to publish event for query {query_id}: {e}")
+
+    async def _on_remote_event(self, event: QueryEvent):
+        """Fan out an event published by another replica."""
+        self.remote_events_received += 1
+        subscribers = list(self.subscriptions.get(event.query_id, ()))
+        if not subscribers:
+            return
+
+        frame = OutboundFrame(
+            event.payload,
+            event.coalesce_key,
+            published_at=event.published_at,
+            source="remote"
+        )
+        await self._fan_out(frame, subscribers)
+
+    async def _pubsub_unsubscribe(self, query_id: str):
+        """Drop the backbone subscription once no local socket follows query_id."""
+        if self.pubsub is None:
+            return
+        try:
+            await self.pubsub.unsubscribe(query_id)
+        except Exception as e:
+            logger.error(f"Failed to unsubscribe from query {query_id}: {e}")
+
+    async def _fan_out(self, frame: OutboundFrame, connection_ids: List[str]):
+        """Queue one shared frame for many connections; evict slow ones after."""
+        slow = [cid for cid in connection_ids if not self._enqueue(cid, frame)]
+        websocket_outbound_queue_depth_max.set(
+            max((o.depth for o in self.outboxes.values()), default=0)
+        )
+        if slow:
+            await self._drop_slow_consumers(slow)
+
+    def _enqueue(self, connection_id: str, frame: OutboundFrame) -> bool:
+        """Queue frame; False only if the connection is too far behind."""
+        outbox = self.outboxes.get(connection_id)
+        if outbox is None:
+            return True  # Already gone
+        return outbox.put(frame)
+
+    async def _drop_slow_consumers(self, connection_ids: List[str]):
+        """Disconnect clients whose queue overflowed even after coalescing."""
+        for connection_id in connection_ids:
+            websocket = self.active_connections.get(connection_id)
+            if websocket is None:
+                continue
+
+            logger.warning(
+                f"WebSocket {connection_id} fell more than {self.max_queue_size} "
+                f"messages behind; disconnecting"
+            )
+            self.slow_consumer_disconnects += 1
+            websocket_slow_consumer_disconnects_total.inc()
+            await self.disconnect(connection_id)
+
+            try:
+                await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+            except Exception:
+                pass  # Socket may already be closed
 
     async def handle_ping(self, connection_id: str):
         """
@@ -262,10 +562,20 @@ class ConnectionManager:
         Returns:
             Dict with connection stats
         """
+        depths = [o.depth for o in self.outboxes.values()]
+        lags = sorted(self._recent_lags)
         return {
             "active_connections": len(self.active_connections),
             "total_subscriptions": sum(len(subs) for subs in self.subscriptions.values()),
-            "unique_queries": len(self.subscriptions)
+            "unique_queries": len(self.subscriptions),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "coalesced_messages": sum(o.coalesced for o in self.outboxes.values()),
+            "slow_consumer_disconnects": self.slow_consumer_disconnects,
+            "pubsub_replica_id": self.pubsub.replica_id if self.pubsub else None,
+            "remote_events_received": self.remote_events_received,
+            "delivery_lag_p50_ms": lags[len(lags) // 2] * 1000 if lags else None,
+            "delivery_lag_p95_ms": lags[min(len(lags) - 1, int(len(lags) * 0.95))] * 1000 if lags else None
         }
 
 
@@ -276,6 +586,17 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+async def init_pubsub(backend: str = "local", redis_url: Optional[str] = None):
+    """
+    Attach the global manager to a cross-replica backbone.
+
+    Usage (app startup):
+        settings = get_settings()
+        await init_pubsub(settings.websocket_pubsub_backend, settings.redis_url)
+    """
+    await manager.attach_pubsub(create_pubsub(backend, redis_url))
+
+
 # ============================================================================
 # WebSocket Handler
 # ============================================================================
@@ -375,7 +696,7 @@ async def broadcast_status_update(
         progress=progress,
         current_step=current_step
     )
-    await manager.broadcast_to_query_subscribers(message.to_json(), query_id)
+    await manager.publish(message.to_json(), query_id, coalesce_key=f"status:{query_id}")
 
 
 async def broadcast_completion(query_id: str, result_summary: Dict):
@@ -390,7 +711,7 @@ async def broadcast_completion(query_id: str, result_summary: Dict):
         query_id=query_id,
         result_summary=result_summary
     )
-    await manager.broadcast_to_query_subscribers(message.to_json(), query_id)
+    await manager.publish(message.to_json(), query_id)
 
 
 async def broadcast_error(query_id: str, error: str):
@@ -405,4 +726,35 @@ async def broadcast_error(query_id: str, error: str):
         query_id=query_id,
         error=error
     )
-    await manager.broadcast_to_query_subscribers(message.to_json(), query_id)
+    await manager.publish(message.to_json(), query_id)
+
+
+async def pipeline_broadcast_callback(
+    query_id: str,
+    status: str,
+    current_node: Optional[str] = None,
+    progress: float = 0.0,
+    verified_facts_count: int = 0,
+    error: Optional[str] = None,
+    metadata: Optional[Dict] = None
+):
+    """
+    LangGraphOrchestrator broadcast_callback that reaches every replica.
+
+    Usage:
+        LangGraphOrchestrator(broadcast_callback=pipeline_broadcast_callback)
+    """
+    if status == "completed":
+        await broadcast_completion(query_id, {
+            "verified_facts_count": verified_facts_count,
+            **(metadata or {})
+        })
+    elif status == "failed":
+        await broadcast_error(query_id, error or "Query failed")
+    else:
+        await broadcast_status_update(
+            query_id,
+            status=status,
+            progress=progress,
+            current_step=current_node or ""
+        )
@@ -0,0 +1,243 @@
+"""
+Cross-replica pub/sub for WebSocket query events.
+
+Week 12: Horizontal scaling of the WebSocket layer.
+
+A client may be connected to API replica A while its query runs on replica
+B. Every replica publishes query events to a shared backbone and subscribes
+only to the query_ids that its own sockets care about.
+
+Backends:
+- LocalPubSub: in-process delivery. Replicas that share one LocalBroker see
+  each other's events, which makes it a stand-in for a real broker in
+  development and tests.
+- RedisPubSub: Redis PUBLISH/SUBSCRIBE with one channel per query_id.
+
+Events carry the publish timestamp so the receiver can measure delivery
+lag end to end.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "ape:ws:query:"
+
+
+@dataclass
+class QueryEvent:
+    """Serialized WebSocket message for one query, as sent between replicas."""
+    query_id: str
+    payload: str
+    coalesce_key: Optional[str] = None
+    origin: str = ""
+    published_at: float = field(default_factory=time.time)
+
+    def to_wire(self) -> str:
+        return json.dumps({
+            "query_id": self.query_id,
+            "payload": self.payload,
+            "coalesce_key": self.coalesce_key,
+            "origin": self.origin,
+            "published_at": self.published_at,
+        })
+
+    @classmethod
+    def from_wire(cls, data: str) -> "QueryEvent":
+        return cls(**json.loads(data))
+
+
+EventHandler = Callable[[QueryEvent], Awaitable[None]]
+
+
+class QueryPubSub(ABC):
+    """
+    Pub/sub backbone interface.
+
+    Each instance represents one replica. Events published by a replica
+    are not delivered back to it: the replica has already delivered them
+    to its own sockets.
+    """
+
+    def __init__(self, replica_id: Optional[str] = None):
+        self.replica_id = replica_id or uuid.uuid4().hex[:12]
+        self._handler: Optional[EventHandler] = None
+        self.subscribed: Set[str] = set()
+
+    async def start(self, handler: EventHandler):
+        """Register the callback for remote events."""
+        self._handler = handler
+
+    @abstractmethod
+    async def publish(self, event: QueryEvent):
+        """Publish an event to every replica subscribed to its query_id."""
+
+    @abstractmethod
+    async def subscribe(self, query_id: str):
+        """Start receiving events for query_id."""
+
+    @abstractmethod
+    async def unsubscribe(self, query_id: str):
+        """Stop receiving events for query_id."""
+
+    async def close(self):
+        """Release backbone resources."""
+        self.subscribed.clear()
+
+    async def _dispatch(self, event: QueryEvent):
+        """Deliver a received event to the handler (skipping our own)."""
+        if event.origin == self.replica_id or self._handler is None:
+            return
+        try:
+            await self._handler(event)
+        except Exception as e:
+            logger.error(f"Pub/sub handler failed for {event.query_id}: {e}")
+
+
+# ============================================================================
+# In-process backend
+# ============================================================================
+
+class LocalBroker:
+    """In-memory broker shared by LocalPubSub replicas in one process."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set["LocalPubSub"]] = {}
+
+    def subscribe(self, query_id: str, client: "LocalPubSub"):
+        self._subscribers.setdefault(query_id, set()).add(client)
+
+    def unsubscribe(self, query_id: str, client: "LocalPubSub"):
+        clients = self._subscribers.get(query_id)
+        if clients is not None:
+            clients.discard(client)
+            if not clients:
+                del self._subscribers[query_id]
+
+    async def publish(self, event: QueryEvent):
+        for client in list(self._subscribers.get(event.query_id, ())):
+            await client._dispatch(event)
+
+
+class LocalPubSub(QueryPubSub):
+    """In-process backend; pass a shared LocalBroker to link replicas."""
+
+    def __init__(self, broker: Optional[LocalBroker] = None, replica_id: Optional[str] = None):
+        super().__init__(replica_id)
+        self.broker = broker or LocalBroker()
+
+    async def publish(self, event: QueryEvent):
+        await self.broker.publish(event)
+
+    async def subscribe(self, query_id: str):
+        self.broker.subscribe(query_id, self)
+        self.subscribed.add(query_id)
+
+    async def unsubscribe(self, query_id: str):
+        self.broker.unsubscribe(query_id, self)
+        self.subscribed.discard(query_id)
+
+    async def close(self):
+        for query_id in list(self.subscribed):
+            await self.unsubscribe(query_id)
+        await super().close()
+
+
+# ============================================================================
+# Redis backend
+# ============================================================================
+
+class RedisPubSub(QueryPubSub):
+    """Redis PUBLISH/SUBSCRIBE backend, one channel per query_id."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        replica_id: Optional[str] = None,
+        poll_timeout: float = 1.0
+    ):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package required for RedisPubSub. Install with: pip install redis")
+
+        super().__init__(replica_id)
+        self.redis_url = redis_url
+        self.poll_timeout = poll_timeout
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self, handler: EventHandler):
+        await super().start(handler)
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read_loop())
+
+    async def publish(self, event: QueryEvent):
+        await self._redis.publish(CHANNEL_PREFIX + event.query_id, event.to_wire())
+
+    async def subscribe(self, query_id: str):
+        await self._pubsub.subscribe(CHANNEL_PREFIX + query_id)
+        self.subscribed.add(query_id)
+
+    async def unsubscribe(self, query_id: str):
+        await self._pubsub.unsubscribe(CHANNEL_PREFIX + query_id)
+        self.subscribed.discard(query_id)
+
+    async def _read_loop(self):
+        """Forward channel messages to the handler until cancelled."""
+        while True:
+            try:
+                if not self.subscribed:
+                    await asyncio.sleep(self.poll_timeout)
+                    continue
+
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=self.poll_timeout
+                )
+                if message and message.get("type") == "message":
+                    await self._dispatch(QueryEvent.from_wire(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis pub/sub read failed: {e}")
+                await asyncio.sleep(self.poll_timeout)
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+        await super().close()
+
+
+def create_pubsub(backend: str = "local", redis_url: Optional[str] = None) -> QueryPubSub:
+    """
+    Build a pub/sub backend by name.
+
+    Args:
+        backend: "local" or "redis"
+        redis_url: Required for "redis"
+    """
+    backend = backend.lower()
+    if backend == "local":
+        return LocalPubSub()
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("redis_url is required for the redis pub/sub backend")
+        return RedisPubSub(redis_url)
+    raise ValueError(f"Unknown pub/sub backend: {backend}")
@@ -13,10 +13,13 @@ Replaces simple rule-based debate with nuanced LLM-generated perspectives:
 import os
 import json
 import logging
+import threading
 from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 from enum import Enum
 
+from src.orchestration.query_budget import charge_active_budget
+
 # LLM Provider SDKs
 try:
     from openai import OpenAI
@@ -95,6 +98,21 @@ class DebateResult:
 # Prompt Builder
 # ============================================================================
 
+DEBATE_SYSTEM_PROMPT = (
+    "You are a financial analyst providing multi-perspective analysis. "
+    "Respond ONLY with valid JSON matching this schema: "
+    '{"bull": {"analysis": "...", "confidence": 0.8, "facts": ["..."]}, '
+    '"bear": {"analysis": "...", "confidence": 0.7, "facts": ["..."]}, '
+    '"neutral": {"analysis": "...", "confidence": 0.9, "facts": ["..."]}, '
+    '"synthesis": "...", "confidence": 0.8}'
+)
+
+PERSPECTIVE_SYSTEM_PROMPT = (
+    "You are a financial analyst providing ONE perspective of a debate. "
+    "Respond ONLY with valid JSON matching this schema: "
+    '{"analysis": "...", "confidence": 0.8, "facts": ["..."]}'
+)
+
 class DebatePromptBuilder:
     """
     Builds prompts for LLM debate generation.
@@ -222,6 +240,34 @@ Return as JSON.
 
         return prompt
 
+    # Role focus for single-perspective generation (concurrent debate)
+    PERSPECTIVE_FOCUS = {
+        "bull": "Optimistic: why is this favorable, upside, supporting evidence.",
+        "bear": "Pessimistic: concerns, risks, limitations, counter-evidence.",
+        "neutral": "Balanced: objective assessment, context, key takeaways.",
+    }
+
+    def build_perspective_prompt(self, fact: Dict[str, Any], perspective: str) -> str:
+        """
+        Build prompt asking for ONE perspective only.
+
+        Args:
+            fact: Financial fact dict
+            perspective: "bull", "bear" or "neutral"
+
+        Returns:
+            Formatted prompt string
+        """
+        base = self.build_prompt(fact)
+        focus = self.PERSPECTIVE_FOCUS[perspective]
+
+        return f"""{base}
+
+IMPORTANT: Generate ONLY the **{perspective.capitalize()} Perspective** ({focus})
+Return as JSON:
+{{"analysis": "...", "confidence": 0.0-1.0, "facts": ["..."]}}
+"""
+
 
 # ============================================================================
 # LLM Debate Node
@@ -261,7 +307,8 @@ class LLMDebateNode:
             }
             self.model = defaults.get(provider, "gpt-4o-mini")
 
-        # Cost tracking statistics
+        # Cost tracking statistics (lock: perspectives may run concurrently)
+        self._stats_lock = threading.Lock()
         self.stats = {
             "total_calls": 0,
             "total_cost": 0.0,
@@ -309,6 +356,53 @@ class LLMDebateNode:
             logger.error(f"Debate generation error: {e}", exc_info=True)
             return None
 
+    def generate_perspective(
+        self,
+        fact: Dict[str, Any],
+        perspective: str
+    ) -> Optional[DebatePerspective]:
+        """
+        Generate a single perspective (one LLM call).
+
+        Used by concurrent debate to fan out Bull/Bear/Neutral
+        as independent requests.
+
+        Args:
+            fact: Financial fact dict
+            perspective: "bull", "bear" or "neutral"
+
+        Returns:
+            DebatePerspective or None on failure
+        """
+        try:
+            prompt = self.prompt_builder.build_perspective_prompt(fact, perspective)
+            system_prompt = PERSPECTIVE_SYSTEM_PROMPT
+
+            if self.provider == "mock":
+                response = self._call_mock_llm(fact)[perspective]
+            elif self.provider == "failing_mock":
+                return None
+            elif self.provider == "openai":
+                response = self._call_openai(prompt, system_prompt=system_prompt)
+            elif self.provider == "gemini":
+                response = self._call_gemini(prompt, system_prompt=system_prompt)
+            elif self.provider == "deepseek":
+                response = self._call_deepseek(prompt, system_prompt=system_prompt)
+            else:
+                logger.error(f"Unknown provider: {self.provider}")
+                return None
+
+            return DebatePerspective(
+                name=perspective.capitalize(),
+                analysis=response["analysis"],
+                confidence=response["confidence"],
+                supporting_facts=response.get("facts", [])
+            )
+
+        except Exception as e:
+            logger.error(f"{perspective} perspective generation error: {e}", exc_info=True)
+            return None
+
     def _init_clients(self):
         """Initialize API clients for providers."""
         if self.provider == "openai":
@@ -359,6 +453,11 @@ class LLMDebateNode:
 
     def _update_stats(self, input_tokens: int, output_tokens: int, cost: float):
         """Update cost tracking statistics."""
+        with self._stats_lock:
+            self._update_stats_locked(input_tokens, output_tokens, cost)
+        charge_active_budget(self.provider, cost, input_tokens, output_tokens)
+
+    def _update_stats_locked(self, input_tokens: int, output_tokens: int, cost: float):
         self.stats["total_calls"] += 1
         self.stats["total_input_tokens"] += input_tokens
         self.stats["total_output_tokens"] += output_tokens
@@ -405,7 +504,7 @@ class LLMDebateNode:
             "confidence": 0.82
         }
 
-    def _call_openai(self, prompt: str) -> Dict[str, Any]:
+    def _call_openai(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """
         Call OpenAI API.
 
@@ -421,12 +520,7 @@ class LLMDebateNode:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a financial analyst providing multi-perspective analysis. "
-                                   "Respond ONLY with valid JSON matching this schema: "
-                                   '{"bull": {"analysis": "...", "confidence": 0.8, "facts": ["..."]}, '
-                                   '"bear": {"analysis": "...", "confidence": 0.7, "facts": ["..."]}, '
-                                   '"neutral": {"analysis": "...", "confidence": 0.9, "facts": ["..."]}, '
-                                   '"synthesis": "...", "confidence": 0.8}'
+                        "content": system_prompt or DEBATE_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -465,7 +559,7 @@ class LLMDebateNode:
             logger.error(f"OpenAI API error: {e}", exc_info=True)
             raise
 
-    def _call_gemini(self, prompt: str) -> Dict[str, Any]:
+    def _call_gemini(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """
         Call Google Gemini API.
 
@@ -483,15 +577,7 @@ class LLMDebateNode:
                 "response_mime_type": "application/json",
             }
 
-            system_instruction = """You are a financial analyst providing multi-perspective analysis.
-Respond ONLY with valid JSON matching this schema:
-{
-  "bull": {"analysis": "...", "confidence": 0.8, "facts": ["..."]},
-  "bear": {"analysis": "...", "confidence": 0.7, "facts": ["..."]},
-  "neutral": {"analysis": "...", "confidence": 0.9, "facts": ["..."]},
-  "synthesis": "...",
-  "confidence": 0.8
-}"""
+            system_instruction = system_prompt or DEBATE_SYSTEM_PROMPT
 
             # Create model with system instruction
             model = genai.GenerativeModel(
@@ -529,7 +615,7 @@ Respond ONLY with valid JSON matching this schema:
             logger.error(f"Gemini API error: {e}", exc_info=True)
             raise
 
-    def _call_deepseek(self, prompt: str) -> Dict[str, Any]:
+    def _call_deepseek(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """
         Call DeepSeek API.
 
@@ -546,12 +632,7 @@ Respond ONLY with valid JSON matching this schema:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a financial analyst providing multi-perspective analysis. "
-                                   "Respond ONLY with valid JSON matching this schema: "
-                                   '{"bull": {"analysis": "...", "confidence": 0.8, "facts": ["..."]}, '
-                                   '"bear": {"analysis": "...", "confidence": 0.7, "facts": ["..."]}, '
-                                   '"neutral": {"analysis": "...", "confidence": 0.9, "facts": ["..."]}, '
-                                   '"synthesis": "...", "confidence": 0.8}'
+                        "content": system_prompt or DEBATE_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -9,12 +9,25 @@ Design:
 - Converts DebateResult → DebateReport + Synthesis (orchestrator format)
 
 This replaces mock-based DebaterAgent and SynthesizerAgent with real LLM API.
+
+Concurrent mode (generate_debate_async / generate_debate_concurrent):
+- Bull, Bear and Neutral are generated as three independent LLM calls
+  issued concurrently, optionally on different providers
+- Each DebateReport is streamed to a callback as soon as it lands
+- SynthesizerAgent runs once all three perspectives are available
+Wall-clock debate time ≈ max of the three calls instead of their sum.
 """
 
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import inspect
 import logging
+import time
 
 from .llm_debate import LLMDebateNode, DebateResult, DebatePerspective
+from .synthesizer_agent import SynthesizerAgent
 from .schemas import (
     Perspective,
     Argument,
@@ -41,7 +54,8 @@ class RealLLMDebateAdapter:
         self,
         provider: str = "deepseek",  # Default to cheapest provider
         model: str = None,
-        enable_debate: bool = True
+        enable_debate: bool = True,
+        perspective_providers: Optional[Dict[str, str]] = None
     ):
         """
         Initialize adapter with LLM provider.
@@ -50,15 +64,27 @@ class RealLLMDebateAdapter:
             provider: LLM provider ("openai", "gemini", "deepseek")
             model: Optional model override
             enable_debate: Enable real LLM calls (disable for testing)
+            perspective_providers: Optional per-perspective provider override for
+                                   concurrent mode, e.g. {"bear": "openai"}
         """
         self.provider = provider
         self.enable_debate = enable_debate
         self.llm_node = None
+        self.perspective_providers = perspective_providers or {}
+        self._perspective_nodes: Dict[str, LLMDebateNode] = {}
 
         # Only initialize LLM node if debate is enabled
         # This avoids requiring API keys in test mode
         if self.enable_debate:
             self.llm_node = LLMDebateNode(provider=provider, model=model)
+            self._perspective_nodes[provider] = self.llm_node
+            for perspective_provider in set(self.perspective_providers.values()):
+                if perspective_provider not in self._perspective_nodes:
+                    self._perspective_nodes[perspective_provider] = LLMDebateNode(
+                        provider=perspective_provider
+                    )
+
+        self.synthesizer = SynthesizerAgent(enable_synthesis=True)
 
         self.logger = logging.getLogger(__name__)
 
@@ -103,6 +129,99 @@ class RealLLMDebateAdapter:
 
         return debate_reports, synthesis
 
+    async def generate_debate_async(
+        self,
+        context: DebateContext,
+        original_confidence: float,
+        on_perspective: Optional[Callable[[DebateReport], Any]] = None
+    ) -> Tuple[List[DebateReport], Synthesis]:
+        """
+        Generate Bull/Bear/Neutral concurrently, then synthesize.
+
+        Args:
+            context: DebateContext from VerifiedFact
+            original_confidence: Original confidence before debate
+            on_perspective: Optional callback (sync or async) invoked with each
+                            DebateReport as soon as it is ready
+
+        Returns:
+            Tuple of (debate_reports in Bull/Bear/Neutral order, synthesis)
+
+        Raises:
+            ValueError: If any perspective fails to generate
+        """
+        if not self.enable_debate:
+            return self._empty_reports(context, original_confidence)
+
+        fact = self._context_to_fact(context)
+        started = time.perf_counter()
+
+        async def run_perspective(perspective_type: Perspective) -> DebateReport:
+            name = perspective_type.value
+            node = self._perspective_nodes[self.perspective_providers.get(name, self.provider)]
+
+            # Provider SDKs are blocking: run each call in a worker thread
+            perspective_data = await asyncio.to_thread(node.generate_perspective, fact, name)
+            if perspective_data is None:
+                raise ValueError(f"{name} perspective generation failed ({node.provider})")
+
+            report = self._perspective_to_report(perspective_type, perspective_data, context.fact_id)
+
+            if on_perspective is not None:
+                try:
+                    result = on_perspective(report)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    self.logger.warning(f"Perspective callback failed: {e}")
+
+            return report
+
+        self.logger.info(
+            f"Concurrent debate on fact {context.fact_id} "
+            f"(providers: {self.perspective_providers or self.provider})"
+        )
+        debate_reports = list(await asyncio.gather(*(
+            run_perspective(p)
+            for p in (Perspective.BULL, Perspective.BEAR, Perspective.NEUTRAL)
+        )))
+
+        synthesis = self.synthesizer.synthesize(
+            debate_reports=debate_reports,
+            original_confidence=original_confidence,
+            fact_id=context.fact_id
+        )
+
+        self.logger.info(
+            f"Concurrent debate complete in {(time.perf_counter() - started) * 1000:.0f}ms, "
+            f"confidence {original_confidence:.2f} → {synthesis.adjusted_confidence:.2f}"
+        )
+
+        return debate_reports, synthesis
+
+    def generate_debate_concurrent(
+        self,
+        context: DebateContext,
+        original_confidence: float,
+        on_perspective: Optional[Callable[[DebateReport], Any]] = None
+    ) -> Tuple[List[DebateReport], Synthesis]:
+        """
+        Synchronous entry point for generate_debate_async.
+
+        Safe to call from sync code with or without a running event loop
+        (a running loop is left untouched; a helper thread hosts the debate).
+        """
+        coro = self.generate_debate_async(context, original_confidence, on_perspective)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        # Copy context so LLM calls charge the caller's query budget
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(contextvars.copy_context().run, asyncio.run, coro).result()
+
     def _context_to_fact(self, context: DebateContext) -> Dict[str, Any]:
         """
         Convert DebateContext to fact dict for LLMDebateNode.
@@ -368,4 +487,21 @@ class RealLLMDebateAdapter:
         if not self.enable_debate or not self.llm_node:
             return {}
 
-        return self.llm_node.get_stats()
+        if len(self._perspective_nodes) == 1:
+            return self.llm_node.get_stats()
+
+        # Concurrent mode across providers: aggregate per-node stats
+        stats = {
+            "total_calls": 0,
+            "total_cost": 0.0,
+            "total_input_tokens": 0,
+            "total_output_tokens": 0,
+            "by_provider": {}
+        }
+        for node in self._perspective_nodes.values():
+            node_stats = node.get_stats()
+            for key in ("total_calls", "total_cost", "total_input_tokens", "total_output_tokens"):
+                stats[key] += node_stats[key]
+            stats["by_provider"].update(node_stats["by_provider"])
+
+        return stats
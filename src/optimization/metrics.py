@@ -7,15 +7,17 @@ Metrics:
 1. ExecutabilityMetric - Can the code execute without errors?
 2. CodeQualityMetric - Does the code follow best practices?
 3. TemporalValidityMetric - No look-ahead bias?
+
+All three read the cached single-pass analysis of each block
+(validation.code_analysis), so scoring a plan adds no parses.
 """
 
 from dataclasses import dataclass
-from typing import Optional
-import ast
-import re
+from typing import Iterable, List, Optional
 
 from ..orchestration.schemas.plan_output import AnalysisPlan
 from ..temporal.integrity_checker import TemporalIntegrityChecker
+from ..validation.code_analysis import analyze_code, get_code_analyzer
 
 
 @dataclass
@@ -57,15 +59,15 @@ class ExecutabilityMetric:
         issues = []
 
         for block in plan.code_blocks:
+            analysis = analyze_code(block.code)
+
             # Check 1: Valid Python syntax
-            try:
-                ast.parse(block.code)
-            except SyntaxError as e:
+            if not analysis.parsed:
                 score -= 0.3
-                issues.append(f"Step {block.step_id}: Syntax error - {str(e)}")
+                issues.append(f"Step {block.step_id}: Syntax error - {analysis.syntax_error}")
 
             # Check 2: Imports are approved
-            imports = self._extract_imports(block.code)
+            imports = analysis.fact('imports', [])
             for imp in imports:
                 if imp not in self.approved_packages:
                     score -= 0.1
@@ -93,21 +95,8 @@ class ExecutabilityMetric:
         )
 
     def _extract_imports(self, code: str) -> list[str]:
-        """Extract import statements from code."""
-        imports = []
-        for line in code.split('\n'):
-            line = line.strip()
-            if line.startswith('import '):
-                # Extract: import foo or import foo as bar
-                match = re.match(r'import\s+(\w+)', line)
-                if match:
-                    imports.append(match.group(1))
-            elif line.startswith('from '):
-                # Extract: from foo import bar
-                match = re.match(r'from\s+(\w+)', line)
-                if match:
-                    imports.append(match.group(1))
-        return imports
+        """Extract imported top-level modules from code."""
+        return list(analyze_code(code).fact('imports', []))
 
 
 class CodeQualityMetric:
@@ -135,8 +124,10 @@ class CodeQualityMetric:
         issues = []
 
         for block in plan.code_blocks:
+            analysis = analyze_code(block.code)
+
             # Check 1: No raw numerical assignments (Truth Boundary violation)
-            if self._has_raw_numbers(block.code):
+            if analysis.fact('raw_number_lines'):
                 score -= 0.4
                 issues.append(
                     f"Step {block.step_id}: Contains raw number assignments "
@@ -144,12 +135,12 @@ class CodeQualityMetric:
                 )
 
             # Check 2: Has output statement (print, return, etc.)
-            if not self._has_output(block.code):
+            if not analysis.fact('has_output'):
                 score -= 0.2
                 issues.append(f"Step {block.step_id}: No output statement (print/return)")
 
             # Check 3: No commented-out code (indicates incomplete work)
-            if '# ' in block.code and len([l for l in block.code.split('\n') if l.strip().startswith('#')]) > 2:
+            if '# ' in block.code and analysis.fact('comment_lines', 0) > 2:
                 score -= 0.1
                 issues.append(f"Step {block.step_id}: Excessive commented code")
 
@@ -170,17 +161,12 @@ class CodeQualityMetric:
         )
 
     def _has_raw_numbers(self, code: str) -> bool:
-        """Check if code has raw numerical assignments."""
-        # Pattern: variable = 123.45 (not from calculation)
-        pattern = r'^\s*\w+\s*=\s*-?\d+\.?\d*\s*$'
-        for line in code.split('\n'):
-            if re.match(pattern, line.strip()):
-                return True
-        return False
+        """Check if code has raw numerical assignments (e.g. sharpe = 1.42)."""
+        return bool(analyze_code(code).fact('raw_number_lines'))
 
     def _has_output(self, code: str) -> bool:
-        """Check if code has output statement."""
-        return any(keyword in code for keyword in ['print(', 'return ', 'json.dumps('])
+        """Check if code has output statement (print, return, json.dumps)."""
+        return bool(analyze_code(code).fact('has_output'))
 
 
 class TemporalValidityMetric:
@@ -330,3 +316,48 @@ class CompositeMetric:
                 'temporal': temporal_result.score
             }
         )
+
+    def evaluate_batch(
+        self,
+        plans: Iterable[AnalysisPlan],
+        query_date: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ) -> List[MetricResult]:
+        """
+        Evaluate many plans (golden-set runs, optimization candidates).
+
+        Code blocks are analyzed up front in deduplicated batches (process
+        pool for large batches), in groups that fit the analyzer cache, so
+        per-plan scoring only reads cached analyses.
+
+        Args:
+            plans: Plans to evaluate
+            query_date: Optional query date for temporal checks
+            max_workers: Analysis processes (default: CPU count)
+
+        Returns:
+            MetricResult per plan, in input order
+        """
+        analyzer = get_code_analyzer()
+        group_blocks = max(1, analyzer.max_entries // 2)
+        results: List[MetricResult] = []
+        group: List[AnalysisPlan] = []
+
+        def flush() -> None:
+            codes = [block.code for plan in group for block in plan.code_blocks]
+            for _ in analyzer.analyze_batch(codes, max_workers=max_workers):
+                pass
+            results.extend(self.evaluate(plan, query_date) for plan in group)
+            group.clear()
+
+        blocks = 0
+        for plan in plans:
+            group.append(plan)
+            blocks += len(plan.code_blocks)
+            if blocks >= group_blocks:
+                flush()
+                blocks = 0
+        if group:
+            flush()
+
+        return results
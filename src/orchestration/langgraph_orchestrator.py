@@ -29,6 +29,8 @@ import logging
 from src.vee.sandbox_runner import SandboxRunner, ExecutionResult
 from src.truth_boundary.gate import TruthBoundaryGate, VerifiedFact
 from src.adapters.yfinance_adapter import YFinanceAdapter, MarketData
+from src.adapters.market_data_prefetcher import MarketDataPrefetcher
+from src.orchestration.query_budget import QueryBudget
 from src.debate.debater_agent import DebaterAgent
 from src.debate.synthesizer_agent import SynthesizerAgent
 from src.debate.real_llm_adapter import RealLLMDebateAdapter  # Week 11 Day 2: Real LLM integration
@@ -83,6 +85,9 @@ class APEState:
     start_time: float = field(default_factory=time.time)
     nodes_visited: List[str] = field(default_factory=list)
 
+    # LLM cost/token budget (Week 12), charged in real time by LLM clients
+    budget: QueryBudget = field(default_factory=QueryBudget)
+
     @classmethod
     def from_query(cls, query_id: str, query_text: str) -> 'APEState':
         """Create initial state from query."""
@@ -103,6 +108,7 @@ class APEState:
             'error_count': self.error_count,
             'error_message': self.error_message,
             'nodes_visited': self.nodes_visited,
+            'budget': self.budget.to_dict(),
             # Note: execution_result and verified_fact omitted for simplicity
             # In production, would serialize these too
         }
@@ -127,7 +133,9 @@ class APEState:
             'total_duration_ms': int((time.time() - self.start_time) * 1000),
             'nodes_visited': self.nodes_visited,
             'error_count': self.error_count,
-            'status': self.status.value
+            'status': self.status.value,
+            'cost_usd': self.budget.cost_usd,
+            'tokens_used': self.budget.tokens_used
         }
 
 
@@ -148,7 +156,13 @@ class LangGraphOrchestrator:
         vee_config: Optional[Dict[str, Any]] = None,
         broadcast_callback: Optional[Callable] = None,
         use_real_llm: bool = True,  # Week 11 Day 2: Enable real LLM by default
-        llm_provider: str = "deepseek"  # Week 11 Day 2: Default to cheapest provider
+        llm_provider: str = "deepseek",  # Week 11 Day 2: Default to cheapest provider
+        concurrent_debate: bool = False,
+        perspective_providers: Optional[Dict[str, str]] = None,
+        streaming_plan: bool = False,
+        speculative_prefetch: bool = False,
+        query_budget_usd: Optional[float] = None,
+        query_token_budget: Optional[int] = None
     ):
         """
         Initialize LangGraph orchestrator.
@@ -162,12 +176,28 @@ class LangGraphOrchestrator:
                                Should have signature: (query_id, status, node, progress, facts_count, error, metadata)
             use_real_llm: Use real LLM API for debate (True) or mock agents (False)
             llm_provider: LLM provider for debate ("openai", "gemini", "deepseek")
+            concurrent_debate: Generate Bull/Bear/Neutral as concurrent LLM calls and
+                               stream each perspective as it arrives
+            perspective_providers: Optional per-perspective providers for concurrent
+                                   debate, e.g. {"bull": "deepseek", "bear": "openai"}
+            streaming_plan: Stream PLAN output; prefetch market data as soon as
+                            data_requirements are complete and relay progress
+            speculative_prefetch: Start market data downloads for tickers guessed
+                                  from the query text before PLAN runs
+            query_budget_usd: Per-query LLM cost limit (None = unlimited)
+            query_token_budget: Per-query LLM token limit (None = unlimited)
         """
         self.enable_retry = enable_retry
         self.max_retries = max_retries
         self.broadcast_callback = broadcast_callback
         self.use_real_llm = use_real_llm
         self.llm_provider = llm_provider
+        self.concurrent_debate = concurrent_debate
+        self.streaming_plan = streaming_plan
+        self.speculative_prefetch = speculative_prefetch
+        self.query_budget_usd = query_budget_usd
+        self.query_token_budget = query_token_budget
+        self._downgraded_debate_adapters: Dict[str, RealLLMDebateAdapter] = {}
 
         # Initialize components
         vee_config = vee_config or {}
@@ -179,12 +209,14 @@ class LangGraphOrchestrator:
 
         self.truth_gate = TruthBoundaryGate()
         self.yfinance_adapter = YFinanceAdapter()
+        self.prefetcher = MarketDataPrefetcher(self.yfinance_adapter)
 
         # Initialize debate system (Week 11 Day 2)
         if self.use_real_llm:
             self.debate_adapter = RealLLMDebateAdapter(
                 provider=llm_provider,
-                enable_debate=True
+                enable_debate=True,
+                perspective_providers=perspective_providers
             )
             logger.info(f"Initialized real LLM debate with provider: {llm_provider}")
         else:
@@ -287,11 +319,30 @@ class LangGraphOrchestrator:
             try:
                 from .nodes.plan_node import PlanNode
 
+                # Spent budget (e.g. after retries): don't call the LLM again
+                state.budget.check()
+
                 # Initialize PLAN node (will auto-detect available providers)
-                plan_node = PlanNode(preferred_provider="deepseek")  # Use DeepSeek by default
+                plan_node = PlanNode(
+                    preferred_provider=state.budget.select_provider("deepseek")  # Use DeepSeek by default
+                )
 
                 # Generate plan
-                analysis_plan = plan_node.generate_plan(state.query_text)
+                if self.streaming_plan:
+                    analysis_plan = plan_node.generate_plan_streaming(
+                        state.query_text,
+                        on_data_requirements=self.prefetcher.prefetch_requirements,
+                        on_progress=lambda progress: self._broadcast_update(
+                            query_id=state.query_id,
+                            status="processing",
+                            current_node="PLAN",
+                            progress=0.2,
+                            verified_facts_count=0,
+                            metadata={"plan_stream": progress}
+                        )
+                    )
+                else:
+                    analysis_plan = plan_node.generate_plan(state.query_text)
 
                 # Get execution order (topological sort)
                 execution_order = analysis_plan.get_execution_order()
@@ -434,12 +485,17 @@ class LangGraphOrchestrator:
                         state.status = StateStatus.FAILED
                         return state
 
-                    df = self.yfinance_adapter.fetch_ohlcv(
-                        ticker=ticker,
-                        start_date=start_date,
-                        end_date=end_date,
-                        interval=state.plan.get('interval', '1d')
-                    )
+                    interval = state.plan.get('interval', '1d')
+
+                    # Reuse a prefetch started while PLAN was streaming
+                    df = self.prefetcher.get(ticker, start_date, end_date, interval)
+                    if df is None:
+                        df = self.yfinance_adapter.fetch_ohlcv(
+                            ticker=ticker,
+                            start_date=start_date,
+                            end_date=end_date,
+                            interval=interval
+                        )
                     fetched_data[ticker] = df
 
             state.fetched_data = fetched_data
@@ -669,6 +725,9 @@ class LangGraphOrchestrator:
 
             return state
 
+        if self.use_real_llm and self.debate_adapter and state.budget.exhausted:
+            return self._skip_debate(state)
+
         try:
             # Create debate context from VerifiedFact
             debate_context = DebateContext(
@@ -685,14 +744,22 @@ class LangGraphOrchestrator:
             # Week 11 Day 2: Use real LLM API or mock agents
             if self.use_real_llm and self.debate_adapter:
                 # Real LLM API (production mode)
-                logger.info(f"Using real LLM ({self.llm_provider}) for debate")
-                debate_reports, synthesis = self.debate_adapter.generate_debate(
-                    context=debate_context,
-                    original_confidence=state.verified_fact.confidence_score
-                )
+                debate_adapter = self._debate_adapter_for(state.budget)
+                logger.info(f"Using real LLM ({debate_adapter.provider}) for debate")
+                if self.concurrent_debate:
+                    debate_reports, synthesis = debate_adapter.generate_debate_concurrent(
+                        context=debate_context,
+                        original_confidence=state.verified_fact.confidence_score,
+                        on_perspective=self._make_perspective_streamer(state.query_id)
+                    )
+                else:
+                    debate_reports, synthesis = debate_adapter.generate_debate(
+                        context=debate_context,
+                        original_confidence=state.verified_fact.confidence_score
+                    )
 
                 # Log cost stats
-                stats = self.debate_adapter.get_stats()
+                stats = debate_adapter.get_stats()
                 if stats:
                     logger.info(
                         f"LLM API cost: ${stats.get('total_cost', 0):.6f} "
@@ -769,6 +836,64 @@ class LangGraphOrchestrator:
 
         return state
 
+    def _debate_adapter_for(self, budget: QueryBudget) -> RealLLMDebateAdapter:
+        """Debate adapter for this query: a cheaper provider once the budget runs low."""
+        provider = budget.select_provider(self.llm_provider)
+        if provider == self.llm_provider:
+            return self.debate_adapter
+
+        if provider not in self._downgraded_debate_adapters:
+            self._downgraded_debate_adapters[provider] = RealLLMDebateAdapter(
+                provider=provider,
+                enable_debate=True
+            )
+        return self._downgraded_debate_adapters[provider]
+
+    def _skip_debate(self, state: APEState) -> APEState:
+        """Complete without DEBATE: the verified fact stands at its original confidence."""
+        state.budget.record_action("skip DEBATE: budget exhausted")
+        state.debate_reports = []
+        state.synthesis = None
+        state.status = StateStatus.COMPLETED
+
+        self._broadcast_update(
+            query_id=state.query_id,
+            status="processing",
+            current_node="DEBATE",
+            progress=0.95,
+            verified_facts_count=1,
+            metadata={"debate_skipped": "budget_exhausted", "budget": state.budget.to_dict()}
+        )
+        return state
+
+    def _make_perspective_streamer(self, query_id: str) -> Optional[Callable]:
+        """
+        Build on_perspective callback streaming partial debate results.
+
+        Returns the broadcast coroutine so the debate engine awaits it on its
+        own event loop.
+        """
+        if not self.broadcast_callback:
+            return None
+
+        arrived = []
+
+        def stream(report: DebateReport):
+            arrived.append(report.perspective.value)
+            return self.broadcast_callback(
+                query_id, "processing", "DEBATE",
+                0.9 + 0.05 * len(arrived) / 3,
+                1, None,
+                {
+                    "perspective": report.perspective.value,
+                    "overall_stance": report.overall_stance,
+                    "key_points": report.key_points,
+                    "perspectives_ready": list(arrived)
+                }
+            )
+
+        return stream
+
     def error_node(self, state: APEState) -> APEState:
         """
         ERROR node: Handle errors with retry logic.
@@ -783,7 +908,11 @@ class LangGraphOrchestrator:
         state.nodes_visited.append('ERROR')
         state.error_count += 1
 
-        if self.enable_retry and state.error_count < self.max_retries:
+        if state.budget.exhausted:
+            # Retrying would only spend more
+            state.budget.record_action("no retry: budget exhausted")
+            state.status = StateStatus.FAILED
+        elif self.enable_retry and state.error_count < self.max_retries:
             # Retry: reset to INITIALIZED
             state.status = StateStatus.INITIALIZED
             state.execution_result = None
@@ -852,36 +981,47 @@ class LangGraphOrchestrator:
         """
         # Initialize state
         state = APEState.from_query(query_id, query_text)
+        state.budget = QueryBudget(
+            max_cost_usd=self.query_budget_usd,
+            max_tokens=self.query_token_budget
+        )
 
-        # Run state machine
-        while state.status not in [StateStatus.COMPLETED, StateStatus.FAILED]:
-            next_node = self.get_next_node(state.status)
-
-            if next_node == 'END':
-                break
-
-            # Handle conditional edge
-            if next_node == 'should_fetch':
-                next_node = self.should_fetch(state)
-
-            # Execute node
-            if next_node == 'PLAN':
-                state = self.plan_node(state, direct_code=direct_code)
-            elif next_node == 'FETCH':
-                state = self.fetch_node(state)
-            elif next_node == 'VEE':
-                state = self.vee_node(state)
-            elif next_node == 'GATE':
-                state = self.gate_node(state)
-            elif next_node == 'DEBATE':
-                state = self.debate_node(state)
-            elif next_node == 'ERROR':
-                state = self.error_node(state)
-
-                # Check if we should give up
-                if state.error_count >= self.max_retries:
+        # Warm market data while PLAN waits on the LLM
+        if self.speculative_prefetch and direct_code is None:
+            self.prefetcher.speculate(query_text)
+
+        # Run state machine (LLM calls made meanwhile charge state.budget)
+        with state.budget.activate():
+            while state.status not in [StateStatus.COMPLETED, StateStatus.FAILED]:
+                next_node = self.get_next_node(state.status)
+
+                if next_node == 'END':
                     break
 
+                # Handle conditional edge
+                if next_node == 'should_fetch':
+                    next_node = self.should_fetch(state)
+
+                state.budget.stage = next_node
+
+                # Execute node
+                if next_node == 'PLAN':
+                    state = self.plan_node(state, direct_code=direct_code)
+                elif next_node == 'FETCH':
+                    state = self.fetch_node(state)
+                elif next_node == 'VEE':
+                    state = self.vee_node(state)
+                elif next_node == 'GATE':
+                    state = self.gate_node(state)
+                elif next_node == 'DEBATE':
+                    state = self.debate_node(state)
+                elif next_node == 'ERROR':
+                    state = self.error_node(state)
+
+                    # Check if we should give up
+                    if state.error_count >= self.max_retries:
+                        break
+
         # Broadcast final status
         if state.status == StateStatus.COMPLETED:
             self._broadcast_update(
@@ -892,7 +1032,9 @@ class LangGraphOrchestrator:
                 verified_facts_count=1 if state.verified_fact else 0,
                 metadata={
                     "duration_ms": int((time.time() - state.start_time) * 1000),
-                    "nodes_visited": state.nodes_visited
+                    "nodes_visited": state.nodes_visited,
+                    "prefetch": self.prefetcher.get_stats(),
+                    "budget": state.budget.to_dict()
                 }
             )
         elif state.status == StateStatus.FAILED:
@@ -906,7 +1048,8 @@ class LangGraphOrchestrator:
                 metadata={
                     "duration_ms": int((time.time() - state.start_time) * 1000),
                     "nodes_visited": state.nodes_visited,
-                    "error_count": state.error_count
+                    "error_count": state.error_count,
+                    "budget": state.budget.to_dict()
                 }
             )
 
@@ -3,6 +3,7 @@ PLAN Node - Generates executable analysis plans from user queries.
 
 Week 1 Day 3: Core implementation with Claude Sonnet 4.5
 Week 11 Day 5: Made provider-agnostic with fallback chain (Anthropic → DeepSeek → OpenAI → Gemini)
+Week 12: Streaming plan generation (data_requirements available before code_blocks)
 
 Design principles (Truth Boundary):
 1. LLM generates CODE, not numbers
@@ -10,13 +11,17 @@ Design principles (Truth Boundary):
 3. Plan must be fully executable and deterministic
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List
 from datetime import datetime, UTC
 import json
 import logging
 
+from pydantic import ValidationError
+
 from ..universal_llm_client import UniversalLLMClient, LLMResponse
-from ..schemas.plan_output import AnalysisPlan, PlanValidationResult
+from ..streaming_json import IncrementalJSONParser
+from ..schemas.plan_output import AnalysisPlan, DataRequirement, PlanValidationResult
+from ...validation.code_analysis import analyze_code
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +42,8 @@ class PlanNode:
         api_key: Optional[str] = None,
         model: str = None,
         enable_validation: bool = True,
-        preferred_provider: Optional[str] = None
+        preferred_provider: Optional[str] = None,
+        enable_hedging: bool = False
     ):
         """
         Initialize PLAN node with provider-agnostic LLM client.
@@ -48,6 +54,8 @@ class PlanNode:
             enable_validation: Enable plan validation
             preferred_provider: Preferred LLM provider ("anthropic", "deepseek", "openai", "gemini")
                                If None, tries all in fallback order
+            enable_hedging: Race the next provider when the current one is slow
+                            (first schema-valid plan wins)
         """
         # Create universal client with fallback chain
         try:
@@ -55,7 +63,8 @@ class PlanNode:
                 preferred_provider=preferred_provider,
                 model=model,
                 temperature=0.0,  # Deterministic for planning
-                max_tokens=4096
+                max_tokens=4096,
+                enable_hedging=enable_hedging
             )
             logger.info(f"✅ PLAN node initialized with providers: {list(self.client.available_providers.keys())}")
         except ValueError as e:
@@ -214,15 +223,25 @@ REMINDER: You MUST include ALL mandatory fields. Do NOT use field names like "se
 
         # Generate plan using universal client (with provider fallback)
         try:
+            generate_kwargs = {}
+            if self.client.enable_hedging:
+                # Hedged race: a schema-invalid plan must not win
+                generate_kwargs["validator"] = self._is_valid_plan_response
+
             response = self.client.generate(
                 system_prompt=self.system_prompt,
                 user_prompt=prompt,
-                json_mode=True  # Request structured JSON output
+                json_mode=True,  # Request structured JSON output
+                cache_system_prompt=True,  # Large static prompt: provider-side prefix cache
+                **generate_kwargs
             )
 
             # Track which provider was used
             self.last_provider_used = response.provider
-            logger.info(f"Plan generated by {response.provider} ({response.model}), cost: ${response.cost:.6f}")
+            logger.info(
+                f"Plan generated by {response.provider} ({response.model}), cost: ${response.cost:.6f}, "
+                f"cache read/write: {response.cache_read_tokens}/{response.cache_write_tokens} tokens"
+            )
 
             # Parse JSON response to AnalysisPlan (Pydantic model)
             plan_dict = json.loads(response.content)
@@ -237,6 +256,89 @@ REMINDER: You MUST include ALL mandatory fields. Do NOT use field names like "se
             logger.error(f"Plan generation failed: {e}", exc_info=True)
             raise ValueError(f"Failed to generate plan: {e}")
 
+        return self._finalize_plan(plan, user_query)
+
+    def generate_plan_streaming(
+        self,
+        user_query: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_data_requirements: Optional[Callable[[List[DataRequirement]], None]] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> AnalysisPlan:
+        """
+        Generate analysis plan with streamed LLM output.
+
+        Top-level plan fields are parsed as soon as they close. Once
+        data_requirements is complete and schema-valid, on_data_requirements
+        fires, so market data can be prefetched while code_blocks are still
+        being generated.
+
+        Args:
+            user_query: User's question
+            context: Optional context (previous queries, user preferences)
+            on_data_requirements: Called once with validated DataRequirements
+            on_progress: Called per completed field with
+                         {"field", "fields_completed", "chars_received"}
+
+        Returns:
+            Validated AnalysisPlan
+
+        Raises:
+            ValueError: If plan generation fails
+        """
+        prompt = self._build_prompt(user_query, context)
+        parser = IncrementalJSONParser()
+
+        def on_chunk(text: str) -> None:
+            for key, value in parser.feed(text):
+                if key == "data_requirements" and on_data_requirements:
+                    try:
+                        requirements = [DataRequirement.model_validate(r) for r in value]
+                    except (ValidationError, TypeError) as e:
+                        logger.warning(f"Streamed data_requirements invalid, not prefetching: {e}")
+                    else:
+                        on_data_requirements(requirements)
+
+                if on_progress:
+                    on_progress({
+                        "field": key,
+                        "fields_completed": list(parser.fields.keys()),
+                        "chars_received": parser.chars_received
+                    })
+
+        try:
+            response = self.client.generate_stream(
+                system_prompt=self.system_prompt,
+                user_prompt=prompt,
+                json_mode=True,
+                on_chunk=on_chunk,
+                cache_system_prompt=True
+            )
+
+            self.last_provider_used = response.provider
+            logger.info(
+                f"Plan streamed by {response.provider} ({response.model}), cost: ${response.cost:.6f}, "
+                f"first token {response.first_token_ms:.0f}ms, total {response.latency_ms:.0f}ms"
+            )
+
+            # Parser already holds the decoded object; fall back to a full parse
+            plan_dict = parser.result
+            if plan_dict is None:
+                plan_dict = json.loads(response.content)
+            plan = AnalysisPlan.model_validate(plan_dict)
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse streamed plan JSON: {e}")
+            raise ValueError(f"LLM returned invalid JSON: {e}")
+
+        except Exception as e:
+            logger.error(f"Plan generation failed: {e}", exc_info=True)
+            raise ValueError(f"Failed to generate plan: {e}")
+
+        return self._finalize_plan(plan, user_query)
+
+    def _finalize_plan(self, plan: AnalysisPlan, user_query: str) -> AnalysisPlan:
+        """Attach query metadata and run safety validation."""
         # Add query metadata
         plan.query_id = plan.query_id or self._generate_query_id()
         plan.user_query = user_query
@@ -251,6 +353,15 @@ REMINDER: You MUST include ALL mandatory fields. Do NOT use field names like "se
 
         return plan
 
+    @staticmethod
+    def _is_valid_plan_response(response: LLMResponse) -> bool:
+        """Check that an LLM response parses into an AnalysisPlan."""
+        try:
+            AnalysisPlan.model_validate(json.loads(response.content))
+            return True
+        except Exception:
+            return False
+
     def _build_prompt(
         self,
         user_query: str,
@@ -280,7 +391,8 @@ Return the plan as valid JSON matching the AnalysisPlan schema."""
         Validate analysis plan for safety and correctness.
 
         Checks:
-        1. No forbidden operations (file access, subprocess)
+        1. No forbidden operations (file access, subprocess), including
+           aliased forms (import subprocess as sp; getattr(builtins, 'eval'))
         2. All dependencies are satisfied
         3. Execution order is valid (no cycles)
         4. Timeouts are reasonable
@@ -295,19 +407,12 @@ Return the plan as valid JSON matching the AnalysisPlan schema."""
         errors = []
         warnings = []
 
-        # Check code blocks for forbidden operations
-        forbidden_terms = [
-            'os.system', 'subprocess', 'eval(', 'exec(',
-            '__import__', 'open(', 'file(', 'input('
-        ]
-
         for block in plan.code_blocks:
-            # Check forbidden terms
-            for term in forbidden_terms:
-                if term in block.code:
-                    errors.append(
-                        f"Step {block.step_id}: Forbidden operation '{term}'"
-                    )
+            # Check forbidden operations (cached AST analysis, aliases resolved)
+            for name in analyze_code(block.code).forbidden_names():
+                errors.append(
+                    f"Step {block.step_id}: Forbidden operation '{name}'"
+                )
 
             # Check timeout
             if block.timeout_seconds > 300:
@@ -351,5 +456,6 @@ Return the plan as valid JSON matching the AnalysisPlan schema."""
         return {
             "available_providers": list(self.client.available_providers.keys()),
             "last_provider_used": self.last_provider_used,
-            "validation_enabled": self.enable_validation
+            "validation_enabled": self.enable_validation,
+            "token_usage": self.client.get_usage_stats()
         }
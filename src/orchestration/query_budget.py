@@ -0,0 +1,180 @@
+"""
+Per-query LLM cost and token budget.
+
+Week 12: Real-time budget enforcement across PLAN, DEBATE and retries.
+
+A QueryBudget travels with APEState. While a query runs, its budget is the
+"active" budget (a context variable), so every LLM call made on the query's
+behalf - PLAN via UniversalLLMClient, DEBATE via LLMDebateNode, hedged
+duplicates and retries - is charged the moment its usage is known, without
+threading the budget through every call signature.
+
+Enforcement is graduated:
+- past downgrade_fraction of either limit: cheaper providers, no hedging
+- exhausted: no new LLM calls (BudgetExceededError), DEBATE skipped,
+  no retries
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+# Cheapest first (per-token list prices, see src/api/cost_tracking.PRICING)
+PROVIDER_COST_RANK = ["deepseek", "gemini", "openai", "anthropic"]
+
+_active_budget: ContextVar[Optional["QueryBudget"]] = ContextVar("active_query_budget", default=None)
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised instead of making an LLM call once the query budget is spent."""
+
+
+@dataclass
+class QueryBudget:
+    """
+    Running LLM usage for one query, with optional limits.
+
+    Attributes:
+        max_cost_usd: Cost limit (None = unlimited)
+        max_tokens: Input+output token limit (None = unlimited)
+        downgrade_fraction: Share of a limit after which cheaper providers are used
+    """
+    max_cost_usd: Optional[float] = None
+    max_tokens: Optional[int] = None
+    downgrade_fraction: float = 0.7
+
+    cost_usd: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    calls: int = 0
+    by_node: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    actions: List[str] = field(default_factory=list)
+    stage: str = "UNKNOWN"
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def tokens_used(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def used_fraction(self) -> float:
+        """Highest share consumed of any configured limit (0 if unlimited)."""
+        fractions = [0.0]
+        if self.max_cost_usd:
+            fractions.append(self.cost_usd / self.max_cost_usd)
+        if self.max_tokens:
+            fractions.append(self.tokens_used / self.max_tokens)
+        return max(fractions)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.used_fraction >= 1.0
+
+    @property
+    def should_downgrade(self) -> bool:
+        return self.used_fraction >= self.downgrade_fraction
+
+    def charge(
+        self,
+        provider: str,
+        cost_usd: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0
+    ) -> None:
+        """Record usage of one LLM call against the current stage."""
+        with self._lock:
+            self.calls += 1
+            self.cost_usd += cost_usd
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+            node = self.by_node.setdefault(
+                self.stage, {"calls": 0, "cost_usd": 0.0, "tokens": 0}
+            )
+            node["calls"] += 1
+            node["cost_usd"] += cost_usd
+            node["tokens"] += input_tokens + output_tokens
+
+        if self.exhausted:
+            logger.warning(
+                f"Query budget exhausted at {self.stage} by {provider}: "
+                f"${self.cost_usd:.4f}, {self.tokens_used} tokens"
+            )
+
+    def check(self) -> None:
+        """Raise BudgetExceededError if no further LLM calls are allowed."""
+        if self.exhausted:
+            raise BudgetExceededError(
+                f"Query budget exhausted (${self.cost_usd:.4f} of "
+                f"${self.max_cost_usd}, {self.tokens_used} of {self.max_tokens} tokens)"
+            )
+
+    def select_provider(self, preferred: str) -> str:
+        """Preferred provider, or the cheapest one once downgrading."""
+        if not self.should_downgrade:
+            return preferred
+
+        cheapest = PROVIDER_COST_RANK[0]
+        if preferred != cheapest and self._rank(preferred) > self._rank(cheapest):
+            self.record_action(f"downgrade {self.stage}: {preferred} -> {cheapest}")
+            return cheapest
+        return preferred
+
+    @staticmethod
+    def _rank(provider: str) -> int:
+        return PROVIDER_COST_RANK.index(provider) if provider in PROVIDER_COST_RANK else len(PROVIDER_COST_RANK)
+
+    def record_action(self, action: str) -> None:
+        """Note an enforcement decision (reported with the query)."""
+        logger.info(f"Budget action: {action}")
+        with self._lock:
+            self.actions.append(action)
+
+    @contextmanager
+    def activate(self) -> Iterator["QueryBudget"]:
+        """Make this the budget charged by LLM calls in the current context."""
+        token = _active_budget.set(self)
+        try:
+            yield self
+        finally:
+            _active_budget.reset(token)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_cost_usd": self.max_cost_usd,
+                "max_tokens": self.max_tokens,
+                "cost_usd": round(self.cost_usd, 6),
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "tokens_used": self.tokens_used,
+                "calls": self.calls,
+                "used_fraction": self.used_fraction,
+                "by_node": {k: dict(v) for k, v in self.by_node.items()},
+                "actions": list(self.actions),
+            }
+
+
+def get_active_budget() -> Optional[QueryBudget]:
+    """Budget of the query running in this context, if any."""
+    return _active_budget.get()
+
+
+def charge_active_budget(
+    provider: str,
+    cost_usd: float,
+    input_tokens: int = 0,
+    output_tokens: int = 0
+) -> None:
+    """Charge an LLM call to the active query budget (no-op outside a query)."""
+    budget = _active_budget.get()
+    if budget is not None:
+        budget.charge(provider, cost_usd, input_tokens, output_tokens)
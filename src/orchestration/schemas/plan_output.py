@@ -8,6 +8,11 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime, UTC
 
+from ...validation.code_analysis import analyze_code
+
+# Forbidden at plan-construction time (PlanNode.validate_plan and VEE are stricter)
+BLOCK_FORBIDDEN_ROOTS = {'os', 'subprocess', 'eval', 'exec', '__import__'}
+
 
 class DataRequirement(BaseModel):
     """Single data requirement for analysis."""
@@ -54,11 +59,11 @@ class CodeBlock(BaseModel):
     @classmethod
     def validate_no_imports_outside_allowed(cls, v):
         """Ensure only safe imports are used."""
-        # Basic validation - full validation happens in VEE
-        forbidden = ['os.', 'subprocess', 'eval', 'exec', '__import__']
-        for term in forbidden:
-            if term in v:
-                raise ValueError(f"Forbidden term '{term}' in code")
+        # Basic validation - full validation happens in VEE. The analysis is
+        # cached, so validate_plan, the plan metrics and TIM reuse this parse.
+        for name in analyze_code(v).forbidden_names():
+            if name.split('.')[0] in BLOCK_FORBIDDEN_ROOTS:
+                raise ValueError(f"Forbidden term '{name}' in code")
         return v
 
 
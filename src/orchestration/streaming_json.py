@@ -0,0 +1,141 @@
+"""
+Incremental JSON parser for streamed LLM output.
+
+Week 12: Streaming PLAN generation.
+
+Consumes a JSON object chunk by chunk (as tokens arrive from the LLM) and
+reports each TOP-LEVEL field the moment its value closes, e.g.
+"data_requirements" is available long before "code_blocks" has finished
+streaming. Scanning is a single left-to-right pass: every character is
+looked at once, regardless of how the text is chunked.
+
+Leading noise before the first '{' (markdown fences, "Here is the plan:")
+and trailing noise after the closing '}' are ignored.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    """
+    Streaming parser for a single top-level JSON object.
+
+    Usage:
+        parser = IncrementalJSONParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                print(f"{key} ready")
+        plan_dict = parser.result  # full object once parser.complete
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.errors: List[str] = []
+        self.complete = False
+        self.chars_received = 0
+
+        self._chunks: List[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._phase = "key"  # "key" | "value" (only meaningful at depth 1)
+        self._key_chars: List[str] = []
+        self._value_chars: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Full raw text received so far."""
+        return "".join(self._chunks)
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Parsed object once the closing brace has been seen, else None."""
+        if not self.complete or self.errors:
+            return None
+        return dict(self.fields)
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume a chunk of streamed text.
+
+        Args:
+            chunk: Next piece of LLM output
+
+        Returns:
+            List of (key, value) for top-level fields completed by this chunk
+        """
+        self._chunks.append(chunk)
+        self.chars_received += len(chunk)
+        completed: List[Tuple[str, Any]] = []
+
+        for ch in chunk:
+            if self.complete:
+                break
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._collect(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._collect(ch)
+            elif ch in "{[":
+                self._depth += 1
+                self._collect(ch)
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_field(completed)
+                    self.complete = True
+                else:
+                    self._collect(ch)
+            elif self._depth == 1 and ch == ",":
+                self._finish_field(completed)
+                self._phase = "key"
+            elif self._depth == 1 and ch == ":":
+                self._phase = "value"
+            else:
+                self._collect(ch)
+
+        return completed
+
+    def _collect(self, ch: str) -> None:
+        """Route a character to the current key or value buffer."""
+        if self._phase == "value":
+            self._value_chars.append(ch)
+        elif self._depth == 1:
+            self._key_chars.append(ch)
+
+    def _finish_field(self, completed: List[Tuple[str, Any]]) -> None:
+        """Decode the buffered key/value pair (if any) and reset buffers."""
+        raw_key = "".join(self._key_chars).strip()
+        raw_value = "".join(self._value_chars).strip()
+        self._key_chars = []
+        self._value_chars = []
+
+        if not raw_key and not raw_value:
+            return  # e.g. "{}" or trailing comma
+
+        try:
+            key = json.loads(raw_key)
+            value = json.loads(raw_value)
+        except json.JSONDecodeError as e:
+            self.errors.append(f"Invalid field {raw_key[:50]}: {e}")
+            return
+
+        self.fields[key] = value
+        completed.append((key, value))
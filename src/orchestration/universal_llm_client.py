@@ -10,13 +10,37 @@ Supports fallback chain:
 4. Gemini (gemini-2.5-flash) - tertiary fallback
 
 Critical: This unblocks pipeline when Anthropic Console is down.
+
+Hedged requests (tail latency):
+    With enable_hedging=True, generate() fires the same request at the next
+    provider when the current one has not answered within its observed p95
+    latency. The first response that passes the optional validator wins and
+    the remaining calls are abandoned. A hedge budget (fraction of requests
+    and extra USD spend) keeps hedging from doubling cost.
+
+Prompt caching:
+    With cache_system_prompt=True the system prompt is marked as a cacheable
+    prefix (Anthropic cache_control). OpenAI and DeepSeek cache stable
+    prefixes automatically; their cached-token counts are read from usage.
+    Cached and uncached tokens are reported separately on LLMResponse and
+    priced via CostTracker.calculate_llm_cost.
+
+Streaming:
+    generate_stream() streams tokens from any provider and hands each text
+    chunk to a callback (see streaming_json.IncrementalJSONParser), so
+    callers can act on partial output before the completion finishes.
 """
 
 import os
 import json
+import time
+import contextvars
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, Optional, List, Callable, Deque
+from dataclasses import dataclass, field
 
 # Import LLM SDKs
 try:
@@ -34,6 +58,14 @@ try:
 except ImportError:
     genai = None
 
+try:
+    from src.api.cost_tracking import CostTracker, resolve_model_pricing
+except ImportError:
+    CostTracker = None
+    resolve_model_pricing = None
+
+from src.orchestration.query_budget import get_active_budget, charge_active_budget
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +78,125 @@ class LLMResponse:
     input_tokens: int = 0
     output_tokens: int = 0
     cost: float = 0.0
+    latency_ms: float = 0.0
+    hedged: bool = False
+    # Prompt caching: input_tokens above excludes these
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    # Streaming: time until the first text chunk arrived
+    first_token_ms: float = 0.0
+
+
+def _usage_int(usage: Any, name: str) -> int:
+    """Read an optional integer usage field (absent on older SDKs)."""
+    value = getattr(usage, name, 0) if usage is not None else 0
+    return value if isinstance(value, int) else 0
+
+
+class ProviderLatencyTracker:
+    """
+    Rolling per-provider latency histogram used to derive hedge delays.
+
+    Keeps the last `window` successful call latencies per provider and
+    answers percentile queries. Until `min_samples` observations exist the
+    caller-supplied default is returned.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, latency_seconds: float) -> None:
+        """Record one successful call latency (seconds)."""
+        with self._lock:
+            samples = self._samples.get(provider)
+            if samples is None:
+                samples = deque(maxlen=self.window)
+                self._samples[provider] = samples
+            samples.append(latency_seconds)
+
+    def percentile(
+        self,
+        provider: str,
+        pct: float = 95.0,
+        default: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Latency percentile for provider (nearest-rank).
+
+        Returns default when fewer than min_samples observations exist.
+        """
+        with self._lock:
+            samples = list(self._samples.get(provider, ()))
+
+        if len(samples) < self.min_samples:
+            return default
+
+        samples.sort()
+        rank = max(0, min(len(samples) - 1, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[rank]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider sample count, p50 and p95 (seconds)."""
+        with self._lock:
+            providers = list(self._samples.keys())
+        return {
+            provider: {
+                "samples": len(self._samples[provider]),
+                "p50": self.percentile(provider, 50.0),
+                "p95": self.percentile(provider, 95.0),
+            }
+            for provider in providers
+        }
+
+
+@dataclass
+class HedgeBudget:
+    """
+    Caps on hedging spend.
+
+    max_hedge_fraction: maximum share of generate() calls that may fire a hedge
+    max_extra_cost_usd: maximum cumulative cost of responses that lost the race
+    """
+    max_hedge_fraction: float = 0.2
+    max_extra_cost_usd: float = 1.0
+
+    total_requests: int = 0
+    hedged_requests: int = 0
+    extra_cost_usd: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def register_request(self) -> None:
+        with self._lock:
+            self.total_requests += 1
+
+    def try_acquire_hedge(self) -> bool:
+        """Reserve one hedge if both caps allow it."""
+        with self._lock:
+            if self.extra_cost_usd >= self.max_extra_cost_usd:
+                return False
+            allowed = self.max_hedge_fraction * max(1, self.total_requests)
+            if self.hedged_requests + 1 > allowed:
+                return False
+            self.hedged_requests += 1
+            return True
+
+    def record_wasted_cost(self, cost: float) -> None:
+        """Account cost of a response that was not used."""
+        with self._lock:
+            self.extra_cost_usd += cost
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total_requests": self.total_requests,
+                "hedged_requests": self.hedged_requests,
+                "extra_cost_usd": self.extra_cost_usd,
+                "max_hedge_fraction": self.max_hedge_fraction,
+                "max_extra_cost_usd": self.max_extra_cost_usd,
+            }
 
 
 class UniversalLLMClient:
@@ -85,7 +236,11 @@ class UniversalLLMClient:
         preferred_provider: Optional[str] = None,
         model: Optional[str] = None,
         temperature: float = 0.0,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        enable_hedging: bool = False,
+        hedge_delay_seconds: float = 8.0,
+        hedge_percentile: float = 95.0,
+        hedge_budget: Optional[HedgeBudget] = None
     ):
         """
         Initialize universal client.
@@ -96,12 +251,35 @@ class UniversalLLMClient:
             model: Model override (uses default if None)
             temperature: LLM temperature (0.0 = deterministic)
             max_tokens: Maximum output tokens
+            enable_hedging: Race the next provider when the current one is slow
+            hedge_delay_seconds: Hedge delay used until enough latency samples exist
+            hedge_percentile: Latency percentile that triggers a hedge (default p95)
+            hedge_budget: Caps on hedge fraction and wasted spend
         """
         self.preferred_provider = preferred_provider
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
 
+        # Hedged requests (tail latency)
+        self.enable_hedging = enable_hedging
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget or HedgeBudget()
+        self.latency_tracker = ProviderLatencyTracker()
+
+        # Prompt caching: pricing via CostTracker, cumulative token usage
+        self._cost_tracker = CostTracker(enable_metrics=False) if CostTracker else None
+        self._usage_lock = threading.Lock()
+        self.usage_stats = {
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_tokens": 0,
+            "cache_write_tokens": 0,
+            "cost": 0.0,
+        }
+
         # Try to initialize providers
         self.available_providers = self._detect_available_providers()
 
@@ -168,11 +346,24 @@ class UniversalLLMClient:
 
         return available
 
+    def _provider_order(self) -> List[str]:
+        """Providers in the order they should be tried."""
+        if self.preferred_provider and self.preferred_provider in self.available_providers:
+            return [self.preferred_provider] + [
+                p for p in self.available_providers.keys() if p != self.preferred_provider
+            ]
+
+        # Default order: anthropic → deepseek → openai → gemini
+        providers_to_try = ["anthropic", "deepseek", "openai", "gemini"]
+        return [p for p in providers_to_try if p in self.available_providers]
+
     def generate(
         self,
         system_prompt: str,
         user_prompt: str,
-        json_mode: bool = False
+        json_mode: bool = False,
+        validator: Optional[Callable[[LLMResponse], bool]] = None,
+        cache_system_prompt: bool = False
     ) -> LLMResponse:
         """
         Generate completion using first available provider.
@@ -181,34 +372,50 @@ class UniversalLLMClient:
             system_prompt: System instructions
             user_prompt: User query
             json_mode: Request structured JSON output
+            validator: Optional check (e.g. schema validation); a response that
+                       fails it is treated like a provider error
+            cache_system_prompt: Mark system prompt as a cacheable prefix
+                                 (use for large static prompts)
 
         Returns:
             LLMResponse with content and metadata
 
         Raises:
             RuntimeError: If all providers fail
+            BudgetExceededError: If the active query budget is spent
         """
-        # Determine provider order
-        if self.preferred_provider and self.preferred_provider in self.available_providers:
-            providers_to_try = [self.preferred_provider] + [
-                p for p in self.available_providers.keys() if p != self.preferred_provider
-            ]
-        else:
-            # Default order: anthropic → deepseek → openai → gemini
-            providers_to_try = ["anthropic", "deepseek", "openai", "gemini"]
-            providers_to_try = [p for p in providers_to_try if p in self.available_providers]
+        budget = get_active_budget()
+        if budget is not None:
+            budget.check()
+
+        providers_to_try = self._provider_order()
+        self.hedge_budget.register_request()
+
+        # Hedging duplicates spend; not once the query budget is running low
+        hedging = self.enable_hedging and not (budget is not None and budget.should_downgrade)
+
+        if hedging and len(providers_to_try) > 1:
+            return self._generate_hedged(
+                providers_to_try, system_prompt, user_prompt, json_mode, validator,
+                cache_system_prompt
+            )
 
         errors = []
 
         for provider in providers_to_try:
+            if budget is not None:
+                budget.check()  # Don't fall back into a spent budget
             try:
                 logger.info(f"Trying provider: {provider}")
-                response = self._call_provider(
+                response = self._timed_call(
                     provider,
                     system_prompt,
                     user_prompt,
-                    json_mode
+                    json_mode,
+                    cache_system_prompt
                 )
+                if validator is not None and not validator(response):
+                    raise ValueError("response failed validation")
                 logger.info(f"✅ Success with {provider} ({response.model})")
                 return response
 
@@ -218,24 +425,454 @@ class UniversalLLMClient:
                 errors.append(error_msg)
                 continue
 
-        # All providers failed
+        self._raise_all_failed(errors)
+
+    def _raise_all_failed(self, errors: List[str]) -> None:
+        """Raise the aggregated all-providers-failed error."""
         error_summary = "\n".join(f"  - {e}" for e in errors)
         raise RuntimeError(
             f"All LLM providers failed!\n{error_summary}\n\n"
             f"Available providers: {list(self.available_providers.keys())}"
         )
 
+    def _timed_call(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool,
+        cache_system_prompt: bool = False
+    ) -> LLMResponse:
+        """Call provider, record latency (hedge delay) and token usage."""
+        started = time.perf_counter()
+        response = self._call_provider(
+            provider, system_prompt, user_prompt, json_mode,
+            cache_system_prompt=cache_system_prompt
+        )
+        elapsed = time.perf_counter() - started
+        self.latency_tracker.record(provider, elapsed)
+        response.latency_ms = elapsed * 1000
+        self._record_usage(response)
+        return response
+
+    def _record_usage(self, response: LLMResponse) -> None:
+        """Accumulate cached/uncached token counts and cost."""
+        with self._usage_lock:
+            self.usage_stats["calls"] += 1
+            self.usage_stats["input_tokens"] += response.input_tokens
+            self.usage_stats["output_tokens"] += response.output_tokens
+            self.usage_stats["cache_read_tokens"] += response.cache_read_tokens
+            self.usage_stats["cache_write_tokens"] += response.cache_write_tokens
+            self.usage_stats["cost"] += response.cost
+
+        charge_active_budget(
+            response.provider,
+            response.cost,
+            response.input_tokens + response.cache_read_tokens + response.cache_write_tokens,
+            response.output_tokens
+        )
+
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Cumulative token usage, including prompt-cache hit ratio."""
+        with self._usage_lock:
+            stats = dict(self.usage_stats)
+        prompt_tokens = stats["input_tokens"] + stats["cache_read_tokens"] + stats["cache_write_tokens"]
+        stats["cache_hit_ratio"] = (
+            stats["cache_read_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        )
+        return stats
+
+    def _compute_cost(
+        self,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0
+    ) -> float:
+        """
+        Price a call via CostTracker.calculate_llm_cost.
+
+        Falls back to the flat PRICING table (cached tokens billed as input)
+        when the model is unknown to CostTracker.
+        """
+        if self._cost_tracker is not None and resolve_model_pricing(provider, model):
+            return float(self._cost_tracker.calculate_llm_cost(
+                provider, model, input_tokens, output_tokens,
+                cache_read_tokens, cache_write_tokens
+            ))
+
+        pricing = self.PRICING.get(provider, {"input": 0.0, "output": 0.0})
+        billed_input = input_tokens + cache_read_tokens + cache_write_tokens
+        return (billed_input / 1_000_000) * pricing["input"] + \
+               (output_tokens / 1_000_000) * pricing["output"]
+
+    def get_hedge_delay(self, provider: str) -> float:
+        """Seconds to wait on provider before hedging (adaptive p95)."""
+        return self.latency_tracker.percentile(
+            provider, self.hedge_percentile, default=self.hedge_delay_seconds
+        )
+
+    def _generate_hedged(
+        self,
+        providers_to_try: List[str],
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool,
+        validator: Optional[Callable[[LLMResponse], bool]],
+        cache_system_prompt: bool = False
+    ) -> LLMResponse:
+        """
+        Race providers: launch the next one when the newest in-flight call
+        exceeds its hedge delay or fails; return the first valid response.
+
+        SDK calls are blocking, so abandoned calls cannot be interrupted; their
+        results are discarded and their cost is charged to the hedge budget.
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=len(providers_to_try),
+            thread_name_prefix="llm-hedge"
+        )
+        pending: Dict[Future, str] = {}
+        remaining = list(providers_to_try)
+        errors: List[str] = []
+        winner: Optional[LLMResponse] = None
+        hedged = False
+
+        def launch() -> float:
+            provider = remaining.pop(0)
+            logger.info(f"Trying provider: {provider}")
+            # Copy context so the worker charges the caller's query budget
+            future = executor.submit(
+                contextvars.copy_context().run,
+                self._timed_call, provider, system_prompt, user_prompt, json_mode,
+                cache_system_prompt
+            )
+            pending[future] = provider
+            return time.monotonic() + self.get_hedge_delay(provider)
+
+        try:
+            hedge_deadline = launch()
+
+            while pending and winner is None:
+                timeout = max(0.0, hedge_deadline - time.monotonic()) if remaining else None
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        response = future.result()
+                        if validator is not None and not validator(response):
+                            raise ValueError("response failed validation")
+                    except Exception as e:
+                        error_msg = f"{provider} failed: {str(e)}"
+                        logger.warning(f"❌ {error_msg}")
+                        errors.append(error_msg)
+                        continue
+
+                    if winner is None:
+                        winner = response
+                    else:
+                        self.hedge_budget.record_wasted_cost(response.cost)
+
+                if winner is not None or not remaining:
+                    continue
+
+                if not pending:
+                    # Every in-flight call failed: plain fallback, no budget needed
+                    hedge_deadline = launch()
+                elif time.monotonic() >= hedge_deadline:
+                    if self.hedge_budget.try_acquire_hedge():
+                        hedged = True
+                        logger.info(
+                            f"⏱️  Hedging: {list(pending.values())} slow, "
+                            f"firing {remaining[0]}"
+                        )
+                        hedge_deadline = launch()
+                    else:
+                        # Budget exhausted: wait for in-flight calls only
+                        remaining.clear()
+        finally:
+            for future, provider in pending.items():
+                if not future.cancel():
+                    future.add_done_callback(self._charge_abandoned)
+            executor.shutdown(wait=False)
+
+        if winner is None:
+            self._raise_all_failed(errors)
+
+        winner.hedged = hedged
+        logger.info(f"✅ Success with {winner.provider} ({winner.model})")
+        return winner
+
+    def _charge_abandoned(self, future: Future) -> None:
+        """Charge the cost of an abandoned (losing) call to the hedge budget."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.hedge_budget.record_wasted_cost(future.result().cost)
+
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """Hedge budget usage and per-provider latency percentiles."""
+        return {
+            "enabled": self.enable_hedging,
+            "budget": self.hedge_budget.get_stats(),
+            "latency": self.latency_tracker.get_stats(),
+        }
+
+    def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = False,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        cache_system_prompt: bool = False
+    ) -> LLMResponse:
+        """
+        Stream a completion, invoking on_chunk for every text delta.
+
+        Falls back to the next provider only if the failing one has not
+        emitted anything yet; a mid-stream failure is raised, since the
+        caller has already consumed partial output.
+
+        Args:
+            system_prompt: System instructions
+            user_prompt: User query
+            json_mode: Request structured JSON output
+            on_chunk: Callback receiving each text chunk as it arrives
+            cache_system_prompt: Mark system prompt as a cacheable prefix
+
+        Returns:
+            LLMResponse with the full content and usage
+
+        Raises:
+            RuntimeError: If all providers fail (or one fails mid-stream)
+            BudgetExceededError: If the active query budget is spent
+        """
+        budget = get_active_budget()
+        errors = []
+
+        for provider in self._provider_order():
+            if budget is not None:
+                budget.check()
+
+            emitted = []
+            started = time.perf_counter()
+
+            def emit(text: str) -> None:
+                if not text:
+                    return
+                if not emitted:
+                    emitted.append((time.perf_counter() - started) * 1000)
+                if on_chunk is not None:
+                    on_chunk(text)
+
+            try:
+                logger.info(f"Streaming from provider: {provider}")
+                response = self._stream_provider(
+                    provider, system_prompt, user_prompt, json_mode, emit, cache_system_prompt
+                )
+            except Exception as e:
+                error_msg = f"{provider} failed: {str(e)}"
+                logger.warning(f"❌ {error_msg}")
+                if emitted:
+                    raise RuntimeError(f"Stream from {provider} failed mid-response: {e}") from e
+                errors.append(error_msg)
+                continue
+
+            elapsed = time.perf_counter() - started
+            self.latency_tracker.record(provider, elapsed)
+            response.latency_ms = elapsed * 1000
+            response.first_token_ms = emitted[0] if emitted else response.latency_ms
+            self._record_usage(response)
+            logger.info(
+                f"✅ Streamed from {provider} ({response.model}), "
+                f"first token after {response.first_token_ms:.0f}ms"
+            )
+            return response
+
+        self._raise_all_failed(errors)
+
+    def _stream_provider(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool,
+        emit: Callable[[str], None],
+        cache_system_prompt: bool = False
+    ) -> LLMResponse:
+        """Stream from a specific provider."""
+
+        if provider == "anthropic":
+            return self._stream_anthropic(system_prompt, user_prompt, emit, cache_system_prompt)
+
+        elif provider in ("deepseek", "openai"):
+            return self._stream_openai_compatible(
+                provider, system_prompt, user_prompt, json_mode, emit
+            )
+
+        elif provider == "gemini":
+            return self._stream_gemini(system_prompt, user_prompt, emit)
+
+        else:
+            raise ValueError(f"Unknown provider: {provider}")
+
+    def _stream_anthropic(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        emit: Callable[[str], None],
+        cache_system_prompt: bool = False
+    ) -> LLMResponse:
+        """Stream from Anthropic Claude API."""
+        client = self.available_providers["anthropic"]
+        model = self.model if self.model else self.DEFAULT_MODELS["anthropic"]
+
+        system: Any = system_prompt
+        if cache_system_prompt:
+            system = [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+
+        parts = []
+        with client.messages.stream(
+            model=model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            system=system,
+            messages=[{"role": "user", "content": user_prompt}]
+        ) as stream:
+            for text in stream.text_stream:
+                parts.append(text)
+                emit(text)
+            usage = stream.get_final_message().usage
+
+        input_tokens = usage.input_tokens
+        output_tokens = usage.output_tokens
+        cache_read_tokens = _usage_int(usage, "cache_read_input_tokens")
+        cache_write_tokens = _usage_int(usage, "cache_creation_input_tokens")
+
+        return LLMResponse(
+            content="".join(parts),
+            provider="anthropic",
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost=self._compute_cost(
+                "anthropic", model, input_tokens, output_tokens,
+                cache_read_tokens, cache_write_tokens
+            ),
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens
+        )
+
+    def _stream_openai_compatible(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool,
+        emit: Callable[[str], None]
+    ) -> LLMResponse:
+        """Stream from OpenAI or DeepSeek (OpenAI-compatible API)."""
+        client = self.available_providers[provider]
+        model = self.model if self.model else self.DEFAULT_MODELS[provider]
+
+        kwargs = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        parts = []
+        usage = None
+        for event in client.chat.completions.create(**kwargs):
+            if event.choices:
+                text = event.choices[0].delta.content
+                if text:
+                    parts.append(text)
+                    emit(text)
+            if getattr(event, "usage", None) is not None:
+                usage = event.usage
+
+        content = "".join(parts)
+        if usage is not None:
+            cache_read_tokens = (
+                _usage_int(usage, "prompt_cache_hit_tokens") if provider == "deepseek"
+                else _usage_int(getattr(usage, "prompt_tokens_details", None), "cached_tokens")
+            )
+            input_tokens = usage.prompt_tokens - cache_read_tokens
+            output_tokens = usage.completion_tokens
+        else:
+            # Usage chunk not sent: rough estimate like Gemini
+            cache_read_tokens = 0
+            input_tokens = (len(system_prompt) + len(user_prompt)) // 4
+            output_tokens = len(content) // 4
+
+        return LLMResponse(
+            content=content,
+            provider=provider,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost=self._compute_cost(provider, model, input_tokens, output_tokens, cache_read_tokens),
+            cache_read_tokens=cache_read_tokens
+        )
+
+    def _stream_gemini(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        emit: Callable[[str], None]
+    ) -> LLMResponse:
+        """Stream from Google Gemini API."""
+        client = self.available_providers["gemini"]
+        model = self.model if self.model else self.DEFAULT_MODELS["gemini"]
+
+        full_prompt = f"{system_prompt}\n\n{user_prompt}"
+
+        parts = []
+        for chunk in client.generate_content(full_prompt, stream=True):
+            text = chunk.text
+            if text:
+                parts.append(text)
+                emit(text)
+
+        content = "".join(parts)
+
+        return LLMResponse(
+            content=content,
+            provider="gemini",
+            model=model,
+            input_tokens=len(full_prompt) // 4,  # Rough estimate
+            output_tokens=len(content) // 4,
+            cost=0.0
+        )
+
     def _call_provider(
         self,
         provider: str,
         system_prompt: str,
         user_prompt: str,
-        json_mode: bool
+        json_mode: bool,
+        cache_system_prompt: bool = False
     ) -> LLMResponse:
         """Call specific provider."""
 
         if provider == "anthropic":
-            return self._call_anthropic(system_prompt, user_prompt)
+            return self._call_anthropic(system_prompt, user_prompt, cache_system_prompt)
 
         elif provider == "deepseek":
             return self._call_deepseek(system_prompt, user_prompt, json_mode)
@@ -249,27 +886,44 @@ class UniversalLLMClient:
         else:
             raise ValueError(f"Unknown provider: {provider}")
 
-    def _call_anthropic(self, system_prompt: str, user_prompt: str) -> LLMResponse:
+    def _call_anthropic(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        cache_system_prompt: bool = False
+    ) -> LLMResponse:
         """Call Anthropic Claude API."""
         client = self.available_providers["anthropic"]
         model = self.model if self.model else self.DEFAULT_MODELS["anthropic"]
 
+        system: Any = system_prompt
+        if cache_system_prompt:
+            # Cacheable prefix: later calls read it at the cache_read rate
+            system = [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+
         response = client.messages.create(
             model=model,
             max_tokens=self.max_tokens,
             temperature=self.temperature,
-            system=system_prompt,
+            system=system,
             messages=[{"role": "user", "content": user_prompt}]
         )
 
         content = response.content[0].text
+        # Anthropic reports cached tokens separately from input_tokens
         input_tokens = response.usage.input_tokens
         output_tokens = response.usage.output_tokens
+        cache_read_tokens = _usage_int(response.usage, "cache_read_input_tokens")
+        cache_write_tokens = _usage_int(response.usage, "cache_creation_input_tokens")
 
-        # Calculate cost
-        pricing = self.PRICING["anthropic"]
-        cost = (input_tokens / 1_000_000) * pricing["input"] + \
-               (output_tokens / 1_000_000) * pricing["output"]
+        cost = self._compute_cost(
+            "anthropic", model, input_tokens, output_tokens,
+            cache_read_tokens, cache_write_tokens
+        )
 
         return LLMResponse(
             content=content,
@@ -277,7 +931,9 @@ class UniversalLLMClient:
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            cost=cost
+            cost=cost,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens
         )
 
     def _call_deepseek(
@@ -308,13 +964,13 @@ class UniversalLLMClient:
         response = client.chat.completions.create(**kwargs)
 
         content = response.choices[0].message.content
-        input_tokens = response.usage.prompt_tokens
+        # DeepSeek caches stable prefixes automatically (prompt_cache_hit_tokens);
+        # prompt_tokens includes cached tokens, so split them out
+        cache_read_tokens = _usage_int(response.usage, "prompt_cache_hit_tokens")
+        input_tokens = response.usage.prompt_tokens - cache_read_tokens
         output_tokens = response.usage.completion_tokens
 
-        # Calculate cost
-        pricing = self.PRICING["deepseek"]
-        cost = (input_tokens / 1_000_000) * pricing["input"] + \
-               (output_tokens / 1_000_000) * pricing["output"]
+        cost = self._compute_cost("deepseek", model, input_tokens, output_tokens, cache_read_tokens)
 
         return LLMResponse(
             content=content,
@@ -322,7 +978,8 @@ class UniversalLLMClient:
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            cost=cost
+            cost=cost,
+            cache_read_tokens=cache_read_tokens
         )
 
     def _call_openai(
@@ -353,13 +1010,13 @@ class UniversalLLMClient:
         response = client.chat.completions.create(**kwargs)
 
         content = response.choices[0].message.content
-        input_tokens = response.usage.prompt_tokens
+        # OpenAI caches stable prefixes automatically (prompt_tokens_details.cached_tokens);
+        # prompt_tokens includes cached tokens, so split them out
+        cache_read_tokens = _usage_int(getattr(response.usage, "prompt_tokens_details", None), "cached_tokens")
+        input_tokens = response.usage.prompt_tokens - cache_read_tokens
         output_tokens = response.usage.completion_tokens
 
-        # Calculate cost
-        pricing = self.PRICING["openai"]
-        cost = (input_tokens / 1_000_000) * pricing["input"] + \
-               (output_tokens / 1_000_000) * pricing["output"]
+        cost = self._compute_cost("openai", model, input_tokens, output_tokens, cache_read_tokens)
 
         return LLMResponse(
             content=content,
@@ -367,7 +1024,8 @@ class UniversalLLMClient:
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            cost=cost
+            cost=cost,
+            cache_read_tokens=cache_read_tokens
         )
 
     def _call_gemini(self, system_prompt: str, user_prompt: str) -> LLMResponse:
@@ -2,12 +2,28 @@
 Portfolio module for APE 2026.
 
 Week 10 Day 4: Modern Portfolio Theory (MPT) optimization.
+Week 12: Covariance estimators and cache, batch optimization.
 """
 
+from .batch import (
+    BatchReport,
+    BatchResult,
+    OptimizationProblem,
+    optimize_batch
+)
+
+from .covariance import (
+    CovarianceCache,
+    ReturnMoments,
+    estimate_covariance,
+    get_covariance_cache
+)
+
 from .optimizer import (
     Portfolio,
     OptimizationConstraints,
     PortfolioOptimizer,
+    SolverInfo,
     compute_efficient_frontier
 )
 
@@ -15,5 +31,14 @@ __all__ = [
     "Portfolio",
     "OptimizationConstraints",
     "PortfolioOptimizer",
-    "compute_efficient_frontier"
+    "SolverInfo",
+    "compute_efficient_frontier",
+    "OptimizationProblem",
+    "BatchResult",
+    "BatchReport",
+    "optimize_batch",
+    "CovarianceCache",
+    "ReturnMoments",
+    "estimate_covariance",
+    "get_covariance_cache"
 ]
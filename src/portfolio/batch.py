@@ -0,0 +1,308 @@
+"""
+Batch portfolio optimization.
+
+Week 12: Scenario analysis across many universes and constraint sets.
+
+Design:
+- Problems are grouped by covariance key (universe, estimator, params);
+  each group's moments are estimated once (via CovarianceCache)
+- Groups are written to shared memory and solved in a process pool;
+  workers map the matrices instead of unpickling a copy per problem
+- Every problem gets a BatchResult with its Portfolio, solve time and
+  solver diagnostics; one failing problem does not fail the batch
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .covariance import CovarianceCache, get_covariance_cache
+from .optimizer import OptimizationConstraints, Portfolio, PortfolioOptimizer
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES = ("max_sharpe", "min_volatility")
+
+
+# ============================================================================
+# Data Models
+# ============================================================================
+
+@dataclass
+class OptimizationProblem:
+    """
+    One (universe, constraints, rf_rate) scenario.
+
+    Attributes:
+        tickers: Universe (columns of the batch returns)
+        objective: "max_sharpe" or "min_volatility"
+        constraints: Optimization constraints (default: long-only)
+        rf_rate: Risk-free rate (annualized)
+        cov_estimator: Covariance estimator (see src.portfolio.covariance)
+        cov_params: Estimator parameters
+        problem_id: Caller's identifier (default: position in the batch)
+    """
+    tickers: List[str]
+    objective: str = "max_sharpe"
+    constraints: Optional[OptimizationConstraints] = None
+    rf_rate: float = 0.0
+    cov_estimator: str = "sample"
+    cov_params: Dict[str, Any] = field(default_factory=dict)
+    problem_id: Optional[str] = None
+
+    def covariance_key(self) -> tuple:
+        return (tuple(self.tickers), self.cov_estimator, tuple(sorted(self.cov_params.items())))
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one problem.
+
+    Attributes:
+        problem_id: Identifier of the problem
+        portfolio: Optimal portfolio (None on error)
+        solve_seconds: Time spent in the solver
+        method: Solver that produced the weights
+        converged: Whether the solver reported success
+        iterations: Solver iterations
+        message: Solver message
+        error: Exception text if the problem could not be solved
+    """
+    problem_id: str
+    portfolio: Optional[Portfolio]
+    solve_seconds: float
+    method: str = ""
+    converged: bool = False
+    iterations: int = 0
+    message: str = ""
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchReport:
+    """
+    Results of a batch, in problem order.
+
+    Attributes:
+        results: One BatchResult per problem
+        n_groups: Distinct covariance matrices estimated
+        covariance_seconds: Time spent estimating moments
+        wall_seconds: Total batch time
+        workers: Processes used (1 = solved in-process)
+    """
+    results: List[BatchResult]
+    n_groups: int
+    covariance_seconds: float
+    wall_seconds: float
+    workers: int
+
+    @property
+    def n_converged(self) -> int:
+        return sum(1 for r in self.results if r.converged)
+
+    @property
+    def total_solve_seconds(self) -> float:
+        return sum(r.solve_seconds for r in self.results)
+
+
+# ============================================================================
+# Solving
+# ============================================================================
+
+def _solve_problems(
+    optimizer: PortfolioOptimizer,
+    problems: List[Tuple[str, OptimizationProblem]]
+) -> List[BatchResult]:
+    """Solve problems that share one optimizer (same moments)."""
+    results = []
+
+    for problem_id, problem in problems:
+        start = time.perf_counter()
+        try:
+            if problem.objective == "max_sharpe":
+                portfolio = optimizer.max_sharpe_ratio(problem.rf_rate, problem.constraints)
+            elif problem.objective == "min_volatility":
+                portfolio = optimizer.min_volatility(problem.constraints)
+                if problem.rf_rate:
+                    portfolio = optimizer._compute_portfolio_metrics(portfolio.weights, problem.rf_rate)
+            else:
+                raise ValueError(f"Unknown objective '{problem.objective}' (expected one of {OBJECTIVES})")
+        except Exception as e:
+            results.append(BatchResult(
+                problem_id=problem_id,
+                portfolio=None,
+                solve_seconds=time.perf_counter() - start,
+                error=f"{type(e).__name__}: {e}"
+            ))
+            continue
+
+        info = optimizer.last_solver_info
+        results.append(BatchResult(
+            problem_id=problem_id,
+            portfolio=portfolio,
+            solve_seconds=time.perf_counter() - start,
+            method=info.method,
+            converged=info.converged,
+            iterations=info.iterations,
+            message=info.message
+        ))
+
+    return results
+
+
+def _solve_shared_group(
+    shm_name: str,
+    tickers: List[str],
+    problems: List[Tuple[str, OptimizationProblem]]
+) -> List[BatchResult]:
+    """
+    Worker: solve a group whose moments live in shared memory.
+
+    Layout of the block: n expected returns followed by the n x n covariance.
+    """
+    # Pool workers share the parent's resource tracker, which unlinks the
+    # block once the parent does (or if the parent dies)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        n = len(tickers)
+        buffer = np.ndarray((n + n * n,), dtype=np.float64, buffer=shm.buf)
+        optimizer = PortfolioOptimizer.from_estimates(
+            pd.Series(buffer[:n], index=tickers),
+            pd.DataFrame(buffer[n:].reshape(n, n), index=tickers, columns=tickers)
+        )
+        results = _solve_problems(optimizer, problems)
+        del optimizer, buffer
+        return results
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            pass  # A lingering pandas view; the mapping goes with the worker
+
+
+def _to_shared_memory(mean_returns: pd.Series, cov_matrix: pd.DataFrame) -> shared_memory.SharedMemory:
+    n = len(mean_returns)
+    shm = shared_memory.SharedMemory(create=True, size=max((n + n * n) * 8, 8))
+    buffer = np.ndarray((n + n * n,), dtype=np.float64, buffer=shm.buf)
+    buffer[:n] = mean_returns.to_numpy(dtype=float)
+    buffer[n:] = cov_matrix.to_numpy(dtype=float).ravel()
+    del buffer
+    return shm
+
+
+def optimize_batch(
+    returns: pd.DataFrame,
+    problems: List[OptimizationProblem],
+    max_workers: Optional[int] = None,
+    cov_cache: Optional[CovarianceCache] = None,
+    chunk_size: int = 32
+) -> BatchReport:
+    """
+    Solve many portfolio problems over one returns panel.
+
+    Args:
+        returns: DataFrame of asset returns covering every problem's tickers
+        problems: Scenarios to solve
+        max_workers: Worker processes (None = CPU count, 1 = in-process)
+        cov_cache: Covariance cache (default: process-wide cache)
+        chunk_size: Problems per worker task within a group
+
+    Returns:
+        BatchReport with results in the order of problems
+    """
+    batch_start = time.perf_counter()
+    if cov_cache is None:
+        cov_cache = get_covariance_cache()
+
+    # Group problems by shared covariance
+    groups: Dict[tuple, List[Tuple[int, str, OptimizationProblem]]] = {}
+    for i, problem in enumerate(problems):
+        problem_id = problem.problem_id if problem.problem_id is not None else str(i)
+        groups.setdefault(problem.covariance_key(), []).append((i, problem_id, problem))
+
+    results: List[Optional[BatchResult]] = [None] * len(problems)
+
+    # Estimate moments once per group
+    cov_start = time.perf_counter()
+    moments = {}
+    for key, members in groups.items():
+        problem = members[0][2]
+        try:
+            universe = returns[list(problem.tickers)]
+            moments[key] = (
+                universe.mean() * 252,
+                cov_cache.get(universe, problem.cov_estimator, 252, **problem.cov_params)
+            )
+        except Exception as e:
+            for i, problem_id, _ in members:
+                results[i] = BatchResult(problem_id, None, 0.0, error=f"{type(e).__name__}: {e}")
+    covariance_seconds = time.perf_counter() - cov_start
+
+    # Split groups into tasks
+    tasks = []
+    for key, (mean_returns, cov_matrix) in moments.items():
+        members = groups[key]
+        for offset in range(0, len(members), chunk_size):
+            tasks.append((key, members[offset:offset + chunk_size]))
+
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    if workers == 1:
+        optimizers = {
+            key: PortfolioOptimizer.from_estimates(mean_returns, cov_matrix)
+            for key, (mean_returns, cov_matrix) in moments.items()
+        }
+        for key, chunk in tasks:
+            solved = _solve_problems(optimizers[key], [(pid, p) for _, pid, p in chunk])
+            for (i, _, _), result in zip(chunk, solved):
+                results[i] = result
+    else:
+        blocks = {key: _to_shared_memory(*moments[key]) for key in moments}
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    (chunk, pool.submit(
+                        _solve_shared_group,
+                        blocks[key].name,
+                        list(moments[key][0].index),
+                        [(pid, p) for _, pid, p in chunk]
+                    ))
+                    for key, chunk in tasks
+                ]
+                for chunk, future in futures:
+                    try:
+                        solved = future.result()
+                    except Exception as e:
+                        logger.error(f"Batch worker failed: {e}")
+                        solved = [
+                            BatchResult(pid, None, 0.0, error=f"{type(e).__name__}: {e}")
+                            for _, pid, _ in chunk
+                        ]
+                    for (i, _, _), result in zip(chunk, solved):
+                        results[i] = result
+        finally:
+            for shm in blocks.values():
+                shm.close()
+                shm.unlink()
+
+    report = BatchReport(
+        results=results,
+        n_groups=len(groups),
+        covariance_seconds=covariance_seconds,
+        wall_seconds=time.perf_counter() - batch_start,
+        workers=workers
+    )
+    logger.info(
+        f"Batch optimization: {len(problems)} problems, {report.n_groups} covariance groups, "
+        f"{report.n_converged} converged, {workers} workers, {report.wall_seconds:.2f}s"
+    )
+    return report
@@ -0,0 +1,442 @@
+"""
+Covariance estimation for portfolio optimization.
+
+Week 12: Robust estimators and large-universe support.
+
+Features:
+- Estimators: sample, Ledoit-Wolf shrinkage, exponentially weighted (EWMA),
+  statistical factor model (PCA)
+- All estimators are derived from ReturnMoments, sufficient statistics of
+  the returns window that are updated in O(N^2) per day instead of
+  recomputing O(T*N^2) from scratch
+- CovarianceCache: LRU of covariance matrices keyed by
+  (tickers, window, estimator); a window that extends or rolls a cached one
+  is updated incrementally
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import eigh
+
+logger = logging.getLogger(__name__)
+
+ESTIMATORS = ("sample", "ledoit_wolf", "ewma", "factor")
+TRADING_DAYS = 252
+
+
+# ============================================================================
+# Sufficient Statistics
+# ============================================================================
+
+@dataclass
+class ReturnMoments:
+    """
+    Weighted moments of a returns window (rows = days, cols = assets).
+
+    Row t of a window of n rows has weight decay ** (n - 1 - t): decay=1.0
+    gives plain sums (sample, Ledoit-Wolf, factor), decay<1 exponential
+    weighting (EWMA). Rows are stored relative to a fixed shift vector to
+    avoid cancellation in sum(xx') - n * mean * mean'.
+
+    Attributes:
+        shift: Per-asset offset subtracted from every row
+        decay: Weight decay per day
+        count: Rows in the window
+        weight: Sum of row weights
+        weight_sq: Sum of squared row weights
+        sum_x: Weighted sum of rows
+        sum_xx: Weighted sum of outer products
+        sum_norm2: Weighted sum of ||x||^2 (Ledoit-Wolf)
+        sum_norm4: Weighted sum of ||x||^4 (Ledoit-Wolf)
+        sum_norm2_x: Weighted sum of ||x||^2 * x (Ledoit-Wolf)
+    """
+    shift: np.ndarray
+    decay: float = 1.0
+    count: int = 0
+    weight: float = 0.0
+    weight_sq: float = 0.0
+    sum_x: np.ndarray = field(default=None)
+    sum_xx: np.ndarray = field(default=None)
+    sum_norm2: float = 0.0
+    sum_norm4: float = 0.0
+    sum_norm2_x: np.ndarray = field(default=None)
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, decay: float = 1.0) -> "ReturnMoments":
+        """Compute moments of a full window in one vectorized pass."""
+        shift = values.mean(axis=0)
+        x = values - shift
+        n = len(x)
+        weights = decay ** np.arange(n - 1, -1, -1, dtype=float)
+        norm2 = np.einsum('ij,ij->i', x, x)
+
+        return cls(
+            shift=shift,
+            decay=decay,
+            count=n,
+            weight=float(weights.sum()),
+            weight_sq=float(weights @ weights),
+            sum_x=weights @ x,
+            sum_xx=(x * weights[:, np.newaxis]).T @ x,
+            sum_norm2=float(weights @ norm2),
+            sum_norm4=float(weights @ norm2 ** 2),
+            sum_norm2_x=(weights * norm2) @ x,
+        )
+
+    def copy(self) -> "ReturnMoments":
+        return ReturnMoments(
+            shift=self.shift, decay=self.decay, count=self.count,
+            weight=self.weight, weight_sq=self.weight_sq,
+            sum_x=self.sum_x.copy(), sum_xx=self.sum_xx.copy(),
+            sum_norm2=self.sum_norm2, sum_norm4=self.sum_norm4,
+            sum_norm2_x=self.sum_norm2_x.copy(),
+        )
+
+    def append(self, row: np.ndarray) -> None:
+        """Add the newest day; existing rows age by one day."""
+        x = row - self.shift
+        norm2 = float(x @ x)
+        d = self.decay
+
+        self.count += 1
+        self.weight = d * self.weight + 1.0
+        self.weight_sq = d * d * self.weight_sq + 1.0
+        self.sum_x = d * self.sum_x + x
+        self.sum_xx = d * self.sum_xx
+        self.sum_xx += np.outer(x, x)
+        self.sum_norm2 = d * self.sum_norm2 + norm2
+        self.sum_norm4 = d * self.sum_norm4 + norm2 * norm2
+        self.sum_norm2_x = d * self.sum_norm2_x + norm2 * x
+
+    def remove_oldest(self, row: np.ndarray) -> None:
+        """Drop the oldest day of the window (row must be that day)."""
+        x = row - self.shift
+        norm2 = float(x @ x)
+        w = self.decay ** (self.count - 1)
+
+        self.count -= 1
+        self.weight -= w
+        self.weight_sq -= w * w
+        self.sum_x -= w * x
+        self.sum_xx -= w * np.outer(x, x)
+        self.sum_norm2 -= w * norm2
+        self.sum_norm4 -= w * norm2 * norm2
+        self.sum_norm2_x -= w * norm2 * x
+
+    @property
+    def centered_mean(self) -> np.ndarray:
+        """Weighted mean minus shift."""
+        return self.sum_x / self.weight
+
+    def biased_covariance(self) -> np.ndarray:
+        m = self.centered_mean
+        return self.sum_xx / self.weight - np.outer(m, m)
+
+    def unbiased_covariance(self) -> np.ndarray:
+        """Reliability-weighted unbiased covariance (n-1 when decay=1)."""
+        effective = self.weight ** 2 - self.weight_sq
+        if effective <= 0:
+            return np.zeros_like(self.sum_xx)
+        return self.biased_covariance() * (self.weight ** 2 / effective)
+
+    def sum_centered_norm4(self) -> float:
+        """Sum over rows of ||x_t - mean||^4 (unweighted windows only)."""
+        m = self.centered_mean
+        c = float(m @ m)
+        sum_b = float(m @ self.sum_x)
+        sum_b2 = float(m @ self.sum_xx @ m)
+        sum_ab = float(m @ self.sum_norm2_x)
+        return (
+            self.sum_norm4 - 4 * sum_ab + 2 * c * self.sum_norm2
+            + 4 * sum_b2 - 4 * c * sum_b + self.count * c * c
+        )
+
+
+# ============================================================================
+# Estimators
+# ============================================================================
+
+def _decay_for(estimator: str, params: Dict[str, Any]) -> float:
+    if estimator == "ewma":
+        return 0.5 ** (1.0 / params.get("halflife", 63.0))
+    return 1.0
+
+
+def _validate_estimator(estimator: str, params: Dict[str, Any]) -> None:
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"Unknown covariance estimator '{estimator}' (expected one of {ESTIMATORS})")
+
+    allowed = {"ewma": {"halflife"}, "factor": {"n_factors"}}.get(estimator, set())
+    unknown = set(params) - allowed
+    if unknown:
+        raise ValueError(f"Unsupported parameters for '{estimator}': {sorted(unknown)}")
+
+
+def ledoit_wolf_shrinkage(moments: ReturnMoments) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf (2004) shrinkage towards a scaled identity.
+
+    Args:
+        moments: Unweighted moments of the window
+
+    Returns:
+        (shrunk biased covariance, shrinkage intensity in [0, 1])
+    """
+    sample = moments.biased_covariance()
+    n_assets = sample.shape[0]
+    n = moments.count
+
+    trace = float(np.trace(sample))
+    mu = trace / n_assets
+    sample_norm2 = float(np.sum(sample ** 2))
+
+    delta = (sample_norm2 - 2 * mu * trace + n_assets * mu ** 2) / n_assets
+    beta = (moments.sum_centered_norm4() / n - sample_norm2) / (n_assets * n)
+    beta = max(min(beta, delta), 0.0)
+    shrinkage = 0.0 if delta <= 0 else beta / delta
+
+    shrunk = (1.0 - shrinkage) * sample
+    shrunk[np.diag_indices_from(shrunk)] += shrinkage * mu
+    return shrunk, shrinkage
+
+
+def factor_covariance(sample: np.ndarray, n_factors: int = 5) -> np.ndarray:
+    """
+    Statistical factor model: top principal components plus diagonal residual.
+
+    Sigma = V_k diag(lambda_k) V_k' + D, with D chosen so the diagonal
+    (asset variances) matches the sample.
+    """
+    n_assets = sample.shape[0]
+    k = min(n_factors, n_assets - 1)
+    if k <= 0:
+        return sample.copy()
+
+    eigenvalues, eigenvectors = eigh(sample, subset_by_index=[n_assets - k, n_assets - 1])
+    eigenvalues = np.clip(eigenvalues, 0.0, None)
+
+    systematic = (eigenvectors * eigenvalues) @ eigenvectors.T
+    residual = np.clip(np.diag(sample) - np.diag(systematic), 0.0, None)
+    systematic[np.diag_indices_from(systematic)] += residual
+    return systematic
+
+
+def covariance_from_moments(
+    moments: ReturnMoments,
+    estimator: str = "sample",
+    **params
+) -> np.ndarray:
+    """Daily (not annualized) covariance of a window under an estimator."""
+    if estimator == "ledoit_wolf":
+        return ledoit_wolf_shrinkage(moments)[0]
+    if estimator == "factor":
+        return factor_covariance(moments.unbiased_covariance(), params.get("n_factors", 5))
+    # sample and ewma differ only in the moments' decay
+    return moments.unbiased_covariance()
+
+
+def estimate_covariance(
+    returns: pd.DataFrame,
+    estimator: str = "sample",
+    annualization: int = TRADING_DAYS,
+    **params
+) -> pd.DataFrame:
+    """
+    Annualized covariance matrix of asset returns.
+
+    Args:
+        returns: DataFrame of asset returns (rows=dates, cols=tickers)
+        estimator: "sample", "ledoit_wolf", "ewma" (halflife=63 days) or
+            "factor" (n_factors=5)
+        annualization: Periods per year
+        **params: Estimator parameters
+
+    Returns:
+        Covariance DataFrame indexed by ticker
+
+    Note:
+        With missing values, "sample" keeps pandas' pairwise-complete
+        covariance; the other estimators use complete rows only.
+    """
+    _validate_estimator(estimator, params)
+    values = returns.to_numpy(dtype=float)
+
+    if np.isnan(values).any():
+        if estimator == "sample":
+            return returns.cov() * annualization
+        values = values[~np.isnan(values).any(axis=1)]
+
+    moments = ReturnMoments.from_values(values, _decay_for(estimator, params))
+    cov = covariance_from_moments(moments, estimator, **params) * annualization
+    return pd.DataFrame(cov, index=returns.columns, columns=returns.columns)
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+@dataclass
+class _CacheEntry:
+    index: pd.Index
+    values: np.ndarray
+    moments: ReturnMoments
+    covariance: pd.DataFrame
+    updates_since_refresh: int = 0
+
+
+class CovarianceCache:
+    """
+    LRU cache of covariance matrices keyed by (tickers, window, estimator).
+
+    On a miss, a cached window of the same tickers and estimator that the
+    new window extends (new days appended) or rolls (days appended and the
+    oldest dropped) is updated incrementally from its moments. Moments are
+    rebuilt from scratch every refresh_every incremental days to bound
+    floating-point drift.
+
+    Returned DataFrames are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 8, refresh_every: int = 250):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Cached windows kept (0 disables caching)
+            refresh_every: Incremental days before a full recompute
+        """
+        self.max_entries = max_entries
+        self.refresh_every = refresh_every
+
+        self._entries: "OrderedDict[tuple, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.incremental_updates = 0
+        self.full_computes = 0
+
+    def get(
+        self,
+        returns: pd.DataFrame,
+        estimator: str = "sample",
+        annualization: int = TRADING_DAYS,
+        **params
+    ) -> pd.DataFrame:
+        """
+        Annualized covariance of returns (see estimate_covariance).
+
+        Args:
+            returns: DataFrame of asset returns (rows=dates, cols=tickers)
+            estimator: Covariance estimator name
+            annualization: Periods per year
+            **params: Estimator parameters
+
+        Returns:
+            Covariance DataFrame indexed by ticker
+        """
+        _validate_estimator(estimator, params)
+        values = returns.to_numpy(dtype=float)
+
+        # Windows with gaps or an unordered index are not incrementally updatable
+        if (self.max_entries <= 0 or len(returns) < 2 or np.isnan(values).any()
+                or not returns.index.is_monotonic_increasing or not returns.index.is_unique):
+            return estimate_covariance(returns, estimator, annualization, **params)
+
+        family = (tuple(returns.columns), estimator, tuple(sorted(params.items())), annualization)
+        key = family + (returns.index[0], returns.index[-1], len(returns))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.covariance
+
+            self.misses += 1
+            entry = self._update_from_cached(family, returns.index, values)
+            if entry is None:
+                moments = ReturnMoments.from_values(values, _decay_for(estimator, params))
+                entry = _CacheEntry(returns.index, values, moments, covariance=None)
+                self.full_computes += 1
+            else:
+                self.incremental_updates += 1
+
+            cov = covariance_from_moments(entry.moments, estimator, **params) * annualization
+            entry.covariance = pd.DataFrame(cov, index=returns.columns, columns=returns.columns)
+
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            return entry.covariance
+
+    def _update_from_cached(
+        self,
+        family: tuple,
+        index: pd.Index,
+        values: np.ndarray
+    ) -> Optional[_CacheEntry]:
+        """Derive the window from a cached one it appends to or rolls forward."""
+        for key in reversed(self._entries):
+            if key[:len(family)] != family:
+                continue
+
+            cached = self._entries[key]
+            if cached.index[-1] >= index[-1] or index[0] not in cached.index:
+                continue
+
+            dropped = cached.index.get_loc(index[0])
+            overlap = len(cached.index) - dropped
+            appended = len(index) - overlap
+            if overlap <= 0 or appended <= 0 or dropped + appended > len(index) // 2:
+                continue
+            if cached.updates_since_refresh + dropped + appended >= self.refresh_every:
+                continue
+
+            # Cheap O(T*N) check that the shared days are really the same data
+            if not (index[:overlap].equals(cached.index[dropped:])
+                    and np.array_equal(values[:overlap], cached.values[dropped:])):
+                continue
+
+            moments = cached.moments.copy()
+            for row in cached.values[:dropped]:
+                moments.remove_oldest(row)
+            for row in values[overlap:]:
+                moments.append(row)
+
+            return _CacheEntry(
+                index, values, moments, covariance=None,
+                updates_since_refresh=cached.updates_since_refresh + dropped + appended
+            )
+
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "incremental_updates": self.incremental_updates,
+                "full_computes": self.full_computes,
+            }
+
+
+_default_cache = CovarianceCache()
+
+
+def get_covariance_cache() -> CovarianceCache:
+    """Process-wide cache shared by PortfolioOptimizer instances."""
+    return _default_cache
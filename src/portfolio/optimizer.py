@@ -8,17 +8,30 @@ Features:
 - Minimum volatility portfolio
 - Efficient frontier generation
 - Constraint handling (min/max weights)
+
+Week 12: Solver engine.
+- Exact min-variance / frontier points via an active-set KKT solver
+  (closed form when no weight bound binds)
+- Closed-form tangency portfolio for max Sharpe when within bounds
+- Analytic gradients and Jacobians for the SLSQP fallback
+- Frontier traced by warm-starting each point from the previous one
 """
 
 import numpy as np
 import pandas as pd
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from scipy.optimize import minimize
 
+from .covariance import CovarianceCache, get_covariance_cache
+
 logger = logging.getLogger(__name__)
 
+_KKT_TOL = 1e-9
+_ACTIVE_BOUND_TOL = 1e-7
+_MAX_ACTIVE_SET_ITER = 100
+
 
 # ============================================================================
 # Data Models
@@ -41,6 +54,23 @@ class Portfolio:
     sharpe_ratio: float
 
 
+@dataclass
+class SolverInfo:
+    """
+    Diagnostics of one optimization.
+
+    Attributes:
+        method: "closed_form", "active_set" or "slsqp"
+        converged: Whether the solver reported success
+        iterations: Active-set iterations or SLSQP iterations
+        message: Solver message (SLSQP only)
+    """
+    method: str
+    converged: bool
+    iterations: int = 0
+    message: str = ""
+
+
 @dataclass
 class OptimizationConstraints:
     """
@@ -68,23 +98,74 @@ class PortfolioOptimizer:
     - Maximum Sharpe ratio portfolio
     - Minimum volatility portfolio
     - Constraint handling
-    - Efficient frontier generation
+    - Efficient frontier generation (warm-started, see efficient_frontier)
     """
 
-    def __init__(self, returns: pd.DataFrame):
+    def __init__(
+        self,
+        returns: pd.DataFrame,
+        cov_estimator: str = "sample",
+        cov_params: Optional[Dict[str, Any]] = None,
+        cov_cache: Optional[CovarianceCache] = None
+    ):
         """
         Initialize optimizer.
 
         Args:
             returns: DataFrame of asset returns (rows=dates, cols=tickers)
+            cov_estimator: "sample", "ledoit_wolf", "ewma" or "factor"
+                (see src.portfolio.covariance)
+            cov_params: Estimator parameters (e.g. {"halflife": 21})
+            cov_cache: Covariance cache (default: process-wide cache)
         """
         self.returns = returns
         self.tickers = list(returns.columns)
         self.n_assets = len(self.tickers)
+        self.cov_estimator = cov_estimator
+
+        if cov_cache is None:
+            cov_cache = get_covariance_cache()
 
         # Pre-compute mean returns and covariance matrix (annualized)
         self.mean_returns = returns.mean() * 252  # Annualize daily returns
-        self.cov_matrix = returns.cov() * 252     # Annualize covariance
+        self.cov_matrix = cov_cache.get(returns, cov_estimator, 252, **(cov_params or {}))
+
+        # Plain arrays for the solvers (pandas alignment in hot loops is slow)
+        self._mu = self.mean_returns.to_numpy(dtype=float)
+        self._cov = self.cov_matrix.to_numpy(dtype=float)
+        self._ones = np.ones(self.n_assets)
+
+        # Diagnostics of the most recent solve (see SolverInfo)
+        self.last_solver_info: Optional[SolverInfo] = None
+
+    @classmethod
+    def from_estimates(
+        cls,
+        mean_returns: pd.Series,
+        cov_matrix: pd.DataFrame
+    ) -> "PortfolioOptimizer":
+        """
+        Build an optimizer from precomputed annualized estimates.
+
+        Used where the moments are shared (e.g. batch workers reading
+        covariance matrices from shared memory); returns is None.
+
+        Args:
+            mean_returns: Annualized expected returns by ticker
+            cov_matrix: Annualized covariance matrix (same ticker order)
+        """
+        optimizer = cls.__new__(cls)
+        optimizer.returns = None
+        optimizer.tickers = list(mean_returns.index)
+        optimizer.n_assets = len(optimizer.tickers)
+        optimizer.cov_estimator = None
+        optimizer.mean_returns = mean_returns
+        optimizer.cov_matrix = cov_matrix
+        optimizer._mu = mean_returns.to_numpy(dtype=float)
+        optimizer._cov = cov_matrix.to_numpy(dtype=float)
+        optimizer._ones = np.ones(optimizer.n_assets)
+        optimizer.last_solver_info = None
+        return optimizer
 
     def max_sharpe_ratio(
         self,
@@ -94,6 +175,9 @@ class PortfolioOptimizer:
         """
         Compute maximum Sharpe ratio portfolio.
 
+        Uses the closed-form tangency portfolio when it satisfies the weight
+        bounds, otherwise SLSQP with an analytic gradient.
+
         Args:
             rf_rate: Risk-free rate (annualized)
             constraints: Optimization constraints
@@ -107,83 +191,269 @@ class PortfolioOptimizer:
         # Validate constraints
         self._validate_constraints(constraints)
 
-        # Objective: Minimize negative Sharpe ratio
-        def neg_sharpe_ratio(weights):
-            portfolio_return = np.dot(weights, self.mean_returns)
-            portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(self.cov_matrix, weights)))
-
-            if portfolio_vol == 0:
-                return 1e10  # Avoid division by zero
+        weights = self._max_sharpe_weights(rf_rate, constraints)
+        return self._portfolio_from_array(weights, rf_rate)
 
-            sharpe = (portfolio_return - rf_rate) / portfolio_vol
-            return -sharpe  # Minimize negative = maximize positive
-
-        # Initial guess: equal weights
-        x0 = np.array([1.0 / self.n_assets] * self.n_assets)
+    def min_volatility(
+        self,
+        constraints: Optional[OptimizationConstraints] = None
+    ) -> Portfolio:
+        """
+        Compute minimum volatility portfolio.
 
-        # Constraints
-        cons = [
-            {'type': 'eq', 'fun': lambda w: np.sum(w) - constraints.sum_weights}  # Sum = 1
-        ]
+        Solved exactly by the active-set KKT solver (closed form when no
+        weight bound binds), with SLSQP as fallback.
 
-        # Bounds
-        bounds = tuple((constraints.min_weight, constraints.max_weight) for _ in range(self.n_assets))
+        Args:
+            constraints: Optimization constraints
 
-        # Optimize
-        result = minimize(
-            neg_sharpe_ratio,
-            x0,
-            method='SLSQP',
-            bounds=bounds,
-            constraints=cons,
-            options={'maxiter': 1000}
-        )
+        Returns:
+            Portfolio with minimum volatility
+        """
+        if constraints is None:
+            constraints = OptimizationConstraints()
 
-        if not result.success:
-            logger.warning(f"Optimization did not converge: {result.message}")
+        # Validate constraints
+        self._validate_constraints(constraints)
 
-        # Build portfolio
-        weights_dict = {ticker: float(w) for ticker, w in zip(self.tickers, result.x)}
-        return self._compute_portfolio_metrics(weights_dict, rf_rate)
+        weights = self._min_volatility_weights(constraints)
+        return self._portfolio_from_array(weights, rf_rate=0.0)
 
-    def min_volatility(
+    def efficient_frontier(
         self,
+        n_points: int = 100,
+        rf_rate: float = 0.0,
         constraints: Optional[OptimizationConstraints] = None
-    ) -> Portfolio:
+    ) -> List[Portfolio]:
         """
-        Compute minimum volatility portfolio.
+        Trace the efficient frontier from min volatility to max Sharpe.
+
+        Between turning points the frontier weights are linear in the target
+        return and the set of assets at a bound is unchanged, so each point
+        is solved by one KKT linear system seeded with the previous point's
+        active set; SLSQP (warm-started from the previous weights) is only
+        used if the active-set iteration does not settle.
 
         Args:
+            n_points: Number of points on frontier
+            rf_rate: Risk-free rate
             constraints: Optimization constraints
 
         Returns:
-            Portfolio with minimum volatility
+            List of Portfolio objects on efficient frontier
         """
         if constraints is None:
             constraints = OptimizationConstraints()
 
-        # Validate constraints
         self._validate_constraints(constraints)
 
-        # Objective: Minimize volatility
-        def portfolio_volatility(weights):
-            return np.sqrt(np.dot(weights.T, np.dot(self.cov_matrix, weights)))
+        # Get min volatility and max Sharpe portfolios as bounds
+        min_return = float(self._mu @ self._min_volatility_weights(constraints))
+        max_return = float(self._mu @ self._max_sharpe_weights(rf_rate, constraints))
+
+        # If max < min (shouldn't happen), swap
+        if max_return < min_return:
+            min_return, max_return = max_return, min_return
+
+        frontier = []
+        previous = None
 
-        # Initial guess
-        x0 = np.array([1.0 / self.n_assets] * self.n_assets)
+        for target_return in np.linspace(min_return, max_return, n_points):
+            solved = self._efficient_return_weights(target_return, constraints, previous)
+            if solved is None:
+                continue
+            previous = solved
+            frontier.append(self._portfolio_from_array(solved[0], rf_rate))
 
-        # Constraints
+        return frontier
+
+    # ========================================================================
+    # Solvers
+    # ========================================================================
+
+    def _min_volatility_weights(self, constraints: OptimizationConstraints) -> np.ndarray:
+        solved = self._solve_min_variance_kkt(constraints)
+        if solved is not None:
+            return solved[0]
+
+        result = self._solve_slsqp(self._volatility_with_grad, self._equal_weights(), constraints)
+        return result.x
+
+    def _max_sharpe_weights(self, rf_rate: float, constraints: OptimizationConstraints) -> np.ndarray:
+        weights = self._tangency_weights(rf_rate, constraints)
+        if weights is not None:
+            return weights
+
+        result = self._solve_slsqp(
+            lambda w: self._neg_sharpe_with_grad(w, rf_rate),
+            self._equal_weights(),
+            constraints
+        )
+        return result.x
+
+    def _efficient_return_weights(
+        self,
+        target_return: float,
+        constraints: OptimizationConstraints,
+        previous: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Minimum-variance weights for a target return.
+
+        Args:
+            target_return: Required portfolio return
+            constraints: Optimization constraints
+            previous: (weights, at_lower, at_upper) of the neighbouring point
+
+        Returns:
+            (weights, at_lower, at_upper), or None if no solution was found
+        """
+        at_lower, at_upper = (previous[1], previous[2]) if previous else (None, None)
+        solved = self._solve_min_variance_kkt(constraints, target_return, at_lower, at_upper)
+        if solved is not None:
+            return solved
+
+        x0 = previous[0] if previous else self._equal_weights()
+        result = self._solve_slsqp(self._volatility_with_grad, x0, constraints, target_return)
+        if not result.success:
+            return None
+
+        at_lower = result.x <= constraints.min_weight + _ACTIVE_BOUND_TOL
+        at_upper = result.x >= constraints.max_weight - _ACTIVE_BOUND_TOL
+        return result.x, at_lower, at_upper
+
+    def _solve_min_variance_kkt(
+        self,
+        constraints: OptimizationConstraints,
+        target_return: Optional[float] = None,
+        at_lower: Optional[np.ndarray] = None,
+        at_upper: Optional[np.ndarray] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Minimum-variance weights by a primal-dual active-set method.
+
+        Assets in the active set are pinned to their bound and the
+        equality-constrained QP over the remaining (free) assets is solved
+        exactly from its KKT system. With no bound active this is the
+        closed-form w = S^-1 A' (A S^-1 A')^-1 b. Free assets that violate a
+        bound are pinned, pinned assets whose multiplier has the wrong sign
+        are released, until the KKT conditions hold.
+
+        Args:
+            constraints: Optimization constraints
+            target_return: Required portfolio return (None = unconstrained)
+            at_lower: Initial mask of assets at min_weight
+            at_upper: Initial mask of assets at max_weight
+
+        Returns:
+            (weights, at_lower, at_upper), or None if the covariance matrix is
+            singular on the free assets or the active set does not settle
+        """
+        n = self.n_assets
+        lb, ub = constraints.min_weight, constraints.max_weight
+        at_lower = np.zeros(n, dtype=bool) if at_lower is None else at_lower.copy()
+        at_upper = np.zeros(n, dtype=bool) if at_upper is None else at_upper.copy()
+
+        if target_return is None:
+            A = self._ones[np.newaxis, :]
+            b = np.array([constraints.sum_weights])
+        else:
+            A = np.vstack([self._ones, self._mu])
+            b = np.array([constraints.sum_weights, target_return])
+        m = len(b)
+
+        for iteration in range(1, _MAX_ACTIVE_SET_ITER + 1):
+            free = ~(at_lower | at_upper)
+            k = int(free.sum())
+            if k == 0:
+                return None
+
+            weights = np.where(at_lower, lb, np.where(at_upper, ub, 0.0))
+
+            kkt = np.zeros((k + m, k + m))
+            kkt[:k, :k] = self._cov[np.ix_(free, free)]
+            kkt[:k, k:] = A[:, free].T
+            kkt[k:, :k] = A[:, free]
+            rhs = np.concatenate([-self._cov[free] @ weights, b - A @ weights])
+
+            try:
+                solution = np.linalg.solve(kkt, rhs)
+            except np.linalg.LinAlgError:
+                return None
+            if not np.all(np.isfinite(solution)):
+                return None
+
+            weights[free] = solution[:k]
+            # Gradient of 0.5 w'Sw net of the equality multipliers: equals the
+            # bound multiplier, >= 0 at the lower bound and <= 0 at the upper
+            gradient = self._cov @ weights + A.T @ solution[k:]
+
+            violates_lower = free & (weights < lb - _KKT_TOL)
+            violates_upper = free & (weights > ub + _KKT_TOL)
+            release_lower = at_lower & (gradient < -_KKT_TOL)
+            release_upper = at_upper & (gradient > _KKT_TOL)
+
+            if not (violates_lower.any() or violates_upper.any()
+                    or release_lower.any() or release_upper.any()):
+                self.last_solver_info = SolverInfo(
+                    method="closed_form" if iteration == 1 and not (at_lower.any() or at_upper.any()) else "active_set",
+                    converged=True,
+                    iterations=iteration
+                )
+                return np.clip(weights, lb, ub), at_lower, at_upper
+
+            at_lower = (at_lower & ~release_lower) | violates_lower
+            at_upper = (at_upper & ~release_upper) | violates_upper
+
+        return None
+
+    def _tangency_weights(
+        self,
+        rf_rate: float,
+        constraints: OptimizationConstraints
+    ) -> Optional[np.ndarray]:
+        """
+        Closed-form max Sharpe portfolio w ~ S^-1 (mu - rf), if within bounds.
+
+        With sum(w) = c the risk-free rate is scaled to rf / c.
+        """
+        if constraints.sum_weights <= 0:
+            return None
+
+        try:
+            direction = np.linalg.solve(self._cov, self._mu - rf_rate / constraints.sum_weights)
+        except np.linalg.LinAlgError:
+            return None
+
+        total = direction.sum()
+        if not np.isfinite(total) or total <= 0:
+            return None
+
+        weights = direction / total * constraints.sum_weights
+        if np.any(weights < constraints.min_weight - _KKT_TOL) or np.any(weights > constraints.max_weight + _KKT_TOL):
+            return None
+        self.last_solver_info = SolverInfo(method="closed_form", converged=True, iterations=1)
+        return np.clip(weights, constraints.min_weight, constraints.max_weight)
+
+    def _solve_slsqp(self, objective, x0: np.ndarray, constraints: OptimizationConstraints,
+                     target_return: Optional[float] = None):
+        """SLSQP with analytic objective gradient and constraint Jacobians."""
         cons = [
-            {'type': 'eq', 'fun': lambda w: np.sum(w) - constraints.sum_weights}
+            {'type': 'eq', 'fun': lambda w: np.sum(w) - constraints.sum_weights,
+             'jac': lambda w: self._ones}
         ]
+        if target_return is not None:
+            cons.append(
+                {'type': 'eq', 'fun': lambda w: w @ self._mu - target_return,
+                 'jac': lambda w: self._mu}
+            )
 
-        # Bounds
         bounds = tuple((constraints.min_weight, constraints.max_weight) for _ in range(self.n_assets))
 
-        # Optimize
         result = minimize(
-            portfolio_volatility,
+            objective,
             x0,
+            jac=True,
             method='SLSQP',
             bounds=bounds,
             constraints=cons,
@@ -193,9 +463,37 @@ class PortfolioOptimizer:
         if not result.success:
             logger.warning(f"Optimization did not converge: {result.message}")
 
-        # Build portfolio
-        weights_dict = {ticker: float(w) for ticker, w in zip(self.tickers, result.x)}
-        return self._compute_portfolio_metrics(weights_dict, rf_rate=0.0)
+        self.last_solver_info = SolverInfo(
+            method="slsqp",
+            converged=bool(result.success),
+            iterations=int(result.nit),
+            message=str(result.message)
+        )
+        return result
+
+    def _volatility_with_grad(self, weights: np.ndarray) -> Tuple[float, np.ndarray]:
+        cov_w = self._cov @ weights
+        vol = np.sqrt(max(weights @ cov_w, 0.0))
+        if vol == 0:
+            return 0.0, np.zeros_like(weights)
+        return vol, cov_w / vol
+
+    def _neg_sharpe_with_grad(self, weights: np.ndarray, rf_rate: float) -> Tuple[float, np.ndarray]:
+        cov_w = self._cov @ weights
+        vol = np.sqrt(max(weights @ cov_w, 0.0))
+        if vol == 0:
+            return 1e10, np.zeros_like(weights)  # Avoid division by zero
+
+        sharpe = (weights @ self._mu - rf_rate) / vol
+        gradient = (self._mu - sharpe * cov_w / vol) / vol
+        return -sharpe, -gradient
+
+    def _equal_weights(self) -> np.ndarray:
+        return np.full(self.n_assets, 1.0 / self.n_assets)
+
+    def _portfolio_from_array(self, weights: np.ndarray, rf_rate: float) -> Portfolio:
+        weights_dict = {ticker: float(w) for ticker, w in zip(self.tickers, weights)}
+        return self._compute_portfolio_metrics(weights_dict, rf_rate)
 
     def _compute_portfolio_metrics(
         self,
@@ -216,10 +514,10 @@ class PortfolioOptimizer:
         weights_array = np.array([weights[ticker] for ticker in self.tickers])
 
         # Expected return
-        expected_return = float(np.dot(weights_array, self.mean_returns))
+        expected_return = float(weights_array @ self._mu)
 
         # Volatility
-        volatility = float(np.sqrt(np.dot(weights_array.T, np.dot(self.cov_matrix, weights_array))))
+        volatility = float(np.sqrt(max(weights_array @ self._cov @ weights_array, 0.0)))
 
         # Sharpe ratio
         if volatility > 0:
@@ -276,7 +574,8 @@ def compute_efficient_frontier(
     Compute efficient frontier.
 
     Strategy: Generate portfolios with target returns from min to max,
-    minimizing volatility for each target return.
+    minimizing volatility for each target return (see
+    PortfolioOptimizer.efficient_frontier).
 
     Args:
         returns: DataFrame of asset returns
@@ -287,57 +586,4 @@ def compute_efficient_frontier(
     Returns:
         List of Portfolio objects on efficient frontier
     """
-    optimizer = PortfolioOptimizer(returns)
-
-    if constraints is None:
-        constraints = OptimizationConstraints()
-
-    # Get min volatility and max Sharpe portfolios as bounds
-    min_vol_portfolio = optimizer.min_volatility(constraints)
-    max_sharpe_portfolio = optimizer.max_sharpe_ratio(rf_rate, constraints)
-
-    # Target returns range from min vol return to max Sharpe return
-    min_return = min_vol_portfolio.expected_return
-    max_return = max_sharpe_portfolio.expected_return
-
-    # If max < min (shouldn't happen), swap
-    if max_return < min_return:
-        min_return, max_return = max_return, min_return
-
-    target_returns = np.linspace(min_return, max_return, n_points)
-
-    frontier = []
-
-    for target_return in target_returns:
-        # Objective: Minimize volatility
-        def portfolio_volatility(weights):
-            return np.sqrt(np.dot(weights.T, np.dot(optimizer.cov_matrix, weights)))
-
-        # Initial guess
-        x0 = np.array([1.0 / optimizer.n_assets] * optimizer.n_assets)
-
-        # Constraints: sum = 1 AND return = target
-        cons = [
-            {'type': 'eq', 'fun': lambda w: np.sum(w) - constraints.sum_weights},
-            {'type': 'eq', 'fun': lambda w: np.dot(w, optimizer.mean_returns) - target_return}
-        ]
-
-        # Bounds
-        bounds = tuple((constraints.min_weight, constraints.max_weight) for _ in range(optimizer.n_assets))
-
-        # Optimize
-        result = minimize(
-            portfolio_volatility,
-            x0,
-            method='SLSQP',
-            bounds=bounds,
-            constraints=cons,
-            options={'maxiter': 1000}
-        )
-
-        if result.success:
-            weights_dict = {ticker: float(w) for ticker, w in zip(optimizer.tickers, result.x)}
-            portfolio = optimizer._compute_portfolio_metrics(weights_dict, rf_rate)
-            frontier.append(portfolio)
-
-    return frontier
+    return PortfolioOptimizer(returns).efficient_frontier(n_points, rf_rate, constraints)
@@ -5,6 +5,8 @@ Week 10: Advanced reasoning capabilities including:
 - Multi-hop queries (Day 1)
 - Reasoning chains (Day 2)
 - Query decomposition
+- Sub-query result cache (Week 12)
+- Batched VEE-backed calculations (Week 12)
 """
 
 from .multi_hop import (
@@ -15,6 +17,20 @@ from .multi_hop import (
     QueryType
 )
 
+from .subquery_cache import (
+    SubQueryCache,
+    LocalSharedBackend,
+    RedisCacheBackend,
+    create_subquery_cache
+)
+
+from .batch_calculator import (
+    BatchMetricCalculator,
+    SandboxMetricExecutor,
+    LocalMetricExecutor,
+    vectorized_metric
+)
+
 from .chains import (
     ReasoningStep,
     ReasoningChain,
@@ -30,6 +46,14 @@ __all__ = [
     "MultiHopOrchestrator",
     "SubQuery",
     "QueryType",
+    "SubQueryCache",
+    "LocalSharedBackend",
+    "RedisCacheBackend",
+    "create_subquery_cache",
+    "BatchMetricCalculator",
+    "SandboxMetricExecutor",
+    "LocalMetricExecutor",
+    "vectorized_metric",
     # Reasoning Chains (Day 2)
     "ReasoningStep",
     "ReasoningChain",
@@ -0,0 +1,372 @@
+"""
+Batched metric computation for multi-hop CALCULATE sub-queries.
+
+Week 12: Real VEE-backed execution with cross-ticker batching.
+
+CALCULATE sub-queries that become ready together and share a metric and
+date window are merged: one program downloads a multi-ticker price matrix
+and computes the metric for every column in a single NumPy pass, then the
+per-ticker values are split back into per-sub-query results. Sharpe for 20
+tickers is one sandbox run instead of 20.
+
+Executors:
+- SandboxMetricExecutor: runs the program in the VEE sandbox (Docker)
+- LocalMetricExecutor: same computation in-process over returns supplied
+  by a loader (offline use, tests)
+
+vectorized_metric is the single source of truth: it is called directly by
+LocalMetricExecutor and its source is shipped into the sandbox program.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import inspect
+import json
+import logging
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BATCH_METRICS = ("sharpe_ratio", "volatility", "return", "beta", "max_drawdown")
+RESULT_MARKER = "APE_BATCH_RESULT:"
+
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_TICKER_PATTERN = re.compile(r'^[A-Z0-9.\-^=]{1,12}$')
+
+
+def vectorized_metric(metric, returns, rf_rate=0.0, benchmark=None):
+    """
+    Compute a metric for every column of a daily returns matrix at once.
+
+    Args:
+        metric: One of BATCH_METRICS or "correlation"
+        returns: DataFrame of daily returns (rows=dates, cols=tickers), NaN
+            where a ticker has no data
+        rf_rate: Annual risk-free rate (sharpe_ratio)
+        benchmark: Series of benchmark daily returns (beta)
+
+    Returns:
+        {"values": {ticker: value or None}, "observations": {ticker: n}};
+        for "correlation", values is a nested {ticker: {ticker: rho}} matrix
+    """
+    import numpy as np
+
+    tickers = [str(c) for c in returns.columns]
+    r = returns.to_numpy(dtype=float)
+    valid = ~np.isnan(r)
+    n = valid.sum(axis=0)
+    observations = {t: int(k) for t, k in zip(tickers, n)}
+
+    if metric == "correlation":
+        corr = returns.corr(min_periods=2)
+        matrix = {
+            str(a): {str(b): (None if np.isnan(v) else float(v)) for b, v in row.items()}
+            for a, row in corr.iterrows()
+        }
+        return {"values": matrix, "observations": observations}
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        safe_n = np.where(n > 0, n, 1)
+        mean = np.where(valid, r, 0.0).sum(axis=0) / safe_n
+        centered = np.where(valid, r - mean, 0.0)
+        std = np.sqrt((centered ** 2).sum(axis=0) / np.where(n > 1, n - 1, 1))
+
+        if metric == "return":
+            values = mean * 252
+        elif metric == "volatility":
+            values = std * np.sqrt(252)
+        elif metric == "sharpe_ratio":
+            values = (mean * 252 - rf_rate) / (std * np.sqrt(252))
+        elif metric == "max_drawdown":
+            wealth = np.cumprod(1.0 + np.where(valid, r, 0.0), axis=0)
+            values = (wealth / np.maximum.accumulate(wealth, axis=0) - 1.0).min(axis=0)
+        elif metric == "beta":
+            if benchmark is None:
+                raise ValueError("beta requires benchmark returns")
+            b = benchmark.reindex(returns.index).to_numpy(dtype=float)[:, None]
+            both = valid & ~np.isnan(b)
+            n = both.sum(axis=0)
+            k = np.where(n > 0, n, 1)
+            x = np.where(both, r, 0.0)
+            y = np.where(both, b, 0.0)
+            x = np.where(both, x - x.sum(axis=0) / k, 0.0)
+            y = np.where(both, y - y.sum(axis=0) / k, 0.0)
+            values = (x * y).sum(axis=0) / (y ** 2).sum(axis=0)
+        else:
+            raise ValueError(f"Unsupported metric: {metric}")
+
+    values = np.where(n > 1, values, np.nan)
+    return {
+        "values": {t: (None if not np.isfinite(v) else float(v)) for t, v in zip(tickers, values)},
+        "observations": observations,
+    }
+
+
+# ============================================================================
+# Executors
+# ============================================================================
+
+_PROGRAM_TEMPLATE = '''
+import json
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+{function_source}
+
+tickers = {tickers!r}
+benchmark = {benchmark!r}
+symbols = tickers + ([benchmark] if benchmark and benchmark not in tickers else [])
+
+prices = yf.download(symbols, start={start!r}, end={end!r}, auto_adjust=True, progress=False)["Close"]
+if isinstance(prices, pd.Series):
+    prices = prices.to_frame(symbols[0])
+returns = prices.pct_change(fill_method=None).iloc[1:]
+
+bench = returns[benchmark] if benchmark in returns.columns else None
+result = vectorized_metric({metric!r}, returns.reindex(columns=tickers), {rf_rate!r}, bench)
+print({marker!r} + json.dumps(result))
+'''
+
+
+def build_batch_program(
+    metric: str,
+    tickers: List[str],
+    start: str,
+    end: str,
+    rf_rate: float = 0.0,
+    benchmark: Optional[str] = None
+) -> str:
+    """
+    Sandbox program computing one metric for many tickers in one run.
+
+    Raises:
+        ValueError: On malformed tickers or dates (they are embedded in code)
+    """
+    for value in [start, end]:
+        if not _DATE_PATTERN.match(value):
+            raise ValueError(f"Invalid date: {value!r}")
+    for ticker in tickers + ([benchmark] if benchmark else []):
+        if not _TICKER_PATTERN.match(ticker):
+            raise ValueError(f"Invalid ticker: {ticker!r}")
+
+    return _PROGRAM_TEMPLATE.format(
+        function_source=inspect.getsource(vectorized_metric),
+        tickers=list(tickers),
+        benchmark=benchmark if metric == "beta" else None,
+        start=start,
+        end=end,
+        metric=metric,
+        rf_rate=float(rf_rate),
+        marker=RESULT_MARKER,
+    )
+
+
+def parse_batch_output(stdout: str) -> Dict[str, Any]:
+    """Extract the result JSON printed by a batch program."""
+    for line in reversed(stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise ValueError("Batch program produced no result")
+
+
+class SandboxMetricExecutor:
+    """Runs batch programs in the VEE sandbox."""
+
+    def __init__(self, sandbox: Any, timeout: int = 120):
+        """
+        Args:
+            sandbox: SandboxRunner (or anything with its execute() signature)
+            timeout: Sandbox timeout per batch in seconds
+        """
+        self.sandbox = sandbox
+        self.timeout = timeout
+
+    def run(
+        self,
+        metric: str,
+        tickers: List[str],
+        start: str,
+        end: str,
+        rf_rate: float = 0.0,
+        benchmark: Optional[str] = None
+    ) -> Dict[str, Any]:
+        code = build_batch_program(metric, tickers, start, end, rf_rate, benchmark)
+        result = self.sandbox.execute(
+            code,
+            timeout=self.timeout,
+            network_mode="bridge",  # Market data download
+            allow_subprocess=True  # pandas requires subprocess (Docker still blocks via cap_drop)
+        )
+        if result.status != "success":
+            raise RuntimeError(f"VEE batch {result.status}: {result.stderr.strip()[-500:]}")
+
+        if getattr(result, "result_json", None) is not None:
+            output = json.loads(result.result_json)
+        else:
+            output = parse_batch_output(result.stdout)
+        output["code_hash"] = result.code_hash
+        return output
+
+
+class LocalMetricExecutor:
+    """Computes batches in-process from a returns loader."""
+
+    def __init__(self, returns_loader: Callable[[List[str], str, str], pd.DataFrame]):
+        """
+        Args:
+            returns_loader: (tickers, start, end) -> daily returns DataFrame
+        """
+        self.returns_loader = returns_loader
+
+    def run(
+        self,
+        metric: str,
+        tickers: List[str],
+        start: str,
+        end: str,
+        rf_rate: float = 0.0,
+        benchmark: Optional[str] = None
+    ) -> Dict[str, Any]:
+        symbols = tickers + ([benchmark] if metric == "beta" and benchmark not in tickers else [])
+        returns = self.returns_loader(symbols, start, end)
+        bench = returns[benchmark] if metric == "beta" and benchmark in returns.columns else None
+        return vectorized_metric(metric, returns.reindex(columns=tickers), rf_rate, bench)
+
+
+# ============================================================================
+# Calculator
+# ============================================================================
+
+class BatchMetricCalculator:
+    """
+    Splits sub-queries into per-(metric, window) batches and back.
+
+    Sub-queries are duck-typed (id, metric, params with "ticker" or
+    "tickers", optional "start_date"/"end_date").
+    """
+
+    def __init__(
+        self,
+        executor: Any,
+        rf_rate: float = 0.0,
+        benchmark: str = "SPY",
+        lookback_days: int = 365,
+        today: Optional[Callable[[], date]] = None
+    ):
+        """
+        Args:
+            executor: SandboxMetricExecutor or LocalMetricExecutor
+            rf_rate: Annual risk-free rate for sharpe_ratio
+            benchmark: Benchmark ticker for beta
+            lookback_days: Window when a sub-query has no dates
+            today: Clock for the default window (tests)
+        """
+        self.executor = executor
+        self.rf_rate = rf_rate
+        self.benchmark = benchmark
+        self.lookback_days = lookback_days
+        self._today = today or date.today
+
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.sub_queries_computed = 0
+
+    def window(self, params: Dict[str, Any]) -> Tuple[str, str]:
+        end = params.get("end_date")
+        if not end:
+            end = (self._today() + timedelta(days=1)).isoformat()
+        start = params.get("start_date")
+        if not start:
+            start = (date.fromisoformat(str(end)[:10]) - timedelta(days=self.lookback_days)).isoformat()
+        return str(start)[:10], str(end)[:10]
+
+    def batch_key(self, sq: Any) -> Tuple[str, str, str]:
+        """Sub-queries with equal keys are computed in one run."""
+        return (sq.metric,) + self.window(sq.params)
+
+    def calculate(self, sub_queries: List[Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute CALCULATE sub-queries, one executor run per batch key.
+
+        Returns:
+            {sub_query_id: result dict} (error dicts for failures)
+        """
+        batches: Dict[Tuple[str, str, str], List[Any]] = {}
+        for sq in sub_queries:
+            batches.setdefault(self.batch_key(sq), []).append(sq)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for (metric, start, end), members in batches.items():
+            if metric not in BATCH_METRICS:
+                for sq in members:
+                    results[sq.id] = {"error": f"Unsupported metric: {metric}"}
+                continue
+
+            tickers = list(dict.fromkeys(sq.params.get("ticker", "") for sq in members))
+            output = self._run(metric, tickers, start, end)
+
+            for sq in members:
+                ticker = sq.params.get("ticker", "")
+                value = output["values"].get(ticker)
+                if value is None:
+                    results[sq.id] = {"error": f"No data to calculate {metric} for {ticker}"}
+                    continue
+                results[sq.id] = {
+                    "metric": metric,
+                    "ticker": ticker,
+                    "value": value,
+                    "observations": output["observations"].get(ticker, 0),
+                    "start_date": start,
+                    "end_date": end,
+                    "batch_size": len(tickers),
+                    "code_hash": output.get("code_hash"),
+                    "status": "success"
+                }
+
+        return results
+
+    def correlate(self, sq: Any) -> Dict[str, Any]:
+        """Pairwise correlation of daily returns for sq.params["tickers"]."""
+        tickers = list(sq.params.get("tickers", []))
+        start, end = self.window(sq.params)
+        output = self._run("correlation", tickers, start, end)
+
+        matrix = output["values"]
+        value = None
+        if len(tickers) == 2:
+            value = matrix.get(tickers[0], {}).get(tickers[1])
+            if value is None:
+                return {"error": f"Not enough overlapping data to correlate {tickers}"}
+
+        return {
+            "metric": "correlation",
+            "tickers": tickers,
+            "value": value,
+            "matrix": matrix,
+            "start_date": start,
+            "end_date": end,
+            "code_hash": output.get("code_hash"),
+            "status": "success"
+        }
+
+    def _run(self, metric: str, tickers: List[str], start: str, end: str) -> Dict[str, Any]:
+        logger.info(f"Batch {metric} for {len(tickers)} tickers ({start}..{end})")
+        output = self.executor.run(metric, tickers, start, end, self.rf_rate, self.benchmark)
+        with self._lock:
+            self.runs += 1
+            self.sub_queries_computed += len(tickers)
+        return output
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "sub_queries_computed": self.sub_queries_computed,
+                "avg_batch_size": self.sub_queries_computed / self.runs if self.runs else 0.0,
+            }
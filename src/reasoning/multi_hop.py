@@ -11,15 +11,26 @@ Example:
     2. Calculate Sharpe ratio for MSFT
     3. Compare results
     4. Calculate correlation between AAPL and MSFT
+
+Week 12: Sub-queries run concurrently on a bounded thread pool; each one
+starts as soon as its own dependencies finish (1 and 2 in parallel, then 3
+and 4 in parallel), with per-sub-query timeouts and cancellation of
+dependents when a sub-query fails.
 """
 
 import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any, Set, Tuple
 from uuid import uuid4
 import logging
 
+from .batch_calculator import BatchMetricCalculator
+from .subquery_cache import SubQueryCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,14 +89,18 @@ class ExecutionResult:
         success: Whether execution succeeded
         final_result: Final result of the query
         intermediate_results: Results of sub-queries (keyed by sub-query ID)
-        execution_order: Order in which sub-queries were executed
+        execution_order: Order in which sub-queries completed
         error: Error message if execution failed
+        failed: Errors of failed or timed-out sub-queries (keyed by ID)
+        cancelled: Sub-queries skipped because a dependency failed
     """
     success: bool
     final_result: Any
     intermediate_results: Dict[str, Any] = field(default_factory=dict)
     execution_order: List[str] = field(default_factory=list)
     error: Optional[str] = None
+    failed: Dict[str, str] = field(default_factory=dict)
+    cancelled: List[str] = field(default_factory=list)
 
 
 # ============================================================================
@@ -317,58 +332,51 @@ class DependencyGraph:
         """
         Return topological ordering of nodes.
 
-        Uses Kahn's algorithm.
+        Uses Kahn's algorithm, O(V + E).
 
         Returns:
             List of node IDs in execution order
         """
+        return [node_id for node_id, _ in self._kahn()]
+
+    def get_parallel_groups(self) -> List[List[str]]:
+        """
+        Identify groups of nodes that can be executed in parallel.
+
+        Returns:
+            List of groups, where each group can run in parallel
+        """
+        groups: List[List[str]] = []
+        for node_id, level in self._kahn():
+            if level == len(groups):
+                groups.append([])
+            groups[level].append(node_id)
+        return groups
+
+    def _kahn(self) -> List[Tuple[str, int]]:
+        """Topological order with each node's level (longest dependency chain)."""
         # Calculate in-degrees
         in_degree = {node_id: len(self.nodes[node_id].dependencies) for node_id in self.nodes}
+        level = {node_id: 0 for node_id in self.nodes}
 
         # Find nodes with no dependencies
-        queue = [node_id for node_id, degree in in_degree.items() if degree == 0]
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
         result = []
 
         while queue:
-            node_id = queue.pop(0)
-            result.append(node_id)
+            node_id = queue.popleft()
+            result.append((node_id, level[node_id]))
 
             # Reduce in-degree of dependent nodes
             for dependent in self.edges.get(node_id, []):
+                level[dependent] = max(level[dependent], level[node_id] + 1)
                 in_degree[dependent] -= 1
                 if in_degree[dependent] == 0:
                     queue.append(dependent)
 
+        # FIFO order already visits levels in non-decreasing order
         return result
 
-    def get_parallel_groups(self) -> List[List[str]]:
-        """
-        Identify groups of nodes that can be executed in parallel.
-
-        Returns:
-            List of groups, where each group can run in parallel
-        """
-        order = self.topological_sort()
-        groups = []
-
-        # Calculate earliest execution level for each node
-        levels = {}
-        for node_id in order:
-            deps = self.get_dependencies(node_id)
-            if not deps:
-                levels[node_id] = 0
-            else:
-                levels[node_id] = max(levels[dep] for dep in deps) + 1
-
-        # Group nodes by level
-        max_level = max(levels.values()) if levels else 0
-        for level in range(max_level + 1):
-            group = [node_id for node_id, l in levels.items() if l == level]
-            if group:
-                groups.append(group)
-
-        return groups
-
     def has_cycles(self) -> bool:
         """Check if graph has cycles."""
         order = self.topological_sort()
@@ -386,14 +394,35 @@ class MultiHopOrchestrator:
     Flow:
     1. Decompose query into sub-queries
     2. Build dependency graph
-    3. Execute in topological order
+    3. Execute concurrently, each sub-query once its dependencies finish
     4. Cache intermediate results
     5. Return final result
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        sub_query_timeout: Optional[float] = None,
+        cache: Optional[SubQueryCache] = None,
+        calculator: Optional[BatchMetricCalculator] = None
+    ):
+        """
+        Initialize orchestrator.
+
+        Args:
+            max_workers: Sub-queries executing at the same time
+            sub_query_timeout: Seconds a sub-query may run (None = no limit)
+            cache: Sub-query result cache; pass one instance (or one with a
+                shared backend) to several orchestrators to share results
+            calculator: Computes CALCULATE/CORRELATE sub-queries for real
+                (e.g. in the VEE sandbox) and batches ready CALCULATEs that
+                share a metric and window; None keeps placeholder values
+        """
         self.decomposer = QueryDecomposer()
-        self.cache: Dict[str, Any] = {}
+        self.cache = cache if cache is not None else SubQueryCache()
+        self.max_workers = max(1, max_workers)
+        self.sub_query_timeout = sub_query_timeout
+        self.calculator = calculator
 
     def execute(self, query: str) -> ExecutionResult:
         """
@@ -429,25 +458,26 @@ class MultiHopOrchestrator:
                     error="Circular dependencies detected in query"
                 )
 
-            # Step 4: Execute in topological order
-            execution_order = graph.topological_sort()
-            intermediate_results = {}
-
-            for sq_id in execution_order:
-                sq = graph.nodes[sq_id]
-
-                # Execute sub-query
-                result = self._execute_sub_query(sq, intermediate_results)
-                intermediate_results[sq_id] = result
-                sq.result = result
+            # Step 4: Execute, releasing each sub-query when its dependencies finish
+            intermediate_results, execution_order, failed, cancelled = self._execute_graph(graph)
 
             # Step 5: Final result is the result of the last sub-query
-            final_sq_id = execution_order[-1]
-            final_result = intermediate_results[final_sq_id]
+            final_sq_id = graph.topological_sort()[-1]
+
+            if failed or cancelled:
+                return ExecutionResult(
+                    success=False,
+                    final_result=intermediate_results.get(final_sq_id),
+                    intermediate_results=intermediate_results,
+                    execution_order=execution_order,
+                    error="; ".join(f"{sq_id}: {err}" for sq_id, err in failed.items()),
+                    failed=failed,
+                    cancelled=cancelled
+                )
 
             return ExecutionResult(
                 success=True,
-                final_result=final_result,
+                final_result=intermediate_results[final_sq_id],
                 intermediate_results=intermediate_results,
                 execution_order=execution_order
             )
@@ -460,6 +490,176 @@ class MultiHopOrchestrator:
                 error=str(e)
             )
 
+    def _execute_graph(
+        self,
+        graph: DependencyGraph
+    ) -> Tuple[Dict[str, Any], List[str], Dict[str, str], List[str]]:
+        """
+        Run all sub-queries on a bounded thread pool.
+
+        Scheduling is O(V + E): each sub-query keeps a count of unfinished
+        dependencies and is submitted the moment it reaches zero, so a slow
+        sub-query only delays its own dependents, not a whole level. A
+        sub-query that raises, returns an error result or exceeds
+        sub_query_timeout is failed, and everything depending on it
+        (transitively) is cancelled.
+
+        Args:
+            graph: Acyclic dependency graph
+
+        Returns:
+            (intermediate_results, completion order, failed, cancelled)
+        """
+        remaining = {sq_id: len(sq.dependencies) for sq_id, sq in graph.nodes.items()}
+        ready = deque(sq_id for sq_id, count in remaining.items() if count == 0)
+        tasks: deque = deque()
+
+        intermediate_results: Dict[str, Any] = {}
+        execution_order: List[str] = []
+        failed: Dict[str, str] = {}
+        cancelled: List[str] = []
+        cancelled_ids: Set[str] = set()
+
+        running: Dict[Future, List[str]] = {}
+        started: Dict[str, float] = {}
+
+        def run(sq_ids: List[str]) -> Dict[str, Any]:
+            now = time.monotonic()
+            for sq_id in sq_ids:
+                started[sq_id] = now
+            if len(sq_ids) == 1:
+                sq = graph.nodes[sq_ids[0]]
+                return {sq.id: self._execute_sub_query(sq, intermediate_results)}
+            return self._execute_calculate_batch([graph.nodes[sq_id] for sq_id in sq_ids])
+
+        def fail(sq_id: str, error: str) -> None:
+            logger.warning(f"Sub-query {sq_id} failed: {error}")
+            failed[sq_id] = error
+
+            # Cancel dependents; they cannot be ready or running yet
+            pending = deque(graph.edges.get(sq_id, []))
+            while pending:
+                dependent = pending.popleft()
+                if dependent in cancelled_ids:
+                    continue
+                cancelled_ids.add(dependent)
+                cancelled.append(dependent)
+                pending.extend(graph.edges.get(dependent, []))
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="multi-hop")
+        try:
+            while ready or tasks or running:
+                # Everything ready now forms one wave; merge its batchable CALCULATEs
+                tasks.extend(self._plan_tasks(graph, ready))
+                ready.clear()
+
+                while tasks and len(running) < self.max_workers:
+                    sq_ids = tasks.popleft()
+                    running[pool.submit(run, sq_ids)] = sq_ids
+
+                done, _ = wait(list(running), timeout=self._wait_timeout(running, started),
+                               return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    sq_ids = running.pop(future)
+                    try:
+                        task_results = future.result()
+                    except Exception as e:
+                        for sq_id in sq_ids:
+                            fail(sq_id, f"{type(e).__name__}: {e}")
+                        continue
+
+                    for sq_id in sq_ids:
+                        result = task_results.get(sq_id)
+                        intermediate_results[sq_id] = result
+                        execution_order.append(sq_id)
+                        graph.nodes[sq_id].result = result
+
+                        if isinstance(result, dict) and "error" in result:
+                            fail(sq_id, str(result["error"]))
+                            continue
+
+                        for dependent in graph.edges.get(sq_id, []):
+                            remaining[dependent] -= 1
+                            if remaining[dependent] == 0 and dependent not in cancelled_ids:
+                                ready.append(dependent)
+
+                # Abandon sub-queries over their time budget (threads cannot
+                # be killed; a late result is discarded)
+                if self.sub_query_timeout is not None:
+                    now = time.monotonic()
+                    for future, sq_ids in list(running.items()):
+                        if sq_ids[0] in started and now - started[sq_ids[0]] >= self.sub_query_timeout:
+                            del running[future]
+                            future.cancel()
+                            for sq_id in sq_ids:
+                                fail(sq_id, f"TimeoutError: exceeded {self.sub_query_timeout}s")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return intermediate_results, execution_order, failed, cancelled
+
+    def _plan_tasks(self, graph: DependencyGraph, ready: deque) -> List[List[str]]:
+        """
+        Split ready sub-queries into tasks.
+
+        With a calculator, CALCULATE sub-queries sharing a batch key
+        (metric and date window) become one task; everything else runs alone.
+        """
+        tasks: List[List[str]] = []
+        batches: Dict[Tuple, List[str]] = {}
+
+        for sq_id in ready:
+            sq = graph.nodes[sq_id]
+            if self.calculator is not None and sq.type == QueryType.CALCULATE:
+                key = self.calculator.batch_key(sq)
+                if key not in batches:
+                    batches[key] = []
+                    tasks.append(batches[key])
+                batches[key].append(sq_id)
+            else:
+                tasks.append([sq_id])
+
+        return tasks
+
+    def _wait_timeout(self, running: Dict[Future, List[str]], started: Dict[str, float]) -> Optional[float]:
+        """Time until the earliest running task hits its timeout."""
+        if self.sub_query_timeout is None:
+            return None
+
+        now = time.monotonic()
+        deadlines = [started[sq_ids[0]] + self.sub_query_timeout - now
+                     for sq_ids in running.values() if sq_ids[0] in started]
+        if not deadlines:
+            # Submitted but not started yet (workers busy with abandoned sub-queries)
+            return self.sub_query_timeout
+        return max(0.0, min(deadlines))
+
+    def _execute_calculate_batch(self, sub_queries: List[SubQuery]) -> Dict[str, Any]:
+        """
+        Execute CALCULATE sub-queries sharing a metric and window in one run.
+
+        Cached results are served per sub-query; only the misses are sent to
+        the calculator, and each computed result is cached under its own key.
+        """
+        results: Dict[str, Any] = {}
+        misses: List[SubQuery] = []
+
+        for sq in sub_queries:
+            cached = self.cache.get(self._get_cache_key(sq))
+            if cached is not None:
+                results[sq.id] = cached
+            else:
+                misses.append(sq)
+
+        if misses:
+            computed = self.calculator.calculate(misses)
+            for sq in misses:
+                self.cache.put(self._get_cache_key(sq), computed[sq.id], self.cache.ttl_for(sq.params))
+                results[sq.id] = computed[sq.id]
+
+        return results
+
     def _execute_sub_query(self, sq: SubQuery, context: Dict[str, Any]) -> Any:
         """
         Execute a single sub-query.
@@ -471,35 +671,33 @@ class MultiHopOrchestrator:
         Returns:
             Result of sub-query execution
         """
-        # Check cache first
-        cache_key = self._get_cache_key(sq)
-        if cache_key in self.cache:
-            logger.info(f"Cache hit for sub-query {sq.id}")
-            return self.cache[cache_key]
+        # Cached, or computed once even if identical sub-queries race
+        return self.cache.get_or_compute(
+            self._get_cache_key(sq),
+            lambda: self._compute_sub_query(sq, context),
+            ttl_seconds=self.cache.ttl_for(sq.params)
+        )
 
-        # Execute based on type
+    def _compute_sub_query(self, sq: SubQuery, context: Dict[str, Any]) -> Any:
+        """Execute a sub-query based on its type (no caching)."""
         if sq.type == QueryType.CALCULATE:
-            result = self._execute_calculate(sq)
+            return self._execute_calculate(sq)
         elif sq.type == QueryType.COMPARE:
-            result = self._execute_compare(sq, context)
+            return self._execute_compare(sq, context)
         elif sq.type == QueryType.CORRELATE:
-            result = self._execute_correlate(sq, context)
-        else:
-            result = {"error": f"Unknown query type: {sq.type}"}
-
-        # Cache result
-        self.cache[cache_key] = result
-
-        return result
+            return self._execute_correlate(sq, context)
+        return {"error": f"Unknown query type: {sq.type}"}
 
     def _get_cache_key(self, sq: SubQuery) -> str:
         """Generate cache key for sub-query."""
-        params_str = "_".join(f"{k}={v}" for k, v in sorted(sq.params.items()))
-        return f"{sq.type}_{sq.metric}_{params_str}"
+        return self.cache.make_key(getattr(sq.type, "value", sq.type), sq.metric, sq.params)
 
     def _execute_calculate(self, sq: SubQuery) -> Dict[str, Any]:
         """Execute calculation sub-query."""
-        # Mock implementation - in production, this would call VEE
+        if self.calculator is not None:
+            return self.calculator.calculate([sq])[sq.id]
+
+        # Mock implementation - without a calculator there is no VEE to call
         ticker = sq.params.get("ticker", "UNKNOWN")
         metric = sq.metric
 
@@ -537,6 +735,9 @@ class MultiHopOrchestrator:
 
     def _execute_correlate(self, sq: SubQuery, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute correlation sub-query."""
+        if self.calculator is not None:
+            return self.calculator.correlate(sq)
+
         tickers = sq.params.get("tickers", [])
 
         logger.info(f"Calculating correlation for {tickers}")
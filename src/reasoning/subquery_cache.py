@@ -0,0 +1,357 @@
+"""
+Sub-query result cache for multi-hop reasoning.
+
+Week 12: Bounded, TTL-aware and shareable sub-query cache.
+
+Design:
+- L1: in-process LRU with a size bound and per-entry TTL
+- L2 (optional): shared backend, so per-ticker calculations made for one
+  user's comparison query are reused by other users and workers
+  (LocalSharedBackend in-process, RedisCacheBackend across processes)
+- Keys include the as-of date of the data: results about "today" expire
+  with the TTL and at the date rollover; results about a past as-of date
+  describe immutable history and get a longer TTL
+- Single-flight: concurrent identical sub-queries compute once, the
+  others wait for the leader's result
+- Error results are never cached
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import threading
+import time
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ape:multihop:"
+
+# Params that do not change a sub-query's result (the raw user query text
+# would otherwise make every user's AAPL Sharpe ratio a different key)
+IGNORED_PARAMS = {"query"}
+
+_AS_OF_PARAMS = ("as_of", "end_date", "end")
+
+
+# ============================================================================
+# Shared Backends
+# ============================================================================
+
+class SharedCacheBackend(ABC):
+    """Cache storage shared between orchestrators (values are JSON strings)."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store a value that expires after ttl_seconds."""
+
+
+class LocalSharedBackend(SharedCacheBackend):
+    """In-process shared store; orchestrators given the same instance share it."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl_seconds, value)
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    """Redis-backed store; failures degrade to cache misses."""
+
+    def __init__(self, redis_url: str = "redis://localhost:6379/0", client: Any = None):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise ImportError("redis is required for RedisCacheBackend")
+            client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.client = client
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self.client.get(key)
+        except Exception as e:
+            logger.warning(f"Sub-query cache GET failed: {e}")
+            return None
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        try:
+            self.client.set(key, value, ex=max(1, int(ttl_seconds)))
+        except Exception as e:
+            logger.warning(f"Sub-query cache SET failed: {e}")
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+@dataclass
+class _Flight:
+    """One in-progress computation that identical requests wait on."""
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SubQueryCache:
+    """
+    Two-tier sub-query result cache with single-flight computation.
+
+    Attributes:
+        max_entries: L1 size bound (least recently used evicted)
+        ttl_seconds: TTL of results whose as-of date is today or later
+        historical_ttl_seconds: TTL of results about a past as-of date
+        shared: Optional L2 backend
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 900.0,
+        historical_ttl_seconds: float = 7 * 24 * 3600.0,
+        shared: Optional[SharedCacheBackend] = None,
+        today: Optional[Callable[[], date]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.historical_ttl_seconds = historical_ttl_seconds
+        self.shared = shared
+        self._today = today or (lambda: datetime.now(timezone.utc).date())
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def as_of(self, params: Dict[str, Any]) -> str:
+        """As-of date of the data a sub-query reads (default: today, UTC)."""
+        for name in _AS_OF_PARAMS:
+            value = params.get(name)
+            if value:
+                return str(value)[:10]
+        return self._today().isoformat()
+
+    def make_key(self, query_type: str, metric: str, params: Dict[str, Any]) -> str:
+        """Stable key over type, metric, result-relevant params and as-of date."""
+        relevant = {k: v for k, v in params.items() if k not in IGNORED_PARAMS}
+        canonical = json.dumps(relevant, sort_keys=True, default=str)
+        digest = hashlib.sha1(canonical.encode()).hexdigest()[:16]
+        return f"{KEY_PREFIX}{query_type}:{metric}:{self.as_of(params)}:{digest}"
+
+    def ttl_for(self, params: Dict[str, Any]) -> float:
+        if self.as_of(params) < self._today().isoformat():
+            return self.historical_ttl_seconds
+        return self.ttl_seconds
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl_seconds: Optional[float] = None) -> Any:
+        """
+        Cached value for key, computing it at most once across callers.
+
+        Args:
+            key: Cache key (see make_key)
+            compute: Produces the value on a miss
+            ttl_seconds: TTL for a newly computed value (default: ttl_seconds)
+
+        Returns:
+            Cached or computed value (exceptions from compute propagate to
+            every waiting caller)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+
+        with self._lock:
+            found, value = self._get_local(key)
+            if found:
+                self.hits += 1
+                return value
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            value = self._get_shared(key)
+            if value is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                self._set_local(key, value, ttl)
+            else:
+                with self._lock:
+                    self.misses += 1
+                value = compute()
+                if self._cacheable(value):
+                    self._set_local(key, value, ttl)
+                    self._set_shared(key, value, ttl)
+            flight.result = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def get(self, key: str) -> Any:
+        """Cached value (L1, then shared) or None; no computation."""
+        with self._lock:
+            found, value = self._get_local(key)
+            if found:
+                self.hits += 1
+                return value
+
+        value = self._get_shared(key)
+        if value is not None:
+            with self._lock:
+                self.shared_hits += 1
+            self._set_local(key, value, self.ttl_seconds)
+        return value
+
+    def put(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a computed value (error results are ignored)."""
+        if not self._cacheable(value):
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self.misses += 1
+        self._set_local(key, value, ttl)
+        self._set_shared(key, value, ttl)
+
+    def _get_local(self, key: str) -> Tuple[bool, Any]:
+        """L1 lookup; caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _set_local(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _get_shared(self, key: str) -> Any:
+        if self.shared is None:
+            return None
+        raw = self.shared.get(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def _set_shared(self, key: str, value: Any, ttl: float) -> None:
+        if self.shared is None:
+            return
+        try:
+            raw = json.dumps(value)
+        except (TypeError, ValueError):
+            return  # Not shareable; stays in L1 only
+        self.shared.set(key, raw, ttl)
+
+    @staticmethod
+    def _cacheable(value: Any) -> bool:
+        if isinstance(value, dict):
+            return "error" not in value and value.get("status") != "error"
+        return value is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+
+def create_subquery_cache(
+    backend: str = "memory",
+    redis_url: Optional[str] = None,
+    **kwargs
+) -> SubQueryCache:
+    """
+    Build a sub-query cache.
+
+    Args:
+        backend: "memory" (per process) or "redis" (shared L2)
+        redis_url: Redis URL for the redis backend
+        **kwargs: SubQueryCache options
+
+    Returns:
+        SubQueryCache
+    """
+    if backend == "redis":
+        shared = RedisCacheBackend(redis_url or "redis://localhost:6379/0")
+        return SubQueryCache(shared=shared, **kwargs)
+    if backend != "memory":
+        raise ValueError(f"Unknown sub-query cache backend: {backend}")
+    return SubQueryCache(**kwargs)
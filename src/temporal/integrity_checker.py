@@ -4,7 +4,8 @@ Temporal Integrity Checker - Prevents look-ahead bias in backtesting.
 Week 4 Day 3: Core TIM implementation.
 
 Architecture:
-1. Parse Python code AST for temporal violations
+1. Parse Python code AST for temporal violations (Week 12: one cached
+   parse and walk shared with plan validation, see validation.code_analysis)
 2. Detect patterns: .shift(-N), future dates, suspicious iloc
 3. Generate violation reports with severity levels
 4. Integration points: VEE (pre-execution), Gate (post-validation)
@@ -19,14 +20,14 @@ Valid patterns:
 - df['ma'] = df['Close'].rolling(20).mean()  # Backward rolling OK
 """
 
-import ast
-import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, List
+from typing import Dict, Iterable, Iterator, Optional, List
 from datetime import datetime, UTC
 import logging
 
+from ..validation.code_analysis import CodeAnalysis, CodeAnalyzer, CodeFinding, get_code_analyzer
+
 
 class ViolationType(str, Enum):
     """Types of temporal violations."""
@@ -82,16 +83,26 @@ class TemporalIntegrityChecker:
         if result.has_violations:
             for violation in result.violations:
                 print(violation)
+
+        # Large corpora (golden set, DSPy optimization, A/B runs)
+        for result in tim.check_batch(snippets, query_date=datetime(2024, 1, 15)):
+            ...
     """
 
-    def __init__(self, enable_checks: bool = True):
+    # Distinct results remembered by check_batch before the memo is reset
+    BATCH_MEMO_SIZE = 4096
+
+    def __init__(self, enable_checks: bool = True, analyzer: Optional[CodeAnalyzer] = None):
         """
         Initialize TIM.
 
         Args:
             enable_checks: Enable temporal validation (disable for testing)
+            analyzer: Code analyzer (default: the process-wide one shared
+                with plan validation and plan metrics)
         """
         self.enable_checks = enable_checks
+        self.analyzer = analyzer if analyzer is not None else get_code_analyzer()
         self.logger = logging.getLogger(__name__)
 
     def check_code(
@@ -119,19 +130,60 @@ class TemporalIntegrityChecker:
                 query_date=query_date
             )
 
-        violations = []
+        # One parse and walk per distinct code block (cached by code hash)
+        analysis = self.analyzer.analyze(code)
+        return self._result_from(analysis, query_date)
+
+    def check_batch(
+        self,
+        codes: Iterable[str],
+        query_date: datetime,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 256,
+        process_threshold: int = 2048
+    ) -> Iterator[TemporalCheckResult]:
+        """
+        Check many snippets, streaming results in input order.
 
-        # Check 1: Look-ahead shift patterns
-        violations.extend(self._check_shift_patterns(code))
+        Snippets are deduplicated by hash and analyzed once; large batches
+        are analyzed in a process pool (see CodeAnalyzer.analyze_batch).
+        Duplicate snippets yield the same result object.
 
-        # Check 2: Future date access
-        violations.extend(self._check_date_ranges(code, query_date))
+        Args:
+            codes: Python code snippets (any iterable; consumed lazily)
+            query_date: Query timestamp applied to every snippet
+            max_workers: Analysis processes (default: CPU count; 1 = in-process)
+            chunk_size: Snippets per worker task
+            process_threshold: Minimum distinct uncached snippets per window
+                before the pool is used
+
+        Yields:
+            TemporalCheckResult per snippet
+        """
+        if not self.enable_checks:
+            for _ in codes:
+                yield self.check_code("", query_date)
+            return
+
+        analyses = self.analyzer.analyze_batch(
+            codes,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+            process_threshold=process_threshold
+        )
 
-        # Check 3: Suspicious iloc usage
-        violations.extend(self._check_iloc_patterns(code))
+        # Bounded memo: a result depends only on (analysis, query_date)
+        results: Dict[str, TemporalCheckResult] = {}
+        for analysis in analyses:
+            result = results.get(analysis.code_hash)
+            if result is None:
+                if len(results) >= self.BATCH_MEMO_SIZE:
+                    results.clear()
+                result = results[analysis.code_hash] = self._result_from(analysis, query_date)
+            yield result
 
-        # Check 4: Centered rolling windows
-        violations.extend(self._check_rolling_patterns(code))
+    def _result_from(self, analysis: CodeAnalysis, query_date: datetime) -> TemporalCheckResult:
+        violations = self._violations_from(analysis, query_date)
 
         # Generate report
         report = self._generate_report(violations, query_date)
@@ -143,120 +195,49 @@ class TemporalIntegrityChecker:
             query_date=query_date
         )
 
-    def _check_shift_patterns(self, code: str) -> List[TemporalViolation]:
-        """
-        Detect .shift(-N) patterns (look-ahead bias).
-
-        Pattern: df['col'].shift(-5)  # VIOLATION
-        Valid:   df['col'].shift(5)   # OK (lagged)
-        """
-        violations = []
-
-        # Regex: .shift( -N ) or .shift(-N)
-        shift_pattern = re.compile(r'\.shift\s*\(\s*-\s*(\d+)\s*\)')
-
-        for line_num, line in enumerate(code.split('\n'), start=1):
-            matches = shift_pattern.findall(line)
-            for shift_value in matches:
-                violations.append(TemporalViolation(
-                    violation_type=ViolationType.LOOK_AHEAD_SHIFT,
-                    line_number=line_num,
-                    description=f"Look-ahead bias: .shift(-{shift_value}) accesses future data",
-                    severity='critical',
-                    code_snippet=line.strip()
-                ))
-
-        return violations
-
-    def _check_date_ranges(
+    def _violations_from(
         self,
-        code: str,
+        analysis: CodeAnalysis,
         query_date: datetime
     ) -> List[TemporalViolation]:
         """
-        Detect date ranges exceeding query_date.
-
-        Pattern: yf.download('SPY', end='2025-12-31')  # VIOLATION if query_date < 2025-12-31
-        """
-        violations = []
-
-        # Regex: end='YYYY-MM-DD' or end="YYYY-MM-DD"
-        date_pattern = re.compile(r"end\s*=\s*['\"](\d{4}-\d{2}-\d{2})['\"]")
-
-        for line_num, line in enumerate(code.split('\n'), start=1):
-            matches = date_pattern.findall(line)
-            for date_str in matches:
-                try:
-                    end_date = datetime.fromisoformat(date_str)
-
-                    # Compare dates (ignore timezone for simplicity)
-                    if end_date.replace(tzinfo=None) > query_date.replace(tzinfo=None):
-                        violations.append(TemporalViolation(
-                            violation_type=ViolationType.FUTURE_DATE_ACCESS,
-                            line_number=line_num,
-                            description=f"Future date access: end='{date_str}' is after query_date ({query_date.date()})",
-                            severity='critical',
-                            code_snippet=line.strip()
-                        ))
-                except ValueError:
-                    # Invalid date format, skip
-                    pass
+        Temporal violations from a cached code analysis.
 
-        return violations
-
-    def _check_iloc_patterns(self, code: str) -> List[TemporalViolation]:
+        Look-ahead shifts, suspicious iloc and centered rolling come from the
+        TemporalVisitor; end dates are compared against query_date here, since
+        the analysis is shared across query dates.
         """
-        Detect suspicious df.iloc[-1] usage.
-
-        Pattern: df.iloc[-1]  # WARNING: Might be future data
-        Safe:    df[df.index <= date].iloc[-1]  # OK: Filtered first
-        """
-        violations = []
-
-        # Regex: .iloc[-N] or .iloc[- N]
-        iloc_pattern = re.compile(r'\.iloc\s*\[\s*-\s*\d+\s*\]')
-
-        # Heuristic: Check if date filtering appears before iloc in code
-        has_date_filter = bool(re.search(r'df\[.*<=.*\]|df\.loc\[.*<=.*\]', code))
-
-        for line_num, line in enumerate(code.split('\n'), start=1):
-            if iloc_pattern.search(line):
-                # If no date filtering detected, flag as warning
-                if not has_date_filter:
-                    violations.append(TemporalViolation(
-                        violation_type=ViolationType.SUSPICIOUS_ILOC,
-                        line_number=line_num,
-                        description="Suspicious iloc[-N]: May access future data if DataFrame not filtered by date",
-                        severity='warning',  # Warning, not critical (might be OK)
-                        code_snippet=line.strip()
-                    ))
-
-        return violations
-
-    def _check_rolling_patterns(self, code: str) -> List[TemporalViolation]:
-        """
-        Detect centered rolling windows.
-
-        Pattern: .rolling(window=10, center=True)  # VIOLATION: Uses future data
-        Valid:   .rolling(window=10)               # OK: Backward only
-        """
-        violations = []
-
-        # Regex: .rolling(..., center=True, ...)
-        rolling_pattern = re.compile(r'\.rolling\([^)]*center\s*=\s*True[^)]*\)')
-
-        for line_num, line in enumerate(code.split('\n'), start=1):
-            if rolling_pattern.search(line):
+        violations = [self._from_finding(f) for f in analysis.of_kind(ViolationType.LOOK_AHEAD_SHIFT.value)]
+
+        cutoff = query_date.replace(tzinfo=None)
+        for line_number, date_str, snippet in analysis.fact('end_dates', []):
+            try:
+                end_date = datetime.fromisoformat(date_str)
+            except ValueError:
+                continue  # Invalid date format, skip
+            if end_date > cutoff:
                 violations.append(TemporalViolation(
-                    violation_type=ViolationType.CENTERED_ROLLING,
-                    line_number=line_num,
-                    description="Centered rolling window uses future data (center=True)",
+                    violation_type=ViolationType.FUTURE_DATE_ACCESS,
+                    line_number=line_number,
+                    description=f"Future date access: end='{date_str}' is after query_date ({query_date.date()})",
                     severity='critical',
-                    code_snippet=line.strip()
+                    code_snippet=snippet
                 ))
 
+        violations.extend(self._from_finding(f) for f in analysis.of_kind(ViolationType.SUSPICIOUS_ILOC.value))
+        violations.extend(self._from_finding(f) for f in analysis.of_kind(ViolationType.CENTERED_ROLLING.value))
         return violations
 
+    @staticmethod
+    def _from_finding(finding: CodeFinding) -> TemporalViolation:
+        return TemporalViolation(
+            violation_type=ViolationType(finding.kind),
+            line_number=finding.line,
+            description=finding.message,
+            severity=finding.severity,
+            code_snippet=finding.snippet
+        )
+
     def _generate_report(
         self,
         violations: List[TemporalViolation],
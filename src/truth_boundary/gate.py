@@ -5,7 +5,7 @@ Week 2 Day 3: Enforces zero-hallucination principle.
 
 Workflow:
 1. Receive ExecutionResult from VEE
-2. Parse stdout to extract numerical values
+2. Parse the emitted result document (or, failing that, stdout)
 3. Validate execution status
 4. Create immutable VerifiedFact
 5. Store in TimescaleDB (future: Week 3)
@@ -16,13 +16,13 @@ Design principles:
 - Audit trail: code_hash, execution_time, memory_used
 """
 
-import re
 import json
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from typing import Dict, Any, List, Optional
 
+from src.truth_boundary.numeric_extractor import extract_numbers
 from src.vee.sandbox_runner import ExecutionResult
 
 
@@ -98,28 +98,8 @@ class TruthBoundaryGate:
         Returns:
             Dictionary mapping keys to numerical values
         """
-        results = {}
-
-        # Pattern: key: value or key = value or key value
-        # Matches: "correlation: 0.95", "mean = 0.02", "p_value 0.001"
-        pattern = r'([a-zA-Z_][\w\s\-]*?)[\s:=]+(-?\d+\.?\d*(?:[eE][+-]?\d+)?%?)'
-
-        matches = re.findall(pattern, stdout)
-
-        for key, value_str in matches:
-            key_clean = key.strip().replace(' ', '_').replace('-', '_')
-
-            # Remove % if present
-            value_str_clean = value_str.replace('%', '')
-
-            try:
-                value = float(value_str_clean)
-                results[key_clean] = value
-            except ValueError:
-                # Skip invalid numbers
-                continue
-
-        return results
+        # Week 12: Linear-time scan (the old regex backtracked on whitespace)
+        return extract_numbers(stdout)
 
     @staticmethod
     def parse_json_output(stdout: str) -> Dict[str, Any]:
@@ -167,6 +147,25 @@ class TruthBoundaryGate:
 
         return {}
 
+    @staticmethod
+    def parse_result_document(document: str) -> Dict[str, Any]:
+        """
+        Parse the result document published via emit_result() in VEE.
+
+        Exactly one JSON document, so no scanning: malformed JSON raises.
+
+        Args:
+            document: ExecutionResult.result_json
+
+        Returns:
+            Dictionary with parsed values ({} if the document is not an object)
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON
+        """
+        data = json.loads(document)
+        return data if isinstance(data, dict) else {}
+
     def validate(self, exec_result: ExecutionResult) -> ValidationResult:
         """
         Validate execution result and extract numerical values.
@@ -194,8 +193,28 @@ class TruthBoundaryGate:
                 error_message='Execution timed out'
             )
 
-        # Try to parse as JSON first
-        extracted = self.parse_json_output(exec_result.stdout)
+        warnings = []
+        if getattr(exec_result, 'output_truncated', False):
+            warnings.append(
+                f"Output truncated ({exec_result.stdout_bytes} stdout bytes); "
+                "only the tail was inspected"
+            )
+
+        # Week 12: Structured result channel, then JSON in stdout
+        result_json = getattr(exec_result, 'result_json', None)
+        if result_json is not None:
+            try:
+                extracted = self.parse_result_document(result_json)
+            except json.JSONDecodeError as e:
+                return ValidationResult(
+                    is_valid=False,
+                    status='error',
+                    extracted_values={},
+                    error_message=f"Malformed result document: {e}",
+                    warnings=warnings
+                )
+        else:
+            extracted = self.parse_json_output(exec_result.stdout)
 
         # CRITICAL: If JSON extraction found an 'error' key, treat as failure
         if extracted and 'error' in extracted:
@@ -233,7 +252,7 @@ class TruthBoundaryGate:
             status='success',
             extracted_values=extracted,
             error_message=None,
-            warnings=[]
+            warnings=warnings
         )
 
     def validate_batch(
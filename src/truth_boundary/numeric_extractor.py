@@ -0,0 +1,81 @@
+"""
+Linear-time numeric extraction from VEE stdout.
+
+Week 12: Replaces the backtracking regex in
+TruthBoundaryGate.parse_numerical_output.
+
+The legacy pattern
+
+    ([a-zA-Z_][\\w\\s\\-]*?)[\\s:=]+(-?\\d+\\.?\\d*(?:[eE][+-]?\\d+)?%?)
+
+lets the lazy key and the separator both consume whitespace, and findall
+retries it from every character, so a long whitespace run costs O(n^2)
+or worse. This extractor finds the same matches with anchored, precompiled
+scans that never revisit a character more than a constant number of times:
+
+1. Find the next key start ([A-Za-z_]) and the run of key characters
+   ([\\w\\s-]) that follows it.
+2. The key ends at the first separator run ([\\s:=]+) starting inside that
+   run (or right after it) that is immediately followed by a number.
+3. If there is none, no later start inside the run can match either, so
+   scanning resumes after the run.
+
+Formats: "key: value", "key = value", "key value", percentages and
+scientific notation.
+"""
+
+import re
+from typing import Dict, Iterator, Tuple
+
+
+_KEY_START = re.compile(r'[A-Za-z_]')
+_KEY_RUN = re.compile(r'[\w\s\-]*')
+_SEPARATOR = re.compile(r'[\s:=]+')
+_NUMBER = re.compile(r'-?\d+\.?\d*(?:[eE][+-]?\d+)?%?')
+
+
+def iter_numbers(text: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (raw_key, raw_value) pairs in order of appearance.
+
+    Same matches as re.findall with the legacy pattern, in linear time.
+    """
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        start = _KEY_START.search(text, pos)
+        if start is None:
+            return
+        key_start = start.start()
+        run_end = _KEY_RUN.match(text, key_start + 1).end()
+
+        # Separator runs beginning in (key_start, run_end]
+        for sep in _SEPARATOR.finditer(text, key_start + 1, run_end + 1):
+            value_start = _SEPARATOR.match(text, sep.start()).end()
+            number = _NUMBER.match(text, value_start)
+            if number:
+                yield text[key_start:sep.start()], number.group()
+                pos = number.end()
+                break
+        else:
+            pos = run_end
+
+
+def extract_numbers(text: str) -> Dict[str, float]:
+    """
+    Map normalized keys to values ("Mean Return: 2%" -> {'Mean_Return': 2.0}).
+
+    Later occurrences of a key overwrite earlier ones.
+    """
+    results: Dict[str, float] = {}
+
+    for key, value_str in iter_numbers(text):
+        key_clean = key.strip().replace(' ', '_').replace('-', '_')
+        try:
+            results[key_clean] = float(value_str.replace('%', ''))
+        except ValueError:
+            # Skip invalid numbers
+            continue
+
+    return results
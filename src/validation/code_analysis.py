@@ -0,0 +1,788 @@
+"""
+Static analysis of plan code.
+
+Week 12: Single-pass AST analysis shared by TIM, plan validation and plan metrics.
+
+Before this, plan code was scanned many times before execution: CodeBlock
+substring checks, PlanNode.validate_plan substring checks, four TIM regex
+passes and the DSPy metrics' own parse and regexes. Now each code block is
+parsed once and one depth-first walk dispatches every node to all registered
+visitors:
+
+- TemporalVisitor: look-ahead shifts, centered rolling, end dates, iloc[-N]
+- ImportVisitor: top-level imported modules
+- SafetyVisitor: forbidden modules, builtins and sandbox-escape attributes
+- OutputVisitor: output statements, raw number assignments, comment lines
+
+Results are cached by code hash, so the whole pre-execution pipeline costs
+one parse per block.
+
+The walk tracks import aliases and simple constant bindings, which catches
+forms the old regexes missed: `import subprocess as sp; sp.run(...)`,
+`from os import system`, `lag = -5; df.shift(lag)`, `shift(periods=-5)`,
+`rolling(int(n), center=True)`, `END = '2025-12-31'; yf.download(..., end=END)`.
+Code that does not parse falls back to the legacy line-based scan.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import ast
+import hashlib
+import logging
+import os
+import pickle
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+FORBIDDEN_MODULES = frozenset({'os', 'subprocess'})
+FORBIDDEN_BUILTINS = frozenset({'eval', 'exec', 'compile', '__import__', 'open', 'input'})
+# Attribute names used to escape the sandbox through object introspection
+ESCAPE_ATTRIBUTES = frozenset({'__builtins__', '__subclasses__', '__globals__', '__code__'})
+
+LOOKAHEAD_METHODS = ('shift', 'diff', 'pct_change')
+END_DATE_ARGS = ('end', 'end_date')
+
+_DATE_PREFIX = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+_UNKNOWN = object()
+
+
+# ============================================================================
+# Results
+# ============================================================================
+
+@dataclass(frozen=True)
+class CodeFinding:
+    """Single issue found in a code block."""
+
+    kind: str  # e.g. 'look_ahead_shift', 'forbidden'
+    line: Optional[int]
+    message: str
+    severity: str = 'critical'  # 'warning' or 'critical'
+    name: Optional[str] = None  # e.g. 'os.system', 'shift'
+    value: Any = None  # e.g. -5
+    snippet: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CodeAnalysis:
+    """Everything the visitors learned about one code block (shared, do not mutate)."""
+
+    code_hash: str
+    syntax_error: Optional[str]
+    findings: Tuple[CodeFinding, ...]
+    facts: Dict[str, Any]
+
+    @property
+    def parsed(self) -> bool:
+        return self.syntax_error is None
+
+    def of_kind(self, kind: str) -> List[CodeFinding]:
+        return [f for f in self.findings if f.kind == kind]
+
+    def fact(self, name: str, default: Any = None) -> Any:
+        return self.facts.get(name, default)
+
+    def forbidden_names(self) -> List[str]:
+        """Forbidden operations used, in order of first use."""
+        return list(dict.fromkeys(f.name for f in self.of_kind('forbidden')))
+
+
+# ============================================================================
+# Walk state
+# ============================================================================
+
+class AnalysisState:
+    """Per-block state shared by the visitors during one walk."""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.lines = code.split('\n')
+        self.findings: List[CodeFinding] = []
+        self.facts: Dict[str, Any] = {}
+        self.aliases: Dict[str, str] = {}  # local name -> qualified name
+        self.constants: Dict[str, Any] = {}  # name -> literal value
+
+    def snippet(self, line: Optional[int]) -> Optional[str]:
+        if line is None or not 0 < line <= len(self.lines):
+            return None
+        return self.lines[line - 1].strip()
+
+    def add(
+        self,
+        kind: str,
+        line: Optional[int],
+        message: str,
+        severity: str = 'critical',
+        name: Optional[str] = None,
+        value: Any = None
+    ) -> None:
+        self.findings.append(CodeFinding(
+            kind=kind,
+            line=line,
+            message=message,
+            severity=severity,
+            name=name,
+            value=value,
+            snippet=self.snippet(line)
+        ))
+
+    def qualified_name(self, node: ast.AST) -> Optional[str]:
+        """Dotted name of a Name/Attribute chain with import aliases resolved."""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        parts.append(self.aliases.get(node.id, node.id))
+        return '.'.join(reversed(parts))
+
+    def literal(self, node: Optional[ast.AST]) -> Any:
+        """Value of a literal (or a name bound to one), else _UNKNOWN."""
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = self.literal(node.operand)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return -value if isinstance(node.op, ast.USub) else value
+            return _UNKNOWN
+        if isinstance(node, ast.Name):
+            return self.constants.get(node.id, _UNKNOWN)
+        return _UNKNOWN
+
+    def date_literal(self, node: ast.AST) -> Optional[str]:
+        """'YYYY-MM-DD' for a date string or a datetime(...)/date(...) call."""
+        value = self.literal(node)
+        if isinstance(value, str):
+            match = _DATE_PREFIX.match(value)
+            return match.group(1) if match else None
+
+        if isinstance(node, ast.Call) and (self.qualified_name(node.func) or '').split('.')[-1] in ('datetime', 'date'):
+            parts = [self.literal(arg) for arg in node.args[:3]]
+            if len(parts) == 3 and all(isinstance(p, int) for p in parts):
+                try:
+                    return date(*parts).isoformat()
+                except ValueError:
+                    return None
+        return None
+
+
+# ============================================================================
+# Visitors
+# ============================================================================
+
+class AnalysisVisitor:
+    """
+    Collects findings and facts during the shared walk.
+
+    Subclasses define visit_<NodeType>(node, state) methods; the walker calls
+    them for every node of that type (context and operator nodes are not
+    walked; read node.ctx / node.op instead). begin() and finish() run once
+    per block; fallback() replaces the walk when the code does not parse.
+    """
+
+    name = 'visitor'
+
+    def begin(self, state: AnalysisState) -> None:
+        pass
+
+    def finish(self, state: AnalysisState) -> None:
+        pass
+
+    def fallback(self, state: AnalysisState) -> None:
+        pass
+
+
+class TemporalVisitor(AnalysisVisitor):
+    """
+    Look-ahead patterns for TIM.
+
+    End dates are only collected ((line, 'YYYY-MM-DD', snippet) in
+    facts['end_dates']); TIM compares them with each query date.
+    """
+
+    name = 'temporal'
+
+    def begin(self, state: AnalysisState) -> None:
+        state.facts['end_dates'] = []
+        state.facts['has_date_filter'] = False
+        state.facts['negative_iloc_lines'] = []
+
+    def visit_Call(self, node: ast.Call, state: AnalysisState) -> None:
+        func = node.func
+        method = func.attr if isinstance(func, ast.Attribute) else None
+
+        if method in LOOKAHEAD_METHODS:
+            periods = node.args[0] if node.args else self._keyword(node, 'periods')
+            value = state.literal(periods)
+            if isinstance(value, int) and not isinstance(value, bool) and value < 0:
+                state.add(
+                    'look_ahead_shift', node.lineno,
+                    f"Look-ahead bias: .{method}({value}) accesses future data",
+                    name=method, value=value
+                )
+        elif method == 'rolling':
+            if state.literal(self._keyword(node, 'center')) is True:
+                state.add(
+                    'centered_rolling', node.lineno,
+                    "Centered rolling window uses future data (center=True)",
+                    name=method
+                )
+        elif method == 'truncate' and self._keyword(node, 'after') is not None:
+            state.facts['has_date_filter'] = True
+
+        for keyword in node.keywords:
+            if keyword.arg in END_DATE_ARGS:
+                self._record_end(keyword.value, state)
+
+        # yf.download(tickers, start, end)
+        if len(node.args) >= 3 and (state.qualified_name(func) or '').endswith('download'):
+            self._record_end(node.args[2], state)
+
+    def visit_Assign(self, node: ast.Assign, state: AnalysisState) -> None:
+        if any(isinstance(t, ast.Name) and t.id in END_DATE_ARGS for t in node.targets):
+            self._record_end(node.value, state)
+
+    def visit_Subscript(self, node: ast.Subscript, state: AnalysisState) -> None:
+        if not (isinstance(node.value, ast.Attribute) and node.value.attr in ('iloc', 'iat')):
+            return
+        index = node.slice.elts[0] if isinstance(node.slice, ast.Tuple) and node.slice.elts else node.slice
+        value = state.literal(index)
+        if isinstance(value, int) and not isinstance(value, bool) and value < 0:
+            state.facts['negative_iloc_lines'].append(node.lineno)
+
+    def visit_Compare(self, node: ast.Compare, state: AnalysisState) -> None:
+        # df[df.index <= cutoff], mask = df['Date'] < '2024-01-15', ...
+        if not any(isinstance(op, (ast.Lt, ast.LtE)) for op in node.ops):
+            return
+        for operand in [node.left] + node.comparators:
+            if (
+                (isinstance(operand, ast.Attribute) and operand.attr == 'index')
+                or state.date_literal(operand)
+                or (isinstance(operand, ast.Subscript) and 'date' in str(state.literal(operand.slice)).lower())
+            ):
+                state.facts['has_date_filter'] = True
+                return
+
+    def finish(self, state: AnalysisState) -> None:
+        if state.facts['has_date_filter']:
+            return
+        for line in state.facts['negative_iloc_lines']:
+            state.add(
+                'suspicious_iloc', line,
+                "Suspicious iloc[-N]: May access future data if DataFrame not filtered by date",
+                severity='warning'
+            )
+
+    def fallback(self, state: AnalysisState) -> None:
+        shift_pattern = re.compile(r'\.shift\s*\(\s*-\s*(\d+)\s*\)')
+        date_pattern = re.compile(r"end\s*=\s*['\"](\d{4}-\d{2}-\d{2})['\"]")
+        iloc_pattern = re.compile(r'\.iloc\s*\[\s*-\s*\d+\s*\]')
+        rolling_pattern = re.compile(r'\.rolling\([^)]*center\s*=\s*True[^)]*\)')
+        state.facts['has_date_filter'] = bool(re.search(r'df\[.*<=.*\]|df\.loc\[.*<=.*\]', state.code))
+
+        for line_num, line in enumerate(state.lines, start=1):
+            for shift_value in shift_pattern.findall(line):
+                state.add(
+                    'look_ahead_shift', line_num,
+                    f"Look-ahead bias: .shift(-{shift_value}) accesses future data",
+                    name='shift', value=-int(shift_value)
+                )
+            for date_str in date_pattern.findall(line):
+                state.facts['end_dates'].append((line_num, date_str, line.strip()))
+            if iloc_pattern.search(line):
+                state.facts['negative_iloc_lines'].append(line_num)
+            if rolling_pattern.search(line):
+                state.add(
+                    'centered_rolling', line_num,
+                    "Centered rolling window uses future data (center=True)",
+                    name='rolling'
+                )
+
+        self.finish(state)
+
+    @staticmethod
+    def _keyword(node: ast.Call, name: str) -> Optional[ast.AST]:
+        for keyword in node.keywords:
+            if keyword.arg == name:
+                return keyword.value
+        return None
+
+    @staticmethod
+    def _record_end(node: ast.AST, state: AnalysisState) -> None:
+        # `end = '2025-12-31'` ... `end=end` is one bound, reported at the first line
+        date_str = state.date_literal(node)
+        if date_str and all(d != date_str for _, d, _ in state.facts['end_dates']):
+            line = getattr(node, 'lineno', None)
+            state.facts['end_dates'].append((line, date_str, state.snippet(line)))
+
+
+class ImportVisitor(AnalysisVisitor):
+    """Top-level modules imported by the block."""
+
+    name = 'imports'
+
+    def begin(self, state: AnalysisState) -> None:
+        state.facts['imports'] = []
+
+    def visit_Import(self, node: ast.Import, state: AnalysisState) -> None:
+        for alias in node.names:
+            state.facts['imports'].append(alias.name.split('.')[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom, state: AnalysisState) -> None:
+        if node.level == 0 and node.module:
+            state.facts['imports'].append(node.module.split('.')[0])
+
+    def fallback(self, state: AnalysisState) -> None:
+        for line in state.lines:
+            line = line.strip()
+            if line.startswith('import '):
+                match = re.match(r'import\s+(\w+)', line)
+            elif line.startswith('from '):
+                match = re.match(r'from\s+(\w+)', line)
+            else:
+                continue
+            if match:
+                state.facts['imports'].append(match.group(1))
+
+
+class SafetyVisitor(AnalysisVisitor):
+    """Forbidden modules, builtins and sandbox-escape attributes (aliases resolved)."""
+
+    name = 'safety'
+
+    _FALLBACK_TERMS = {
+        'os.': 'os', 'subprocess': 'subprocess', 'eval': 'eval', 'exec': 'exec',
+        '__import__': '__import__', 'open(': 'open', 'input(': 'input',
+    }
+
+    def begin(self, state: AnalysisState) -> None:
+        state.facts['_forbidden_seen'] = set()
+
+    def visit_Import(self, node: ast.Import, state: AnalysisState) -> None:
+        for alias in node.names:
+            if alias.name.split('.')[0] in FORBIDDEN_MODULES:
+                self._forbid(alias.name, node.lineno, state)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom, state: AnalysisState) -> None:
+        module = node.module or ''
+        if node.level == 0 and module.split('.')[0] in FORBIDDEN_MODULES:
+            for alias in node.names:
+                self._forbid(f"{module}.{alias.name}", node.lineno, state)
+        elif module in ('builtins', '__builtin__'):
+            for alias in node.names:
+                if alias.name in FORBIDDEN_BUILTINS:
+                    self._forbid(alias.name, node.lineno, state)
+
+    def visit_Name(self, node: ast.Name, state: AnalysisState) -> None:
+        if isinstance(node.ctx, ast.Load) and node.id in FORBIDDEN_BUILTINS and node.id not in state.aliases:
+            self._forbid(node.id, node.lineno, state)
+
+    def visit_Attribute(self, node: ast.Attribute, state: AnalysisState) -> None:
+        if node.attr in ESCAPE_ATTRIBUTES:
+            self._forbid(node.attr, node.lineno, state)
+            return
+
+        name = state.qualified_name(node)
+        if not name:
+            return
+        root, _, rest = name.partition('.')
+        if root in FORBIDDEN_MODULES:
+            self._forbid(name, node.lineno, state)
+        elif root in ('builtins', '__builtins__') and rest in FORBIDDEN_BUILTINS:
+            self._forbid(rest, node.lineno, state)
+
+    def visit_Call(self, node: ast.Call, state: AnalysisState) -> None:
+        # getattr(builtins, 'eval'), getattr(os, 'system')
+        if isinstance(node.func, ast.Name) and node.func.id == 'getattr' and len(node.args) >= 2:
+            attr = state.literal(node.args[1])
+            if attr in FORBIDDEN_BUILTINS or attr in ESCAPE_ATTRIBUTES:
+                self._forbid(attr, node.lineno, state)
+            elif isinstance(attr, str):
+                target = state.qualified_name(node.args[0]) or ''
+                if target.split('.')[0] in FORBIDDEN_MODULES:
+                    self._forbid(f"{target}.{attr}", node.lineno, state)
+
+    def finish(self, state: AnalysisState) -> None:
+        del state.facts['_forbidden_seen']
+
+    def fallback(self, state: AnalysisState) -> None:
+        for term, name in self._FALLBACK_TERMS.items():
+            if term in state.code:
+                state.add('forbidden', None, f"Forbidden operation '{name}'", name=name)
+        self.finish(state)
+
+    @staticmethod
+    def _forbid(name: str, line: int, state: AnalysisState) -> None:
+        # os.path.join visits os.path.join and os.path: report once per line
+        root = name.split('.')[0]
+        seen = state.facts['_forbidden_seen']
+        if (line, root) in seen and '.' in name:
+            return
+        seen.add((line, root))
+        state.add('forbidden', line, f"Forbidden operation '{name}'", name=name)
+
+
+class OutputVisitor(AnalysisVisitor):
+    """Output statements and code-quality signals for the plan metrics."""
+
+    name = 'output'
+
+    def begin(self, state: AnalysisState) -> None:
+        state.facts['has_output'] = False
+        state.facts['raw_number_lines'] = []
+        state.facts['comment_lines'] = sum(1 for line in state.lines if line.strip().startswith('#'))
+
+    def visit_Call(self, node: ast.Call, state: AnalysisState) -> None:
+        name = state.qualified_name(node.func)
+        if name == 'print' or (name or '').endswith('json.dumps'):
+            state.facts['has_output'] = True
+
+    def visit_Return(self, node: ast.Return, state: AnalysisState) -> None:
+        state.facts['has_output'] = True
+
+    def visit_Assign(self, node: ast.Assign, state: AnalysisState) -> None:
+        # Truth Boundary: `sharpe = 1.42` is a number the LLM made up
+        if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
+            return
+        value = node.value
+        if isinstance(value, ast.UnaryOp) and isinstance(value.op, ast.USub):
+            value = value.operand
+        if isinstance(value, ast.Constant) and type(value.value) in (int, float):
+            state.facts['raw_number_lines'].append(node.lineno)
+
+    def fallback(self, state: AnalysisState) -> None:
+        state.facts['has_output'] = any(k in state.code for k in ('print(', 'return ', 'json.dumps('))
+        pattern = re.compile(r'^\s*\w+\s*=\s*-?\d+\.?\d*\s*$')
+        state.facts['raw_number_lines'] = [
+            n for n, line in enumerate(state.lines, start=1) if pattern.match(line.strip())
+        ]
+
+
+def default_visitors() -> List[AnalysisVisitor]:
+    return [TemporalVisitor(), ImportVisitor(), SafetyVisitor(), OutputVisitor()]
+
+
+# ============================================================================
+# Analyzer
+# ============================================================================
+
+class CodeAnalyzer:
+    """
+    Parses each code block once and runs every visitor in one walk.
+
+    Usage:
+        analysis = get_code_analyzer().analyze(block.code)
+        if analysis.forbidden_names():
+            ...
+    """
+
+    def __init__(self, visitors: Optional[List[AnalysisVisitor]] = None, max_entries: int = 1024):
+        """
+        Args:
+            visitors: Visitors to run (default: default_visitors())
+            max_entries: Cached analyses (least recently used evicted)
+        """
+        self.max_entries = max_entries
+        self._visitors: List[AnalysisVisitor] = []
+        self._dispatch: Dict[str, List[Callable]] = {}
+        self._plans: Dict[type, Tuple] = {}
+        self._cache: "OrderedDict[str, CodeAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.parses = 0
+        self.hits = 0
+
+        for visitor in (visitors if visitors is not None else default_visitors()):
+            self.register(visitor)
+
+    @property
+    def visitors(self) -> List[AnalysisVisitor]:
+        return list(self._visitors)
+
+    def register(self, visitor: AnalysisVisitor) -> None:
+        """Add a visitor (clears the cache: old analyses lack its output)."""
+        with self._lock:
+            self._visitors.append(visitor)
+            for attr in dir(visitor):
+                if attr.startswith('visit_'):
+                    self._dispatch.setdefault(attr[len('visit_'):], []).append(getattr(visitor, attr))
+            self._plans.clear()
+            self._cache.clear()
+
+    def analyze(self, code: str) -> CodeAnalysis:
+        """Analysis of code (cached by code hash)."""
+        code_hash = _code_hash(code)
+
+        with self._lock:
+            cached = self._cache.get(code_hash)
+            if cached is not None:
+                self._cache.move_to_end(code_hash)
+                self.hits += 1
+                return cached
+
+        analysis = self._analyze(code, code_hash)
+
+        with self._lock:
+            self.parses += 1
+            self._cache[code_hash] = analysis
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return analysis
+
+    def analyze_batch(
+        self,
+        codes: Iterable[str],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 256,
+        window: int = 4096,
+        process_threshold: int = 2048
+    ) -> Iterator[CodeAnalysis]:
+        """
+        Analyses of many snippets, yielded lazily in input order.
+
+        The input is consumed in windows. Within a window snippets are
+        deduplicated by hash and cached analyses are reused; when enough
+        distinct uncached snippets remain, they are analyzed in a process
+        pool in chunks. Duplicates yield the same (shared) analysis object.
+
+        Args:
+            codes: Snippets (any iterable; consumed lazily)
+            max_workers: Pool size (default: CPU count; 1 = in-process)
+            chunk_size: Snippets per pool task
+            window: Snippets read ahead of the caller
+            process_threshold: Minimum distinct misses in a window to use
+                the pool (pickling dominates for small windows)
+
+        Yields:
+            CodeAnalysis per input snippet
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and not self._visitors_picklable():
+            logger.warning("Visitors cannot be sent to worker processes; analyzing in-process")
+            workers = 1
+
+        iterator = iter(codes)
+        pool: Optional[ProcessPoolExecutor] = None
+        try:
+            while True:
+                batch = list(islice(iterator, window))
+                if not batch:
+                    return
+
+                hashes = [_code_hash(code) for code in batch]
+                found: Dict[str, CodeAnalysis] = {}
+                missing: Dict[str, str] = {}
+                with self._lock:
+                    for code_hash, code in zip(hashes, batch):
+                        if code_hash in found or code_hash in missing:
+                            self.hits += 1
+                            continue
+                        cached = self._cache.get(code_hash)
+                        if cached is not None:
+                            self._cache.move_to_end(code_hash)
+                            self.hits += 1
+                            found[code_hash] = cached
+                        else:
+                            missing[code_hash] = code
+
+                if missing:
+                    if workers > 1 and len(missing) >= process_threshold:
+                        if pool is None:
+                            pool = ProcessPoolExecutor(
+                                max_workers=workers,
+                                initializer=_init_worker,
+                                initargs=(self._visitors,)
+                            )
+                        items = list(missing.items())
+                        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+                        analyses = [a for chunk in pool.map(_analyze_chunk, chunks) for a in chunk]
+                    else:
+                        analyses = [self._analyze(code, code_hash) for code_hash, code in missing.items()]
+
+                    with self._lock:
+                        self.parses += len(analyses)
+                        for analysis in analyses:
+                            found[analysis.code_hash] = analysis
+                            self._cache[analysis.code_hash] = analysis
+                        while len(self._cache) > self.max_entries:
+                            self._cache.popitem(last=False)
+
+                for code_hash in hashes:
+                    yield found[code_hash]
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def _visitors_picklable(self) -> bool:
+        try:
+            pickle.dumps(self._visitors)
+            return True
+        except Exception:
+            return False
+
+    def _analyze(self, code: str, code_hash: str) -> CodeAnalysis:
+        state = AnalysisState(code)
+        for visitor in self._visitors:
+            visitor.begin(state)
+
+        syntax_error = None
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            syntax_error = str(e)
+            logger.debug(f"Code does not parse, using line-based scan: {e}")
+            for visitor in self._visitors:
+                visitor.fallback(state)
+        else:
+            self._walk(tree, state)
+            for visitor in self._visitors:
+                visitor.finish(state)
+
+        return CodeAnalysis(
+            code_hash=code_hash,
+            syntax_error=syntax_error,
+            findings=tuple(state.findings),
+            facts=state.facts
+        )
+
+    def _walk(self, tree: ast.AST, state: AnalysisState) -> None:
+        """Depth-first in source order, so bindings precede their uses."""
+        plans = self._plans
+        stack = [tree]
+        pop, push, extend = stack.pop, stack.append, stack.extend
+        while stack:
+            node = pop()
+            plan = plans.get(type(node))
+            if plan is None:
+                plan = self._plan(type(node))
+            handlers, fields, binding = plan
+            if fields is None:
+                continue  # Scalar or None inside a list field
+
+            if binding is _BIND_IMPORTS:
+                self._bind_imports(node, state)
+            for handler in handlers:
+                handler(node, state)
+            if binding is _BIND_CONSTANT:
+                self._bind_constant(node, state)
+
+            # Fields are stored reversed, so children pop in source order
+            for name in fields:
+                value = getattr(node, name, None)
+                if value.__class__ is list:
+                    extend(reversed(value))
+                elif value is not None:
+                    push(value)
+
+    def _plan(self, node_type: type) -> Tuple:
+        """(handlers, reversed child fields, binding) for a node type."""
+        if not issubclass(node_type, ast.AST):
+            plan = ((), None, None)
+        else:
+            kind = node_type.__name__
+            binding = None
+            if kind in ('Import', 'ImportFrom'):
+                binding = _BIND_IMPORTS
+            elif kind in ('Assign', 'AnnAssign', 'AugAssign'):
+                binding = _BIND_CONSTANT
+            plan = (tuple(self._dispatch.get(kind, ())), _child_fields(node_type), binding)
+        self._plans[node_type] = plan
+        return plan
+
+    @staticmethod
+    def _bind_imports(node: ast.AST, state: AnalysisState) -> None:
+        for alias in node.names:
+            if isinstance(node, ast.Import):
+                local = alias.asname or alias.name.split('.')[0]
+                state.aliases[local] = alias.name if alias.asname else local
+            elif node.level == 0 and node.module:
+                state.aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+
+    @staticmethod
+    def _bind_constant(node: ast.AST, state: AnalysisState) -> None:
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        value = state.literal(node.value) if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value else _UNKNOWN
+        for target in targets:
+            if not isinstance(target, ast.Name):
+                continue
+            if value is _UNKNOWN or isinstance(node, ast.AugAssign):
+                state.constants.pop(target.id, None)
+            else:
+                state.constants[target.id] = value
+            state.aliases.pop(target.id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.parses + self.hits
+            return {
+                'entries': len(self._cache),
+                'max_entries': self.max_entries,
+                'parses': self.parses,
+                'hits': self.hits,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'visitors': [v.name for v in self._visitors],
+            }
+
+
+# Fields never walked: expression contexts and operators (Load, Store, Add,
+# Lt, ...) are a third of all nodes and are read through their parent
+# (node.ctx, node.op, node.ops); the rest hold plain strings and numbers.
+_SKIPPED_FIELDS = frozenset({
+    'ctx', 'op', 'ops', 'id', 'attr', 'arg', 'name', 'asname', 'module', 'level',
+    'kind', 'type_comment', 'conversion', 'is_async', 'simple', 'tag',
+})
+_BIND_IMPORTS = 'imports'
+_BIND_CONSTANT = 'constant'
+
+
+def _child_fields(node_type: type) -> Tuple[str, ...]:
+    """Fields of node_type that can hold child nodes, reversed."""
+    if node_type in (ast.Constant, ast.MatchSingleton):
+        return ()
+    return tuple(reversed([f for f in node_type._fields if f not in _SKIPPED_FIELDS]))
+
+
+def _code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+# Worker process state for analyze_batch
+_worker_analyzer: Optional[CodeAnalyzer] = None
+
+
+def _init_worker(visitors: List[AnalysisVisitor]) -> None:
+    global _worker_analyzer
+    _worker_analyzer = CodeAnalyzer(visitors, max_entries=0)
+
+
+def _analyze_chunk(items: List[Tuple[str, str]]) -> List[CodeAnalysis]:
+    return [_worker_analyzer._analyze(code, code_hash) for code_hash, code in items]
+
+
+_default_analyzer: Optional[CodeAnalyzer] = None
+_default_lock = threading.Lock()
+
+
+def get_code_analyzer() -> CodeAnalyzer:
+    """Process-wide analyzer shared by TIM, plan validation and plan metrics."""
+    global _default_analyzer
+    with _default_lock:
+        if _default_analyzer is None:
+            _default_analyzer = CodeAnalyzer()
+        return _default_analyzer
+
+
+def analyze_code(code: str) -> CodeAnalysis:
+    """Shortcut for get_code_analyzer().analyze(code)."""
+    return get_code_analyzer().analyze(code)
@@ -12,5 +12,6 @@ Security principles:
 """
 
 from .sandbox_runner import SandboxRunner, ExecutionResult
+from .output_capture import OutputCapture
 
-__all__ = ["SandboxRunner", "ExecutionResult"]
+__all__ = ["SandboxRunner", "ExecutionResult", "OutputCapture"]
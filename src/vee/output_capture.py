@@ -0,0 +1,209 @@
+"""
+Bounded output capture for VEE sandbox runs.
+
+Week 12: Stream container output instead of buffering it.
+
+- Total output is capped; the runner kills the container once it is exceeded
+- Only a bounded tail of stdout/stderr is kept for error reporting
+- Structured results travel on a dedicated channel: a single sentinel-framed
+  stdout line written by emit_result() (see RESULT_PREAMBLE), so the
+  Truth Boundary Gate parses exactly one JSON document
+"""
+
+from collections import deque
+from typing import Deque, Optional
+
+
+RESULT_BEGIN = b"<<<APE_RESULT>>>"
+RESULT_END = b"<<</APE_RESULT>>>"
+
+DEFAULT_MAX_OUTPUT_BYTES = 10 * 1024 * 1024
+DEFAULT_TAIL_BYTES = 64 * 1024
+DEFAULT_MAX_RESULT_BYTES = 1024 * 1024
+
+# Prepended to every sandbox program. emit_result() writes the frame on one
+# line (json.dumps escapes newlines); if the program never calls it, a
+# top-level `result` dict (the PLAN output convention) is published at exit.
+RESULT_PREAMBLE = f'''
+import atexit as _ape_atexit
+import json as _ape_json
+import sys as _ape_sys
+
+_ape_emitted = []
+
+def emit_result(value):
+    """Publish the structured result of this program (once)."""
+    if _ape_emitted:
+        raise RuntimeError("emit_result() may only be called once")
+    payload = _ape_json.dumps(value)
+    _ape_emitted.append(True)
+    _ape_sys.stdout.write("\\n" + {RESULT_BEGIN.decode()!r} + payload + {RESULT_END.decode()!r} + "\\n")
+    _ape_sys.stdout.flush()
+
+def _ape_emit_default():
+    value = globals().get("result")
+    if not _ape_emitted and isinstance(value, dict):
+        try:
+            emit_result(value)
+        except (TypeError, ValueError):
+            pass
+
+_ape_atexit.register(_ape_emit_default)
+'''
+
+
+class _Tail:
+    """Last `limit` bytes of a stream, stored as a chunk deque."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.chunks: Deque[bytes] = deque()
+        self.size = 0
+        self.seen = 0
+
+    @property
+    def dropped(self) -> bool:
+        return self.seen > self.limit
+
+    def append(self, data: bytes) -> None:
+        self.seen += len(data)
+        if not data or self.limit <= 0:
+            return
+        self.chunks.append(data)
+        self.size += len(data)
+        while self.chunks and self.size - len(self.chunks[0]) >= self.limit:
+            self.size -= len(self.chunks.popleft())
+
+    def text(self) -> str:
+        return b"".join(self.chunks)[-self.limit:].decode('utf-8', errors='replace')
+
+
+class OutputCapture:
+    """
+    Incremental stdout/stderr reader with a byte cap.
+
+    Feed it chunks as they arrive (feed_stdout/feed_stderr). Result frames
+    are lifted out of stdout; everything else goes to the bounded tails.
+    Once `limit_exceeded` is set further input is dropped.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        max_result_bytes: int = DEFAULT_MAX_RESULT_BYTES
+    ):
+        """
+        Args:
+            max_bytes: Cap on stdout + stderr bytes read from the program
+            tail_bytes: Bytes of each stream kept for stdout/stderr
+            max_result_bytes: Cap on the result JSON document
+        """
+        self.max_bytes = max_bytes
+        self.max_result_bytes = max_result_bytes
+        self._stdout = _Tail(tail_bytes)
+        self._stderr = _Tail(tail_bytes)
+        self._frame_limit = len(RESULT_BEGIN) + max_result_bytes + len(RESULT_END) + 2
+
+        self.stdout_bytes = 0
+        self.stderr_bytes = 0
+        self.limit_exceeded = False
+        self.result_truncated = False
+        self.result_json: Optional[str] = None
+
+        # stdout line state: a line that may be a frame is held until complete
+        self._pending = b""
+        self._line_start = True
+        self._skip_line = False
+
+    @property
+    def total_bytes(self) -> int:
+        return self.stdout_bytes + self.stderr_bytes
+
+    @property
+    def truncated(self) -> bool:
+        """True if any output was dropped (cap, tail or oversized result)."""
+        return (
+            self.limit_exceeded
+            or self.result_truncated
+            or self._stdout.dropped
+            or self._stderr.dropped
+        )
+
+    def _admit(self, data: bytes) -> bytes:
+        """Trim a chunk to the remaining byte budget."""
+        if self.limit_exceeded:
+            return b""
+        remaining = self.max_bytes - self.total_bytes
+        if len(data) > remaining:
+            self.limit_exceeded = True
+            return data[:max(0, remaining)]
+        return data
+
+    def feed_stderr(self, data: Optional[bytes]) -> None:
+        if not data:
+            return
+        data = self._admit(data)
+        self.stderr_bytes += len(data)
+        self._stderr.append(data)
+
+    def feed_stdout(self, data: Optional[bytes]) -> None:
+        if not data:
+            return
+        data = self._admit(data)
+        self.stdout_bytes += len(data)
+
+        buf = self._pending + data
+        self._pending = b""
+        start = 0
+        while start < len(buf):
+            newline = buf.find(b"\n", start)
+            end = len(buf) if newline < 0 else newline + 1
+            piece = buf[start:end]
+            complete = newline >= 0
+            start = end
+
+            if self._skip_line:
+                # Remainder of an oversized frame
+                self._skip_line = not complete
+            elif self._line_start and (piece.startswith(RESULT_BEGIN) or RESULT_BEGIN.startswith(piece)):
+                if complete:
+                    self._frame_line(piece)
+                elif len(piece) > self._frame_limit:
+                    self.result_truncated = True
+                    self._skip_line = True
+                    self._line_start = False
+                else:
+                    self._pending = piece
+                continue
+            else:
+                self._stdout.append(piece)
+            self._line_start = complete
+
+    def close(self) -> None:
+        """Flush a final unterminated line."""
+        if self._pending:
+            pending, self._pending = self._pending, b""
+            self._frame_line(pending)
+
+    def _frame_line(self, line: bytes) -> None:
+        self._line_start = True
+        body = line.rstrip(b"\r\n")
+        framed = len(body) >= len(RESULT_BEGIN) + len(RESULT_END)
+        if framed and body.startswith(RESULT_BEGIN) and body.endswith(RESULT_END):
+            payload = body[len(RESULT_BEGIN):len(body) - len(RESULT_END)]
+            if len(payload) > self.max_result_bytes:
+                self.result_truncated = True
+                return
+            # Last frame wins, like the last-line rule of the legacy parser
+            self.result_json = payload.decode('utf-8', errors='replace')
+        else:
+            self._stdout.append(line)
+
+    @property
+    def stdout(self) -> str:
+        return self._stdout.text()
+
+    @property
+    def stderr(self) -> str:
+        return self._stderr.text()
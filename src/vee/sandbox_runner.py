@@ -10,16 +10,30 @@ Security Features:
 4. Memory limits (prevents OOM attacks)
 5. No privileged operations
 6. Code hash tracking for audit
+7. Output cap (streamed, bounded tail; kills runaway printers)
 """
 
 import docker
 import hashlib
+import logging
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, UTC
 from typing import Optional, List
 
 from src.temporal.integrity_checker import TemporalIntegrityChecker
+from src.vee.output_capture import (
+    DEFAULT_MAX_OUTPUT_BYTES,
+    DEFAULT_TAIL_BYTES,
+    RESULT_PREAMBLE,
+    OutputCapture,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds to drain the log stream after the container exits
+LOG_DRAIN_TIMEOUT = 5.0
 
 
 @dataclass
@@ -36,6 +50,12 @@ class ExecutionResult:
     code_hash: str  # SHA-256 hash of executed code
     code: str = ""  # Week 5 Day 3: Executed source code for Debate System
 
+    # Week 12: Bounded output capture
+    result_json: Optional[str] = None  # Document published via emit_result()
+    stdout_bytes: int = 0  # Bytes the program wrote (stdout holds only the tail)
+    stderr_bytes: int = 0
+    output_truncated: bool = False
+
 
 class SandboxRunner:
     """
@@ -46,6 +66,7 @@ class SandboxRunner:
     - Container removed after execution
     - Resources limited via Docker
     - Network disabled by default
+    - Output streamed with a byte cap; only a bounded tail is kept
     """
 
     def __init__(
@@ -55,7 +76,9 @@ class SandboxRunner:
         cpu_limit: float = 0.5,
         timeout: int = 30,
         enable_temporal_checks: bool = False,  # NEW: TIM integration
-        query_date: Optional[datetime] = None  # NEW: For temporal validation
+        query_date: Optional[datetime] = None,  # NEW: For temporal validation
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        output_tail_bytes: int = DEFAULT_TAIL_BYTES
     ):
         """
         Initialize sandbox runner.
@@ -67,6 +90,8 @@ class SandboxRunner:
             timeout: Default timeout in seconds
             enable_temporal_checks: Enable Temporal Integrity Module (TIM)
             query_date: Query date for temporal validation (required if TIM enabled)
+            max_output_bytes: Kill the container after this much stdout + stderr
+            output_tail_bytes: Bytes of stdout/stderr kept in ExecutionResult
         """
         self.image = image
         self.memory_limit = memory_limit
@@ -74,6 +99,8 @@ class SandboxRunner:
         self.timeout = timeout
         self.enable_temporal_checks = enable_temporal_checks
         self.query_date = query_date
+        self.max_output_bytes = max_output_bytes
+        self.output_tail_bytes = output_tail_bytes
 
         # Initialize Temporal Integrity Checker (if enabled)
         if enable_temporal_checks:
@@ -166,6 +193,9 @@ builtins.__import__ = restricted_import
 # --- User code below ---
 """ + code
 
+        # Structured result channel (emit_result / top-level `result` dict)
+        code = RESULT_PREAMBLE + code
+
         try:
             # Create container with security restrictions
             container = self.docker_client.containers.run(
@@ -182,6 +212,13 @@ builtins.__import__ = restricted_import
                 cap_drop=['ALL'],  # Drop all capabilities
             )
 
+            # Stream output while the program runs
+            capture = OutputCapture(self.max_output_bytes, self.output_tail_bytes)
+            reader = threading.Thread(
+                target=self._stream_output, args=(container, capture), daemon=True
+            )
+            reader.start()
+
             # Wait for execution with timeout
             try:
                 result = container.wait(timeout=execution_timeout)
@@ -194,9 +231,14 @@ builtins.__import__ = restricted_import
                 status = "timeout"
                 exit_code = -1
 
-            # Get stdout and stderr separately
-            stdout = container.logs(stdout=True, stderr=False).decode('utf-8', errors='replace')
-            stderr = container.logs(stdout=False, stderr=True).decode('utf-8', errors='replace')
+            reader.join(timeout=LOG_DRAIN_TIMEOUT)
+            capture.close()
+
+            stderr = capture.stderr
+            if capture.limit_exceeded:
+                status = "error"
+                exit_code = -3  # Special code for output limit
+                stderr += f"\nOUTPUT LIMIT EXCEEDED: more than {self.max_output_bytes} bytes"
 
             # Get memory stats
             stats = container.stats(stream=False)
@@ -210,13 +252,17 @@ builtins.__import__ = restricted_import
             return ExecutionResult(
                 status=status,
                 exit_code=exit_code,
-                stdout=stdout,
+                stdout=capture.stdout,
                 stderr=stderr,
                 duration_ms=duration_ms,
                 memory_used_mb=memory_used_mb,
                 executed_at=executed_at,
                 code_hash=code_hash,
-                code=original_code
+                code=original_code,
+                result_json=capture.result_json,
+                stdout_bytes=capture.stdout_bytes,
+                stderr_bytes=capture.stderr_bytes,
+                output_truncated=capture.truncated
             )
 
         except Exception as e:
@@ -235,6 +281,21 @@ builtins.__import__ = restricted_import
                 code=original_code
             )
 
+    @staticmethod
+    def _stream_output(container, capture: OutputCapture) -> None:
+        """Feed demultiplexed container output to capture; kill on cap."""
+        try:
+            stream = container.attach(stdout=True, stderr=True, stream=True, logs=True, demux=True)
+            for stdout_chunk, stderr_chunk in stream:
+                capture.feed_stdout(stdout_chunk)
+                capture.feed_stderr(stderr_chunk)
+                if capture.limit_exceeded:
+                    container.kill()
+                    break
+        except Exception as e:
+            # Container removed or killed mid-stream; keep what was read
+            logger.debug(f"Output stream ended: {e}")
+
     def get_active_containers(self) -> List[str]:
         """
         Get list of active container IDs.
@@ -0,0 +1,101 @@
+"""
+Unit tests for speculative market data prefetch.
+
+Week 12: Prefetch from raw query text before PLAN completes.
+"""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from src.adapters.market_data_prefetcher import MarketDataPrefetcher, extract_prefetch_hints
+
+
+TODAY = date(2025, 6, 15)
+
+
+@pytest.fixture
+def adapter():
+    """Adapter returning daily closes for whatever window is requested."""
+    adapter = MagicMock()
+
+    def fetch(ticker, start_date, end_date, interval='1d'):
+        index = pd.date_range(start_date, end_date, freq='D', inclusive='left')
+        return pd.DataFrame({"Close": range(len(index))}, index=index)
+
+    adapter.fetch_ohlcv.side_effect = fetch
+    return adapter
+
+
+class TestExtractPrefetchHints:
+    """Ticker and date window extraction from query text."""
+
+    def test_filters_finance_acronyms(self):
+        hints = extract_prefetch_hints("Compare the PE and EPS of AAPL vs MSFT", today=TODAY)
+        assert hints.tickers == ["AAPL", "MSFT"]
+
+    def test_explicit_years(self):
+        hints = extract_prefetch_hints("SPY Sharpe ratio for 2021 to 2023", today=TODAY)
+        assert (hints.start_date, hints.end_date) == ("2021-01-01", "2024-01-01")
+
+    def test_lookback_window_has_slack(self):
+        hints = extract_prefetch_hints("TSLA volatility over the last 2 years", today=TODAY)
+        assert hints.start_date <= "2023-06-15"
+        assert hints.end_date == "2025-06-16"
+
+    def test_default_window(self):
+        hints = extract_prefetch_hints("Beta of NVDA", today=TODAY)
+        assert hints.start_date == "2020-01-01"
+
+    def test_caps_ticker_count(self):
+        hints = extract_prefetch_hints("AA BB CC DD EE FF GG", today=TODAY, max_tickers=3)
+        assert hints.tickers == ["AA", "BB", "CC"]
+
+
+class TestSpeculativePrefetch:
+    """speculate() + get() covering-window reuse and hit/waste stats."""
+
+    def test_plan_range_inside_window_is_served_by_slicing(self, adapter):
+        prefetcher = MarketDataPrefetcher(adapter)
+        prefetcher.speculate("Correlation of SPY and QQQ in 2023", today=TODAY)
+
+        df = prefetcher.get("SPY", "2023-03-01", "2023-04-01", timeout=5)
+
+        assert df.index.min() == pd.Timestamp("2023-03-01")
+        assert df.index.max() == pd.Timestamp("2023-03-31")
+        # Only the speculative window was ever downloaded
+        assert {c.args[1:3] for c in adapter.fetch_ohlcv.call_args_list} == {("2023-01-01", "2024-01-01")}
+        prefetcher.shutdown()
+
+    def test_range_outside_window_is_a_miss(self, adapter):
+        prefetcher = MarketDataPrefetcher(adapter)
+        prefetcher.speculate("SPY returns in 2023", today=TODAY)
+
+        assert prefetcher.get("SPY", "2022-06-01", "2023-06-01", timeout=5) is None
+        prefetcher.shutdown()
+
+    def test_hit_and_waste_ratios(self, adapter):
+        prefetcher = MarketDataPrefetcher(adapter)
+        prefetcher.speculate("Compare AAPL and MSFT in 2024", today=TODAY)
+
+        prefetcher.get("AAPL", "2024-01-01", "2024-12-31", timeout=5)
+        prefetcher.get("AAPL", "2024-02-01", "2024-03-01", timeout=5)  # same download
+        stats = prefetcher.get_stats()
+
+        assert stats["speculated"] == 2
+        assert stats["speculative_hits"] == 1
+        assert stats["speculative_hit_ratio"] == pytest.approx(0.5)
+        assert stats["speculative_waste_ratio"] == pytest.approx(0.5)
+        prefetcher.shutdown()
+
+    def test_exact_plan_prefetch_is_not_speculative(self, adapter):
+        prefetcher = MarketDataPrefetcher(adapter)
+        prefetcher.prefetch("SPY", "2023-01-01", "2023-12-31")
+        prefetcher.get("SPY", "2023-01-01", "2023-12-31", timeout=5)
+
+        stats = prefetcher.get_stats()
+        assert stats["speculated"] == 0
+        assert stats["speculative_waste_ratio"] == 0.0
+        prefetcher.shutdown()
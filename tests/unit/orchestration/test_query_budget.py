@@ -0,0 +1,179 @@
+"""
+Unit tests for per-query LLM budgets.
+
+Week 12: Real-time cost/token accounting and enforcement.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.debate.llm_debate import LLMDebateNode
+from src.orchestration.query_budget import (
+    BudgetExceededError,
+    QueryBudget,
+    charge_active_budget,
+    get_active_budget,
+)
+from src.orchestration.universal_llm_client import LLMResponse, UniversalLLMClient
+
+
+def _client(providers, **kwargs):
+    with patch.object(
+        UniversalLLMClient,
+        '_detect_available_providers',
+        return_value={p: MagicMock() for p in providers}
+    ):
+        return UniversalLLMClient(**kwargs)
+
+
+def _response(provider, cost=0.01, input_tokens=1000, output_tokens=500):
+    return LLMResponse(
+        content="{}", provider=provider, model=f"{provider}-model",
+        input_tokens=input_tokens, output_tokens=output_tokens, cost=cost
+    )
+
+
+class TestQueryBudget:
+    """Budget arithmetic and thresholds."""
+
+    def test_unlimited_budget_only_accumulates(self):
+        budget = QueryBudget()
+        budget.charge("openai", 5.0, 10_000, 10_000)
+
+        assert budget.cost_usd == 5.0
+        assert budget.tokens_used == 20_000
+        assert not budget.should_downgrade
+        assert not budget.exhausted
+
+    def test_thresholds_use_tightest_limit(self):
+        budget = QueryBudget(max_cost_usd=1.0, max_tokens=1000, downgrade_fraction=0.5)
+
+        budget.charge("openai", 0.1, 400, 200)  # 10% cost, 60% tokens
+        assert budget.should_downgrade
+        assert not budget.exhausted
+
+        budget.charge("openai", 0.1, 300, 100)
+        assert budget.exhausted
+        with pytest.raises(BudgetExceededError):
+            budget.check()
+
+    def test_charges_attributed_to_stage(self):
+        budget = QueryBudget()
+        budget.stage = "PLAN"
+        budget.charge("deepseek", 0.001, 100, 50)
+        budget.stage = "DEBATE"
+        budget.charge("openai", 0.01, 200, 100)
+        budget.charge("openai", 0.01, 200, 100)
+
+        by_node = budget.to_dict()["by_node"]
+        assert by_node["PLAN"]["calls"] == 1
+        assert by_node["DEBATE"]["calls"] == 2
+
+    def test_select_provider_downgrades_to_cheapest(self):
+        budget = QueryBudget(max_cost_usd=1.0, downgrade_fraction=0.5)
+        assert budget.select_provider("anthropic") == "anthropic"
+
+        budget.charge("anthropic", 0.6)
+        assert budget.select_provider("anthropic") == "deepseek"
+        assert budget.select_provider("deepseek") == "deepseek"
+        assert budget.actions == ["downgrade UNKNOWN: anthropic -> deepseek"]
+
+    def test_concurrent_charges_are_not_lost(self):
+        budget = QueryBudget()
+
+        def worker():
+            for _ in range(1000):
+                budget.charge("deepseek", 0.001, 1, 1)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert budget.calls == 4000
+        assert budget.tokens_used == 8000
+
+    def test_active_budget_scoped_to_context(self):
+        budget = QueryBudget()
+        charge_active_budget("openai", 1.0)  # No active query: no-op
+
+        with budget.activate():
+            assert get_active_budget() is budget
+            charge_active_budget("openai", 0.5, 10, 5)
+
+        assert get_active_budget() is None
+        assert budget.cost_usd == 0.5
+
+
+class TestBudgetEnforcementInClients:
+    """LLM clients charge and respect the active budget."""
+
+    def test_universal_client_charges_active_budget(self):
+        client = _client(["deepseek"])
+        budget = QueryBudget()
+
+        with patch.object(client, '_call_provider', return_value=_response("deepseek", cost=0.02)):
+            with budget.activate():
+                client.generate("sys", "user")
+
+        assert budget.cost_usd == pytest.approx(0.02)
+        assert budget.tokens_used == 1500
+
+    def test_universal_client_refuses_when_exhausted(self):
+        client = _client(["deepseek"])
+        budget = QueryBudget(max_cost_usd=0.01)
+        budget.charge("deepseek", 0.01)
+
+        with patch.object(client, '_call_provider') as call:
+            with budget.activate(), pytest.raises(BudgetExceededError):
+                client.generate("sys", "user")
+        call.assert_not_called()
+
+    def test_no_fallback_once_failed_call_exhausts_budget(self):
+        """A retry storm across providers stops at the budget."""
+        client = _client(["anthropic", "deepseek"])
+        budget = QueryBudget(max_cost_usd=0.05)
+
+        def expensive_then_invalid(provider, *args, **kwargs):
+            return _response(provider, cost=0.05)
+
+        with patch.object(client, '_call_provider', side_effect=expensive_then_invalid) as call:
+            with budget.activate(), pytest.raises(BudgetExceededError):
+                client.generate("sys", "user", validator=lambda r: False)
+
+        assert call.call_count == 1
+
+    def test_hedging_disabled_when_downgrading(self):
+        client = _client(["anthropic", "deepseek"], enable_hedging=True)
+        budget = QueryBudget(max_cost_usd=1.0, downgrade_fraction=0.5)
+        budget.charge("anthropic", 0.6)
+
+        with patch.object(client, '_generate_hedged') as hedged, \
+                patch.object(client, '_call_provider', return_value=_response("anthropic")):
+            with budget.activate():
+                client.generate("sys", "user")
+
+        hedged.assert_not_called()
+
+    def test_hedged_worker_threads_charge_caller_budget(self):
+        client = _client(["anthropic", "deepseek"], enable_hedging=True)
+        budget = QueryBudget()
+
+        with patch.object(client, '_call_provider', return_value=_response("anthropic", cost=0.03)):
+            with budget.activate():
+                client.generate("sys", "user")
+
+        assert budget.cost_usd >= 0.03
+
+    def test_debate_node_charges_active_budget(self):
+        node = LLMDebateNode(provider="mock")
+        budget = QueryBudget()
+
+        with budget.activate():
+            node._update_stats(input_tokens=300, output_tokens=200, cost=0.004)
+
+        assert budget.cost_usd == pytest.approx(0.004)
+        assert budget.tokens_used == 500
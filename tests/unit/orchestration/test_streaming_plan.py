@@ -0,0 +1,204 @@
+"""
+Unit tests for streaming PLAN generation.
+
+Week 12: Incremental JSON parsing, provider streaming and FETCH prefetch.
+"""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from src.adapters.market_data_prefetcher import MarketDataPrefetcher
+from src.orchestration.nodes.plan_node import PlanNode
+from src.orchestration.schemas.plan_output import EXAMPLE_PLAN
+from src.orchestration.streaming_json import IncrementalJSONParser
+from src.orchestration.universal_llm_client import UniversalLLMClient, LLMResponse
+
+
+def _chunks(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+# ==============================================================================
+# IncrementalJSONParser
+# ==============================================================================
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+def test_parser_matches_json_loads_for_any_chunking(chunk_size):
+    """Parsed object is identical to json.loads regardless of chunk size."""
+    text = json.dumps(EXAMPLE_PLAN, indent=2)
+    parser = IncrementalJSONParser()
+
+    for chunk in _chunks(text, chunk_size):
+        parser.feed(chunk)
+
+    assert parser.complete
+    assert parser.result == json.loads(text)
+
+
+def test_parser_reports_fields_as_they_close():
+    """data_requirements is reported before code_blocks has streamed."""
+    text = json.dumps(EXAMPLE_PLAN)
+    cut = text.index('"code_blocks"') + len('"code_blocks": [{"step')
+    parser = IncrementalJSONParser()
+
+    completed = dict(parser.feed(text[:cut]))
+
+    assert completed["data_requirements"] == EXAMPLE_PLAN["data_requirements"]
+    assert "code_blocks" not in parser.fields
+    assert not parser.complete
+
+
+def test_parser_handles_escapes_and_braces_in_strings():
+    """Braces, commas and escaped quotes inside strings don't confuse depth."""
+    obj = {"code": "d = {'a': [1, 2]}\nprint(\"}\")", "n": 3, "ok": True, "x": None}
+    parser = IncrementalJSONParser()
+
+    for chunk in _chunks(json.dumps(obj), 3):
+        parser.feed(chunk)
+
+    assert parser.result == obj
+
+
+def test_parser_ignores_markdown_fence():
+    """Leading/trailing markdown fences are skipped."""
+    parser = IncrementalJSONParser()
+    parser.feed('```json\n{"a": 1}\n```')
+
+    assert parser.result == {"a": 1}
+
+
+# ==============================================================================
+# UniversalLLMClient.generate_stream
+# ==============================================================================
+
+def _client(providers):
+    with patch.object(
+        UniversalLLMClient,
+        '_detect_available_providers',
+        return_value={p: MagicMock() for p in providers}
+    ):
+        return UniversalLLMClient()
+
+
+def _openai_events(text, chunk_size=5):
+    events = [
+        MagicMock(choices=[MagicMock(delta=MagicMock(content=c))], usage=None)
+        for c in _chunks(text, chunk_size)
+    ]
+    events.append(MagicMock(choices=[], usage=MagicMock(
+        prompt_tokens=100, completion_tokens=50, prompt_cache_hit_tokens=80
+    )))
+    return iter(events)
+
+
+def test_generate_stream_emits_chunks_and_usage():
+    """DeepSeek stream is relayed chunk by chunk with usage from last event."""
+    client = _client(["deepseek"])
+    sdk = client.available_providers["deepseek"]
+    sdk.chat.completions.create.return_value = _openai_events('{"a": 1}')
+
+    chunks = []
+    response = client.generate_stream("sys", "user", json_mode=True, on_chunk=chunks.append)
+
+    assert "".join(chunks) == '{"a": 1}'
+    assert response.content == '{"a": 1}'
+    assert response.input_tokens == 20
+    assert response.cache_read_tokens == 80
+    assert sdk.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+def test_generate_stream_falls_back_before_first_chunk():
+    """A provider failing before emitting anything falls back to the next."""
+    client = _client(["anthropic", "deepseek"])
+    client.available_providers["anthropic"].messages.stream.side_effect = RuntimeError("down")
+    client.available_providers["deepseek"].chat.completions.create.return_value = _openai_events('{}')
+
+    response = client.generate_stream("sys", "user")
+
+    assert response.provider == "deepseek"
+
+
+def test_generate_stream_raises_on_mid_stream_failure():
+    """Partial output already consumed: no silent fallback."""
+    client = _client(["deepseek", "openai"])
+
+    def broken_stream(**kwargs):
+        yield MagicMock(choices=[MagicMock(delta=MagicMock(content='{"a"'))], usage=None)
+        raise RuntimeError("connection reset")
+
+    client.available_providers["deepseek"].chat.completions.create.side_effect = broken_stream
+
+    with pytest.raises(RuntimeError, match="mid-response"):
+        client.generate_stream("sys", "user")
+
+
+# ==============================================================================
+# PlanNode.generate_plan_streaming
+# ==============================================================================
+
+def test_plan_streaming_fires_data_requirements_before_completion():
+    """on_data_requirements fires while code_blocks are still streaming."""
+    with patch.dict(os.environ, {"DEEPSEEK_API_KEY": "test_key"}):
+        node = PlanNode()
+
+    text = json.dumps(EXAMPLE_PLAN)
+    seen = []
+
+    def fake_stream(system_prompt, user_prompt, json_mode, on_chunk, cache_system_prompt):
+        for chunk in _chunks(text, 16):
+            on_chunk(chunk)
+            seen.append(len("".join(_chunks(text, 16)[:len(seen) + 1])))
+        return LLMResponse(content=text, provider="deepseek", model="deepseek-chat")
+
+    fired_at = []
+    progress = []
+    with patch.object(node.client, 'generate_stream', side_effect=fake_stream):
+        plan = node.generate_plan_streaming(
+            "SPY vs QQQ correlation",
+            on_data_requirements=lambda reqs: fired_at.append((len(seen), [r.ticker for r in reqs])),
+            on_progress=progress.append
+        )
+
+    assert fired_at and fired_at[0][1] == ["SPY", "QQQ"]
+    assert fired_at[0][0] < len(_chunks(text, 16))  # before the last chunk
+    assert {p["field"] for p in progress} >= {"data_requirements", "code_blocks"}
+    assert len(plan.code_blocks) == 3
+
+
+# ==============================================================================
+# MarketDataPrefetcher
+# ==============================================================================
+
+def test_prefetcher_deduplicates_and_serves():
+    """Concurrent prefetches of one request download once; get() reuses it."""
+    adapter = MagicMock()
+    adapter.fetch_ohlcv.return_value = pd.DataFrame({"Close": [1.0, 2.0]})
+    prefetcher = MarketDataPrefetcher(adapter)
+
+    prefetcher.prefetch("spy", "2023-01-01", "2023-12-31")
+    prefetcher.prefetch("SPY", "2023-01-01", "2023-12-31")
+    df = prefetcher.get("SPY", "2023-01-01", "2023-12-31", timeout=5)
+
+    assert adapter.fetch_ohlcv.call_count == 1
+    assert list(df["Close"]) == [1.0, 2.0]
+    assert prefetcher.get_stats()["deduplicated"] == 1
+    prefetcher.shutdown()
+
+
+def test_prefetcher_skips_non_ohlcv_requirements():
+    """FRED/economic requirements are left to VEE."""
+    adapter = MagicMock()
+    prefetcher = MarketDataPrefetcher(adapter)
+
+    started = prefetcher.prefetch_requirements(EXAMPLE_PLAN["data_requirements"] + [
+        {"ticker": "DGS3MO", "start_date": "2023-01-01", "end_date": "2023-12-31",
+         "data_type": "economic", "source": "fred"}
+    ])
+
+    assert started == 2
+    assert prefetcher.get("UNKNOWN", "2023-01-01", "2023-12-31") is None
+    prefetcher.shutdown()
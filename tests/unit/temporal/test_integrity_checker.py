@@ -397,3 +397,51 @@ def test_week4_day3_success_criteria(tim, query_date):
     - Detailed reports: ✅
     - TIM functional: ✅
     """)
+
+
+# ==============================================================================
+# Batch Checking (Week 12)
+# ==============================================================================
+
+def _corpus():
+    clean = "df = yf.download('SPY', end='2024-01-10')\nprint(df)"
+    shifted = "df['fut'] = df['Close'].shift(-5)"
+    future = "df = yf.download('SPY', end='2025-12-31')"
+    return [clean, shifted, clean, future, shifted, clean]
+
+
+def test_check_batch_matches_check_code_in_order(query_date):
+    from src.validation.code_analysis import CodeAnalyzer
+
+    analyzer = CodeAnalyzer()
+    tim = TemporalIntegrityChecker(analyzer=analyzer)
+    corpus = _corpus()
+
+    batch = list(tim.check_batch(corpus, query_date=query_date, max_workers=1))
+    single = [TemporalIntegrityChecker(analyzer=CodeAnalyzer()).check_code(c, query_date) for c in corpus]
+
+    assert [r.report for r in batch] == [r.report for r in single]
+    assert analyzer.get_stats()['parses'] == 3  # Deduplicated by hash
+    assert batch[0] is batch[2]
+
+
+def test_check_batch_process_pool(query_date):
+    from src.validation.code_analysis import CodeAnalyzer
+
+    corpus = _corpus() * 5
+    pooled = TemporalIntegrityChecker(analyzer=CodeAnalyzer()).check_batch(
+        iter(corpus), query_date=query_date, max_workers=2, chunk_size=1, process_threshold=1
+    )
+    inline = TemporalIntegrityChecker(analyzer=CodeAnalyzer()).check_batch(
+        corpus, query_date=query_date, max_workers=1
+    )
+
+    assert [r.has_violations for r in pooled] == [r.has_violations for r in inline]
+
+
+def test_check_batch_disabled(query_date):
+    tim_disabled = TemporalIntegrityChecker(enable_checks=False)
+    results = list(tim_disabled.check_batch(_corpus(), query_date=query_date))
+
+    assert len(results) == 6
+    assert not any(r.has_violations for r in results)
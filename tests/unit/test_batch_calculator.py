@@ -0,0 +1,176 @@
+"""
+Unit tests for batched multi-hop calculations.
+
+Week 12: Real VEE-backed execution with cross-ticker batching.
+"""
+
+import contextlib
+import io
+import sys
+import types
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.reasoning.batch_calculator import (
+    BatchMetricCalculator,
+    LocalMetricExecutor,
+    SandboxMetricExecutor,
+    build_batch_program,
+    parse_batch_output,
+    vectorized_metric,
+)
+from src.reasoning.multi_hop import MultiHopOrchestrator, QueryType, SubQuery
+
+
+TICKERS = ["AAPL", "MSFT", "GOOGL", "SPY"]
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(11)
+    index = pd.bdate_range("2025-01-02", periods=200)
+    data = pd.DataFrame(rng.normal(0.0005, 0.015, (200, 4)), index=index, columns=TICKERS)
+    data.iloc[:20, 2] = np.nan  # GOOGL listed later
+    return data
+
+
+def _loader(returns):
+    return MagicMock(side_effect=lambda tickers, start, end: returns.reindex(columns=tickers))
+
+
+def _calc(ticker, metric="sharpe_ratio", **params):
+    return SubQuery(id=f"calc_{ticker}_{metric}_{params.get('end_date', '')}", type=QueryType.CALCULATE, metric=metric,
+                    params={"ticker": ticker, **params})
+
+
+class TestVectorizedMetric:
+    """One pass over the returns matrix matches per-ticker pandas."""
+
+    def test_matches_per_column_computation(self, returns):
+        sharpe = vectorized_metric("sharpe_ratio", returns, rf_rate=0.02)["values"]
+        drawdown = vectorized_metric("max_drawdown", returns)["values"]
+        beta = vectorized_metric("beta", returns, benchmark=returns["SPY"])["values"]
+
+        for ticker in TICKERS:
+            r = returns[ticker].dropna()
+            assert sharpe[ticker] == pytest.approx((r.mean() * 252 - 0.02) / (r.std() * np.sqrt(252)))
+            wealth = (1 + r).cumprod()
+            assert drawdown[ticker] == pytest.approx((wealth / wealth.cummax() - 1).min())
+            b = returns["SPY"][r.index]
+            assert beta[ticker] == pytest.approx(r.cov(b) / b.var())
+
+    def test_ticker_without_data_is_none(self, returns):
+        frame = returns.assign(DELISTED=np.nan)
+        output = vectorized_metric("volatility", frame)
+
+        assert output["values"]["DELISTED"] is None
+        assert output["observations"]["GOOGL"] == 180
+
+
+class TestBatchMetricCalculator:
+    """Batching and splitting."""
+
+    def test_one_run_per_metric_and_window(self, returns):
+        loader = _loader(returns)
+        calculator = BatchMetricCalculator(LocalMetricExecutor(loader), today=lambda: date(2026, 3, 2))
+        sub_queries = [_calc(t) for t in ("AAPL", "MSFT", "GOOGL")] + [
+            _calc("AAPL", metric="volatility"),
+            _calc("MSFT", end_date="2025-06-30"),
+        ]
+
+        results = calculator.calculate(sub_queries)
+
+        assert loader.call_count == 3
+        assert calculator.get_stats()["runs"] == 3
+        assert results["calc_GOOGL_sharpe_ratio_"]["batch_size"] == 3
+        assert results["calc_AAPL_sharpe_ratio_"]["value"] == pytest.approx(
+            vectorized_metric("sharpe_ratio", returns[["AAPL"]])["values"]["AAPL"]
+        )
+
+    def test_unsupported_metric_and_missing_data_are_errors(self, returns):
+        calculator = BatchMetricCalculator(LocalMetricExecutor(_loader(returns)))
+        results = calculator.calculate([_calc("AAPL", metric="alpha"), _calc("ZZZZ")])
+
+        assert "Unsupported metric" in results["calc_AAPL_alpha_"]["error"]
+        assert "No data" in results["calc_ZZZZ_sharpe_ratio_"]["error"]
+
+
+class TestSandboxProgram:
+    """Program shipped to the VEE sandbox."""
+
+    def test_program_computes_all_tickers_with_one_download(self, returns):
+        prices = (1 + returns.fillna(0)).cumprod() * 100
+        prices.iloc[:20, 2] = np.nan
+        download = MagicMock(return_value=pd.concat({"Close": prices}, axis=1))
+        fake_yf = types.SimpleNamespace(download=download)
+
+        code = build_batch_program("beta", ["AAPL", "MSFT", "GOOGL"], "2025-01-01", "2025-12-31", benchmark="SPY")
+        stdout = io.StringIO()
+        with patch.dict(sys.modules, {"yfinance": fake_yf}), contextlib.redirect_stdout(stdout):
+            exec(code, {"__name__": "__main__"})
+
+        assert download.call_count == 1
+        assert download.call_args.args[0] == ["AAPL", "MSFT", "GOOGL", "SPY"]
+        values = parse_batch_output(stdout.getvalue())["values"]
+        daily = prices.pct_change(fill_method=None).iloc[1:]
+        expected = vectorized_metric("beta", daily, benchmark=daily["SPY"])["values"]
+        for ticker in ("AAPL", "MSFT", "GOOGL"):
+            assert values[ticker] == pytest.approx(expected[ticker])
+
+    def test_rejects_values_that_would_be_embedded_in_code(self):
+        with pytest.raises(ValueError, match="ticker"):
+            build_batch_program("volatility", ["AAPL'); import os; ('"], "2025-01-01", "2025-12-31")
+        with pytest.raises(ValueError, match="date"):
+            build_batch_program("volatility", ["AAPL"], "yesterday", "2025-12-31")
+
+    def test_sandbox_failure_raises(self):
+        sandbox = MagicMock()
+        sandbox.execute.return_value = MagicMock(status="timeout", stderr="killed")
+
+        with pytest.raises(RuntimeError, match="timeout"):
+            SandboxMetricExecutor(sandbox).run("volatility", ["AAPL"], "2025-01-01", "2025-12-31")
+
+
+class TestOrchestratorBatching:
+    """Ready CALCULATE sub-queries merged into one run."""
+
+    def test_comparison_query_runs_one_batch(self, returns):
+        loader = _loader(returns)
+        orchestrator = MultiHopOrchestrator(
+            calculator=BatchMetricCalculator(LocalMetricExecutor(loader))
+        )
+
+        result = orchestrator.execute("Compare the Sharpe ratios of AAPL, MSFT and GOOGL")
+
+        assert result.success is True
+        assert loader.call_count == 1
+        calcs = [r for r in result.intermediate_results.values() if r.get("ticker")]
+        assert sorted(r["ticker"] for r in calcs) == ["AAPL", "GOOGL", "MSFT"]
+        assert set(result.final_result["comparison"]) == {"AAPL", "MSFT", "GOOGL"}
+
+    def test_cached_tickers_are_not_recomputed(self, returns):
+        loader = _loader(returns)
+        orchestrator = MultiHopOrchestrator(
+            calculator=BatchMetricCalculator(LocalMetricExecutor(loader))
+        )
+
+        orchestrator.execute("Calculate the Sharpe ratio for AAPL")
+        orchestrator.execute("Compare the Sharpe ratios of AAPL, MSFT and GOOGL")
+
+        assert loader.call_count == 2
+        assert loader.call_args.args[0] == ["MSFT", "GOOGL"]
+
+    def test_failed_batch_fails_its_sub_queries(self):
+        executor = MagicMock()
+        executor.run.side_effect = RuntimeError("VEE unavailable")
+        orchestrator = MultiHopOrchestrator(calculator=BatchMetricCalculator(executor))
+
+        result = orchestrator.execute("Compare the Sharpe ratios of AAPL and MSFT")
+
+        assert result.success is False
+        assert len(result.failed) == 2
+        assert len(result.cancelled) == 1
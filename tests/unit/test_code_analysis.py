@@ -0,0 +1,143 @@
+"""
+Unit tests for single-pass static analysis of plan code.
+
+Week 12: One cached parse per block shared by TIM, plan validation and metrics.
+"""
+
+import json
+from datetime import datetime, UTC
+
+import pytest
+
+from src.orchestration.nodes.plan_node import PlanNode
+from src.orchestration.schemas.plan_output import EXAMPLE_PLAN, AnalysisPlan, CodeBlock
+from src.temporal.integrity_checker import TemporalIntegrityChecker, ViolationType
+from src.validation.code_analysis import AnalysisVisitor, CodeAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    return CodeAnalyzer()
+
+
+class TestTemporalVisitor:
+    """Aliased forms the line regexes missed."""
+
+    @pytest.mark.parametrize("code", [
+        "df['f'] = df['Close'].shift(periods=-5)",
+        "lag = -5\ndf['f'] = df['Close'].shift(lag)",
+        "df['f'] = df['Close'].shift(\n    -5\n)",
+        "df['fwd'] = df['Close'].pct_change(-1)",
+    ])
+    def test_look_ahead_shift(self, code):
+        tim = TemporalIntegrityChecker(analyzer=CodeAnalyzer())
+        result = tim.check_code(code, datetime(2024, 1, 15, tzinfo=UTC))
+
+        assert [v.violation_type for v in result.violations] == [ViolationType.LOOK_AHEAD_SHIFT]
+
+    def test_future_dates_through_bindings_and_positionals(self, analyzer):
+        code = (
+            "from datetime import datetime\n"
+            "END = '2025-12-31'\n"
+            "a = yf.download('SPY', end=END)\n"
+            "b = yf.download('QQQ', '2024-01-01', '2024-06-30')\n"
+            "c = yf.download('IWM', end=datetime(2024, 3, 1))\n"
+        )
+        dates = [d for _, d, _ in analyzer.analyze(code).fact('end_dates')]
+
+        assert dates == ['2025-12-31', '2024-06-30', '2024-03-01']
+
+    def test_centered_rolling_with_nested_call(self, analyzer):
+        analysis = analyzer.analyze("m = df['Close'].rolling(int(n), center=True).mean()")
+        assert len(analysis.of_kind('centered_rolling')) == 1
+
+    def test_iloc_with_mask_filter_is_not_suspicious(self, analyzer):
+        code = "mask = df.index <= cutoff\nlast = df[mask].iloc[-1]"
+        assert analyzer.analyze(code).of_kind('suspicious_iloc') == []
+        assert len(analyzer.analyze("last = df.iloc[-1, 0]").of_kind('suspicious_iloc')) == 1
+
+
+class TestSafetyVisitor:
+    """Forbidden operations with aliases resolved."""
+
+    @pytest.mark.parametrize("code,name", [
+        ("import subprocess as sp\nsp.run(['ls'])", "subprocess"),
+        ("from os import system\nsystem('ls')", "os.system"),
+        ("import builtins\nbuiltins.eval('1')", "eval"),
+        ("f = getattr(__builtins__, 'exec')", "exec"),
+        ("x = ().__class__.__subclasses__()", "__subclasses__"),
+    ])
+    def test_aliased_forms(self, analyzer, code, name):
+        assert name in analyzer.analyze(code).forbidden_names()
+
+    def test_words_in_strings_and_comments_are_not_flagged(self, analyzer):
+        code = "# executed by the evaluator\nlabel = 'subprocess eval'\nprint(label)"
+        assert analyzer.analyze(code).forbidden_names() == []
+
+    def test_code_block_rejects_aliased_import(self):
+        with pytest.raises(ValueError, match="subprocess"):
+            CodeBlock(step_id="s", description="d", code="import subprocess as sp\nsp.run('ls')")
+
+
+class TestOutputAndImports:
+    """Facts used by the plan metrics."""
+
+    def test_facts(self, analyzer):
+        analysis = analyzer.analyze("import pandas as pd, numpy\nsharpe = -1.42\nprint(sharpe)")
+
+        assert analysis.fact('imports') == ['pandas', 'numpy']
+        assert analysis.fact('raw_number_lines') == [2]
+        assert analysis.fact('has_output') is True
+
+    def test_unparseable_code_uses_line_scan(self, analyzer):
+        analysis = analyzer.analyze("import pandas\ndf['f'] = df.shift(-3\nos.system('x')")
+
+        assert not analysis.parsed
+        assert analysis.fact('imports') == ['pandas']
+        assert 'os' in analysis.forbidden_names()
+        assert len(analysis.of_kind('look_ahead_shift')) == 0  # Unbalanced call is not matched
+
+
+class TestAnalyzer:
+    """Caching and registration."""
+
+    @pytest.fixture
+    def shared_analyzer(self, monkeypatch):
+        import src.validation.code_analysis as code_analysis
+
+        analyzer = CodeAnalyzer()
+        monkeypatch.setattr(code_analysis, '_default_analyzer', analyzer)
+        return analyzer
+
+    def test_one_parse_per_block_across_pipeline(self, shared_analyzer):
+        plan = AnalysisPlan(**json.loads(json.dumps(EXAMPLE_PLAN)))
+        PlanNode.validate_plan(None, plan)
+        tim = TemporalIntegrityChecker()
+        for block in plan.code_blocks:
+            tim.check_code(block.code, datetime(2025, 1, 15))
+
+        assert shared_analyzer.get_stats()['parses'] == len(plan.code_blocks)
+
+    def test_plan_metrics_reuse_analysis(self, shared_analyzer):
+        pytest.importorskip("dspy")
+        from src.optimization.metrics import CodeQualityMetric, ExecutabilityMetric
+
+        plan = AnalysisPlan(**json.loads(json.dumps(EXAMPLE_PLAN)))
+        ExecutabilityMetric().evaluate(plan)
+        CodeQualityMetric().evaluate(plan)
+
+        assert shared_analyzer.get_stats()['parses'] == len(plan.code_blocks)
+
+    def test_registered_visitor_runs_in_same_walk(self, analyzer):
+        class LoopVisitor(AnalysisVisitor):
+            name = 'loops'
+
+            def visit_For(self, node, state):
+                state.add('loop', node.lineno, "Python loop", severity='warning')
+
+        analyzer.analyze("for x in y:\n    pass")
+        analyzer.register(LoopVisitor())
+        analysis = analyzer.analyze("for x in y:\n    pass")
+
+        assert [f.line for f in analysis.of_kind('loop')] == [1]
+        assert analyzer.get_stats()['visitors'][-1] == 'loops'
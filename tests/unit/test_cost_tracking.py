@@ -1,6 +1,7 @@
 """Unit tests for cost tracking middleware.
 
 Week 11 Day 4: Tests for CostTracker and cost calculation logic.
+Week 12: Write-behind CostLedger.
 """
 
 import pytest
@@ -8,6 +9,7 @@ import uuid
 from decimal import Decimal
 from unittest.mock import Mock, AsyncMock, patch
 
+from src.api.cost_ledger import CostLedger, CostRecord
 from src.api.cost_tracking import CostTracker, PRICING
 
 
@@ -100,6 +102,33 @@ class TestCostCalculation:
 
         assert cost == Decimal("0.00")
 
+    def test_dated_model_id_resolves_pricing(self):
+        """Dated model ids (as sent to the API) resolve to the base entry."""
+        tracker = CostTracker(db_pool=None, enable_metrics=False)
+
+        cost = tracker.calculate_llm_cost(
+            provider="anthropic",
+            model="claude-sonnet-4-5-20250929",
+            input_tokens=1000,
+            output_tokens=500
+        )
+
+        assert cost == Decimal("0.010500")
+
+    def test_deepseek_cache_hit_cost(self):
+        """DeepSeek cache hits are billed at the cached rate."""
+        tracker = CostTracker(db_pool=None, enable_metrics=False)
+
+        cost = tracker.calculate_llm_cost(
+            provider="deepseek",
+            model="deepseek-chat",
+            input_tokens=0,
+            output_tokens=0,
+            cache_read_tokens=1_000_000
+        )
+
+        assert cost == Decimal("0.014000")
+
     def test_zero_tokens_zero_cost(self):
         """Zero tokens returns $0."""
         tracker = CostTracker(db_pool=None, enable_metrics=False)
@@ -352,11 +381,12 @@ class TestPricingData:
         assert "cache_read" in sonnet_pricing
         assert "cache_write" in sonnet_pricing
 
-        # OpenAI doesn't have cache pricing
+        # OpenAI caches automatically: discounted reads, no write surcharge
         gpt4o_pricing = PRICING["openai"]["gpt-4o"]
         assert "input" in gpt4o_pricing
         assert "output" in gpt4o_pricing
-        assert "cache_read" not in gpt4o_pricing
+        assert "cache_read" in gpt4o_pricing
+        assert "cache_write" not in gpt4o_pricing
 
 
 class TestCostComparisons:
@@ -432,3 +462,145 @@ class TestCostComparisons:
         # Cache read should be 90% cheaper
         savings = 1 - (float(with_cache_cost) / float(no_cache_cost))
         assert 0.89 < savings < 0.91  # ~90% savings
+
+
+class TestCostLedger:
+    """Test write-behind batching, spill recovery and in-memory totals."""
+
+    @pytest.fixture
+    def mock_db_pool(self):
+        """Mock pool whose connection records bulk writes."""
+        pool = Mock()
+        conn = AsyncMock()
+        conn.fetch.return_value = []
+
+        acquire_cm = AsyncMock()
+        acquire_cm.__aenter__ = AsyncMock(return_value=conn)
+        acquire_cm.__aexit__ = AsyncMock(return_value=None)
+
+        pool.acquire = Mock(return_value=acquire_cm)
+        pool.conn = conn
+        return pool
+
+    async def _record(self, tracker, provider="deepseek", model="deepseek-chat", latency_ms=100):
+        return await tracker.record_llm_call(
+            request_id=uuid.uuid4(),
+            endpoint="/api/analyze",
+            http_method="POST",
+            provider=provider,
+            model=model,
+            input_tokens=1_000_000,
+            output_tokens=0,
+            latency_ms=latency_ms
+        )
+
+    @pytest.mark.asyncio
+    async def test_records_buffered_not_inserted(self, mock_db_pool):
+        """record_llm_call does no DB round-trip with a ledger attached."""
+        ledger = CostLedger(mock_db_pool, max_batch=100)
+        tracker = CostTracker(db_pool=mock_db_pool, enable_metrics=False, ledger=ledger)
+
+        for _ in range(5):
+            await self._record(tracker)
+
+        mock_db_pool.acquire.assert_not_called()
+        assert ledger.pending == 5
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_bulk_copy(self, mock_db_pool):
+        """Buffered records go out in a single COPY."""
+        ledger = CostLedger(mock_db_pool)
+        tracker = CostTracker(db_pool=mock_db_pool, enable_metrics=False, ledger=ledger)
+        for _ in range(3):
+            await self._record(tracker)
+
+        written = await ledger.flush()
+
+        assert written == 3
+        copy = mock_db_pool.conn.copy_records_to_table
+        copy.assert_awaited_once()
+        assert len(copy.call_args.kwargs["records"]) == 3
+        assert ledger.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_copy_failure_falls_back_to_executemany(self, mock_db_pool):
+        mock_db_pool.conn.copy_records_to_table.side_effect = Exception("COPY not permitted")
+        ledger = CostLedger(mock_db_pool)
+        ledger.add(CostRecord(request_id=str(uuid.uuid4()), endpoint="/x", http_method="GET",
+                              provider="yfinance", model=None))
+
+        assert await ledger.flush() == 1
+        mock_db_pool.conn.executemany.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_triggers_flush(self, mock_db_pool):
+        ledger = CostLedger(mock_db_pool, max_batch=2)
+        tracker = CostTracker(db_pool=mock_db_pool, enable_metrics=False, ledger=ledger)
+
+        await self._record(tracker)
+        await self._record(tracker)
+        await ledger._pending_flush
+
+        assert ledger.get_stats()["flushed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_records(self, mock_db_pool):
+        mock_db_pool.acquire.side_effect = Exception("Connection lost")
+        ledger = CostLedger(mock_db_pool)
+        tracker = CostTracker(db_pool=mock_db_pool, enable_metrics=False, ledger=ledger)
+        await self._record(tracker)
+
+        assert await ledger.flush() == 0
+        assert ledger.pending == 1
+        assert ledger.get_stats()["flush_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_spill_file_survives_crash(self, mock_db_pool, tmp_path):
+        """Unflushed records are replayed by a new ledger on start()."""
+        spill = str(tmp_path / "costs.jsonl")
+        crashed = CostLedger(None, spill_path=spill)
+        tracker = CostTracker(enable_metrics=False, ledger=crashed)
+        await self._record(tracker)
+        await self._record(tracker)
+
+        recovered = CostLedger(mock_db_pool, spill_path=spill)
+        await recovered.start()
+        try:
+            assert recovered.get_stats()["recovered"] == 2
+            assert await recovered.flush() == 2
+            assert open(spill).read() == ""
+        finally:
+            await recovered.close()
+
+    @pytest.mark.asyncio
+    async def test_today_totals_served_from_memory(self, mock_db_pool):
+        """Current-day summaries don't query the DB."""
+        ledger = CostLedger(mock_db_pool)
+        tracker = CostTracker(db_pool=mock_db_pool, enable_metrics=False, ledger=ledger)
+        await self._record(tracker, latency_ms=100)
+        await self._record(tracker, latency_ms=300)
+        await self._record(tracker, provider="openai", model="gpt-4o", latency_ms=None)
+
+        daily = await tracker.get_daily_costs(days=0)
+        breakdown = await tracker.get_provider_breakdown(today_only=True)
+
+        mock_db_pool.acquire.assert_not_called()
+        assert [r["provider"] for r in daily] == ["openai", "deepseek"]
+        deepseek = next(r for r in breakdown if r["provider"] == "deepseek")
+        assert deepseek["request_count"] == 2
+        assert deepseek["total_cost_usd"] == pytest.approx(0.28)
+        assert deepseek["avg_cost_per_request"] == pytest.approx(0.14)
+        assert deepseek["avg_latency_ms"] == pytest.approx(200)
+
+    @pytest.mark.asyncio
+    async def test_multi_day_query_combines_memory_and_db(self, mock_db_pool):
+        """Earlier days come from the DB, today from memory."""
+        mock_db_pool.conn.fetch.return_value = [{"date": "2026-02-07", "provider": "anthropic"}]
+        ledger = CostLedger(mock_db_pool)
+        tracker = CostTracker(db_pool=mock_db_pool, enable_metrics=False, ledger=ledger)
+        await self._record(tracker)
+
+        rows = await tracker.get_daily_costs(days=7)
+
+        assert [r["provider"] for r in rows] == ["deepseek", "anthropic"]
+        assert "date < CURRENT_DATE" in mock_db_pool.conn.fetch.call_args[0][0]
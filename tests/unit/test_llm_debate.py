@@ -393,3 +393,105 @@ class TestLLMDebateIntegration:
             if len(p.supporting_facts) > 0
         )
         assert perspectives_with_facts >= 2
+
+
+class TestConcurrentDebate:
+    """Tests for concurrent Bull/Bear/Neutral fan-out."""
+
+    @staticmethod
+    def _context():
+        from src.debate.schemas import DebateContext
+
+        return DebateContext(
+            fact_id="fact_concurrent",
+            extracted_values={"metric": "sharpe_ratio", "ticker": "AAPL", "value": 1.5, "year": 2023},
+            source_code="# code",
+            query_text="AAPL Sharpe ratio 2023"
+        )
+
+    def test_generate_perspective_mock(self):
+        """Single perspective generation returns that perspective only."""
+        node = LLMDebateNode(provider="mock")
+        fact = {"metric": "sharpe_ratio", "ticker": "AAPL", "value": 1.5, "year": 2023}
+
+        bear = node.generate_perspective(fact, "bear")
+
+        assert bear.name == "Bear"
+        assert bear.confidence == 0.75
+
+    def test_perspective_prompt_targets_one_side(self):
+        """Perspective prompt asks for exactly one perspective."""
+        builder = DebatePromptBuilder()
+        fact = {"metric": "sharpe_ratio", "ticker": "AAPL", "value": 1.5, "year": 2023}
+
+        prompt = builder.build_perspective_prompt(fact, "neutral")
+
+        assert "ONLY the **Neutral Perspective**" in prompt
+
+    def test_perspectives_run_concurrently_and_stream(self):
+        """Wall-clock time ≈ slowest perspective; each report is streamed."""
+        import time
+        from unittest.mock import patch
+        from src.debate.real_llm_adapter import RealLLMDebateAdapter
+
+        adapter = RealLLMDebateAdapter(provider="mock")
+        original = adapter.llm_node.generate_perspective
+
+        def slow_perspective(fact, perspective):
+            time.sleep(0.3)
+            return original(fact, perspective)
+
+        streamed = []
+        with patch.object(adapter.llm_node, "generate_perspective", side_effect=slow_perspective):
+            started = time.perf_counter()
+            reports, synthesis = adapter.generate_debate_concurrent(
+                self._context(),
+                original_confidence=0.9,
+                on_perspective=lambda r: streamed.append(r.perspective.value)
+            )
+            elapsed = time.perf_counter() - started
+
+        assert [r.perspective.value for r in reports] == ["bull", "bear", "neutral"]
+        assert sorted(streamed) == ["bear", "bull", "neutral"]
+        assert synthesis.fact_id == "fact_concurrent"
+        assert elapsed < 0.8  # serial would be >= 0.9s
+
+    def test_failed_perspective_raises(self):
+        """A missing perspective fails the debate instead of synthesizing 2/3."""
+        from unittest.mock import patch
+        from src.debate.real_llm_adapter import RealLLMDebateAdapter
+
+        adapter = RealLLMDebateAdapter(provider="mock")
+        with patch.object(adapter.llm_node, "generate_perspective", return_value=None):
+            with pytest.raises(ValueError, match="perspective generation failed"):
+                adapter.generate_debate_concurrent(self._context(), original_confidence=0.9)
+
+    def test_per_perspective_providers(self):
+        """Perspectives can be routed to different provider nodes."""
+        from src.debate.real_llm_adapter import RealLLMDebateAdapter
+
+        adapter = RealLLMDebateAdapter(
+            provider="mock",
+            perspective_providers={"bear": "failing_mock"}
+        )
+
+        with pytest.raises(ValueError, match="bear perspective generation failed"):
+            adapter.generate_debate_concurrent(self._context(), original_confidence=0.9)
+
+    @pytest.mark.asyncio
+    async def test_async_entry_point_with_async_callback(self):
+        """generate_debate_async awaits async callbacks inside a running loop."""
+        from src.debate.real_llm_adapter import RealLLMDebateAdapter
+
+        adapter = RealLLMDebateAdapter(provider="mock")
+        streamed = []
+
+        async def on_perspective(report):
+            streamed.append(report.perspective.value)
+
+        reports, _ = await adapter.generate_debate_async(
+            self._context(), original_confidence=0.9, on_perspective=on_perspective
+        )
+
+        assert len(reports) == 3
+        assert len(streamed) == 3
@@ -11,6 +11,10 @@ Tests validate that:
 5. Complex multi-hop queries execute successfully
 """
 
+import threading
+import time
+from unittest.mock import patch
+
 import pytest
 from src.reasoning.multi_hop import (
     QueryDecomposer,
@@ -387,3 +391,130 @@ class TestMultiHopIntegration:
 
         assert result is not None
         assert len(result.intermediate_results) >= 2
+
+
+# ============================================================================
+# Parallel Execution (Week 12)
+# ============================================================================
+
+def _graph(spec):
+    """Build a graph from {id: [dependency ids]}."""
+    graph = DependencyGraph()
+    for sq_id, deps in spec.items():
+        graph.add_node(SubQuery(id=sq_id, type=QueryType.CALCULATE, metric="m",
+                                params={"ticker": sq_id}, dependencies=deps))
+    return graph
+
+
+class TestParallelExecution:
+    """Tests for the dependency-driven concurrent executor."""
+
+    def test_levels_in_single_pass(self):
+        graph = _graph({"A": [], "B": ["A"], "C": [], "D": ["B", "C"], "E": ["A"]})
+
+        assert graph.get_parallel_groups() == [["A", "C"], ["B", "E"], ["D"]]
+
+    def test_long_chain_sorted(self):
+        spec = {"n0": []}
+        spec.update({f"n{i}": [f"n{i - 1}"] for i in range(1, 3000)})
+
+        assert _graph(spec).topological_sort() == [f"n{i}" for i in range(3000)]
+
+    def test_independent_sub_queries_run_concurrently(self):
+        orchestrator = MultiHopOrchestrator(max_workers=2)
+        barrier = threading.Barrier(2, timeout=2)
+
+        def execute(sq, context):
+            barrier.wait()  # Deadlocks (BrokenBarrierError) if run serially
+            return {"value": sq.id}
+
+        with patch.object(orchestrator, '_execute_sub_query', side_effect=execute):
+            results, _, failed, _ = orchestrator._execute_graph(_graph({"A": [], "B": []}))
+
+        assert failed == {}
+        assert set(results) == {"A", "B"}
+
+    def test_dependent_released_before_level_finishes(self):
+        """C needs only B, so it must not wait for the slow A."""
+        orchestrator = MultiHopOrchestrator(max_workers=4)
+        c_done = threading.Event()
+
+        def execute(sq, context):
+            if sq.id == "A":
+                assert c_done.wait(timeout=2)
+            if sq.id == "C":
+                c_done.set()
+            return {"value": sq.id}
+
+        with patch.object(orchestrator, '_execute_sub_query', side_effect=execute):
+            _, _, failed, _ = orchestrator._execute_graph(_graph({"A": [], "B": [], "C": ["B"]}))
+
+        # A only finishes once C has run
+        assert failed == {}
+        assert c_done.is_set()
+
+    def test_failure_cancels_dependents_only(self):
+        orchestrator = MultiHopOrchestrator()
+
+        def execute(sq, context):
+            if sq.id == "A":
+                raise RuntimeError("data source down")
+            return {"value": sq.id}
+
+        graph = _graph({"A": [], "B": ["A"], "C": ["B"], "D": []})
+        with patch.object(orchestrator, '_execute_sub_query', side_effect=execute):
+            results, _, failed, cancelled = orchestrator._execute_graph(graph)
+
+        assert "data source down" in failed["A"]
+        assert cancelled == ["B", "C"]
+        assert set(results) == {"D"}
+
+    def test_sub_query_timeout(self):
+        orchestrator = MultiHopOrchestrator(sub_query_timeout=0.1)
+        release = threading.Event()
+
+        def execute(sq, context):
+            if sq.id == "A":
+                release.wait(timeout=2)
+            return {"value": sq.id}
+
+        start = time.monotonic()
+        with patch.object(orchestrator, '_execute_sub_query', side_effect=execute):
+            _, _, failed, cancelled = orchestrator._execute_graph(_graph({"A": [], "B": ["A"], "C": []}))
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert failed["A"].startswith("TimeoutError")
+        assert cancelled == ["B"]
+        assert elapsed < 1.0
+
+    def test_worker_bound(self):
+        orchestrator = MultiHopOrchestrator(max_workers=2)
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def execute(sq, context):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return {"value": sq.id}
+
+        with patch.object(orchestrator, '_execute_sub_query', side_effect=execute):
+            results, _, _, _ = orchestrator._execute_graph(_graph({f"S{i}": [] for i in range(6)}))
+
+        assert len(results) == 6
+        assert active["max"] == 2
+
+    def test_execute_reports_failed_sub_queries(self):
+        orchestrator = MultiHopOrchestrator()
+
+        with patch.object(orchestrator, '_execute_calculate', side_effect=RuntimeError("boom")):
+            result = orchestrator.execute("Compare the Sharpe ratios of AAPL and MSFT")
+
+        assert result.success is False
+        assert len(result.failed) == 2
+        assert len(result.cancelled) == 1
+        assert "boom" in result.error
@@ -190,3 +190,194 @@ class TestRealDeepSeekIntegration:
             print(f"✅ Plan generated by DeepSeek successfully")
             print(f"   Steps: {len(plan.code_blocks)}")
             print(f"   Confidence: {plan.confidence_level:.2f}")
+
+
+class TestHedgedRequests:
+    """Test hedged (racing) multi-provider requests."""
+
+    @staticmethod
+    def _make_client(latencies, **kwargs):
+        """Client with fake providers whose calls sleep for given latencies."""
+        import time as _time
+
+        def fake_call(provider, system_prompt, user_prompt, json_mode, **kwargs):
+            delay = latencies[provider]
+            if isinstance(delay, Exception):
+                raise delay
+            _time.sleep(delay)
+            return LLMResponse(
+                content='{"ok": true}',
+                provider=provider,
+                model=f"{provider}-model",
+                cost=0.01
+            )
+
+        with patch.object(
+            UniversalLLMClient,
+            '_detect_available_providers',
+            return_value={p: MagicMock() for p in latencies}
+        ):
+            client = UniversalLLMClient(enable_hedging=True, **kwargs)
+        client._call_provider = fake_call
+        return client
+
+    def test_hedge_fires_when_primary_slow(self):
+        """Slow primary is raced by the next provider, which wins."""
+        from src.orchestration.universal_llm_client import HedgeBudget
+
+        client = self._make_client(
+            {"anthropic": 1.0, "deepseek": 0.01},
+            hedge_delay_seconds=0.05,
+            hedge_budget=HedgeBudget(max_hedge_fraction=1.0)
+        )
+        response = client.generate("sys", "user")
+
+        assert response.provider == "deepseek"
+        assert response.hedged is True
+        assert client.hedge_budget.hedged_requests == 1
+
+    def test_no_hedge_when_primary_fast(self):
+        """Fast primary answers before the hedge delay elapses."""
+        client = self._make_client(
+            {"anthropic": 0.01, "deepseek": 0.01},
+            hedge_delay_seconds=1.0
+        )
+        response = client.generate("sys", "user")
+
+        assert response.provider == "anthropic"
+        assert response.hedged is False
+        assert client.hedge_budget.hedged_requests == 0
+
+    def test_invalid_response_loses_race(self):
+        """A response failing the validator does not win."""
+        from src.orchestration.universal_llm_client import HedgeBudget
+
+        client = self._make_client(
+            {"anthropic": 0.01, "deepseek": 0.05},
+            hedge_delay_seconds=5.0,
+            hedge_budget=HedgeBudget(max_hedge_fraction=1.0)
+        )
+        response = client.generate(
+            "sys", "user",
+            validator=lambda r: r.provider != "anthropic"
+        )
+
+        assert response.provider == "deepseek"
+
+    def test_budget_blocks_hedging(self):
+        """Exhausted hedge budget waits for the primary instead of hedging."""
+        from src.orchestration.universal_llm_client import HedgeBudget
+
+        client = self._make_client(
+            {"anthropic": 0.2, "deepseek": 0.01},
+            hedge_delay_seconds=0.01,
+            hedge_budget=HedgeBudget(max_hedge_fraction=0.0)
+        )
+        response = client.generate("sys", "user")
+
+        assert response.provider == "anthropic"
+        assert client.hedge_budget.hedged_requests == 0
+
+    def test_all_providers_fail(self):
+        """RuntimeError when every raced provider fails."""
+        client = self._make_client(
+            {"anthropic": RuntimeError("down"), "deepseek": RuntimeError("down")}
+        )
+        with pytest.raises(RuntimeError, match="All LLM providers failed"):
+            client.generate("sys", "user")
+
+    def test_hedge_delay_adapts_to_p95(self):
+        """Hedge delay follows observed latency once enough samples exist."""
+        client = self._make_client({"anthropic": 0.0, "deepseek": 0.0}, hedge_delay_seconds=9.0)
+        assert client.get_hedge_delay("anthropic") == 9.0
+
+        for i in range(1, 21):
+            client.latency_tracker.record("anthropic", i / 10)
+
+        assert client.get_hedge_delay("anthropic") == pytest.approx(1.9)
+
+
+class TestPromptCaching:
+    """Test provider-side prompt caching and cached-token accounting."""
+
+    @staticmethod
+    def _make_client(provider):
+        with patch.object(
+            UniversalLLMClient,
+            '_detect_available_providers',
+            return_value={provider: MagicMock()}
+        ):
+            return UniversalLLMClient()
+
+    def test_anthropic_system_prompt_marked_cacheable(self):
+        """cache_system_prompt sends the system prompt as a cache_control block."""
+        client = self._make_client("anthropic")
+        sdk = client.available_providers["anthropic"]
+        sdk.messages.create.return_value = MagicMock(
+            content=[MagicMock(text="{}")],
+            usage=MagicMock(
+                input_tokens=100,
+                output_tokens=200,
+                cache_read_input_tokens=3000,
+                cache_creation_input_tokens=0
+            )
+        )
+
+        response = client.generate("static system", "user", cache_system_prompt=True)
+
+        system = sdk.messages.create.call_args.kwargs["system"]
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+        assert response.cache_read_tokens == 3000
+        # 100 * $3 + 200 * $15 + 3000 * $0.30 per MTok
+        assert response.cost == pytest.approx(0.0042)
+
+    def test_anthropic_plain_system_prompt_by_default(self):
+        """Without caching the system prompt is sent as a plain string."""
+        client = self._make_client("anthropic")
+        sdk = client.available_providers["anthropic"]
+        sdk.messages.create.return_value = MagicMock(
+            content=[MagicMock(text="{}")],
+            usage=MagicMock(input_tokens=10, output_tokens=10)
+        )
+
+        response = client.generate("static system", "user")
+
+        assert sdk.messages.create.call_args.kwargs["system"] == "static system"
+        assert response.cache_read_tokens == 0
+
+    def test_openai_cached_tokens_split_from_input(self):
+        """OpenAI prompt_tokens is split into cached and uncached tokens."""
+        client = self._make_client("openai")
+        sdk = client.available_providers["openai"]
+        sdk.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content="{}"))],
+            usage=MagicMock(
+                prompt_tokens=4000,
+                completion_tokens=100,
+                prompt_tokens_details=MagicMock(cached_tokens=3000)
+            )
+        )
+
+        response = client.generate("static system", "user")
+
+        assert response.input_tokens == 1000
+        assert response.cache_read_tokens == 3000
+        stats = client.get_usage_stats()
+        assert stats["cache_hit_ratio"] == pytest.approx(0.75)
+
+    def test_plan_node_requests_prompt_cache(self):
+        """PLAN node asks for its static system prompt to be cached."""
+        with patch.dict(os.environ, {"DEEPSEEK_API_KEY": "test_deepseek_key"}):
+            node = PlanNode(enable_validation=False)
+
+        mock_response = LLMResponse(
+            content='{"query_id": "q1", "user_query": "test", "data_requirements": [], '
+                    '"code_blocks": [], "plan_reasoning": "test", "confidence_level": 0.9, '
+                    '"expected_output_format": "dict"}',
+            provider="deepseek",
+            model="deepseek-chat"
+        )
+        with patch.object(node.client, 'generate', return_value=mock_response) as generate:
+            node.generate_plan("What is SPY Sharpe ratio?")
+
+        assert generate.call_args.kwargs["cache_system_prompt"] is True
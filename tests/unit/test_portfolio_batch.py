@@ -0,0 +1,87 @@
+"""
+Unit tests for batch portfolio optimization.
+
+Week 12: Scenario analysis across many universes and constraint sets.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio.batch import OptimizationProblem, optimize_batch
+from src.portfolio.covariance import CovarianceCache
+from src.portfolio.optimizer import OptimizationConstraints, PortfolioOptimizer
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(3)
+    market = rng.normal(0, 0.01, (252, 1))
+    return pd.DataFrame(
+        rng.normal(0.001, 0.02, (252, 8)) + market,
+        columns=[f"T{i}" for i in range(8)]
+    )
+
+
+def _scenarios(returns):
+    universes = [list(returns.columns[:5]), list(returns.columns[3:])]
+    problems = []
+    for u, tickers in enumerate(universes):
+        for max_weight in (0.3, 1.0):
+            for objective in ("max_sharpe", "min_volatility"):
+                problems.append(OptimizationProblem(
+                    tickers=tickers,
+                    objective=objective,
+                    constraints=OptimizationConstraints(max_weight=max_weight),
+                    rf_rate=0.02,
+                    problem_id=f"u{u}-{objective}-{max_weight}"
+                ))
+    return problems
+
+
+def test_matches_individual_optimizations(returns):
+    problems = _scenarios(returns)
+    report = optimize_batch(returns, problems, max_workers=1, cov_cache=CovarianceCache())
+
+    assert report.n_groups == 2
+    assert [r.problem_id for r in report.results] == [p.problem_id for p in problems]
+    assert report.n_converged == len(problems)
+
+    for problem, result in zip(problems, report.results):
+        optimizer = PortfolioOptimizer(returns[problem.tickers], cov_cache=CovarianceCache())
+        if problem.objective == "max_sharpe":
+            expected = optimizer.max_sharpe_ratio(problem.rf_rate, problem.constraints)
+        else:
+            expected = optimizer.min_volatility(problem.constraints)
+        assert result.portfolio.volatility == pytest.approx(expected.volatility, rel=1e-6)
+        assert result.method in ("closed_form", "active_set", "slsqp")
+        assert result.solve_seconds >= 0
+
+
+def test_failed_problem_does_not_fail_batch(returns):
+    problems = [
+        OptimizationProblem(tickers=["T0", "T1"], objective="min_volatility"),
+        OptimizationProblem(tickers=["MISSING"]),
+        OptimizationProblem(tickers=["T0", "T1"], objective="max_return"),
+        OptimizationProblem(
+            tickers=["T0", "T1"], constraints=OptimizationConstraints(min_weight=0.6)
+        ),
+    ]
+    report = optimize_batch(returns, problems, max_workers=1, cov_cache=CovarianceCache())
+
+    assert report.results[0].converged
+    assert "KeyError" in report.results[1].error
+    assert "Unknown objective" in report.results[2].error
+    assert "Infeasible" in report.results[3].error
+    assert all(r.portfolio is None for r in report.results[1:])
+
+
+def test_process_pool_with_shared_memory(returns):
+    problems = _scenarios(returns)
+    inline = optimize_batch(returns, problems, max_workers=1, cov_cache=CovarianceCache())
+    pooled = optimize_batch(returns, problems, max_workers=2, cov_cache=CovarianceCache(), chunk_size=2)
+
+    assert pooled.workers == 2
+    for a, b in zip(inline.results, pooled.results):
+        assert a.problem_id == b.problem_id
+        assert b.portfolio.weights == pytest.approx(a.portfolio.weights, abs=1e-8)
@@ -0,0 +1,147 @@
+"""
+Unit tests for covariance estimation.
+
+Week 12: Robust estimators and large-universe support.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio.covariance import (
+    CovarianceCache,
+    ReturnMoments,
+    estimate_covariance,
+    ledoit_wolf_shrinkage,
+)
+from src.portfolio.optimizer import PortfolioOptimizer
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(1)
+    market = rng.normal(0, 0.01, (300, 1))
+    return pd.DataFrame(
+        rng.normal(0.0005, 0.02, (300, 15)) + market,
+        index=pd.bdate_range('2024-01-01', periods=300),
+        columns=[f"T{i}" for i in range(15)]
+    )
+
+
+class TestEstimators:
+    """Estimators agree with reference computations."""
+
+    def test_sample_matches_pandas(self, returns):
+        np.testing.assert_allclose(
+            estimate_covariance(returns).values, returns.cov().values * 252, rtol=1e-10
+        )
+
+    def test_sample_with_missing_values_is_pairwise(self, returns):
+        returns.iloc[:10, 0] = np.nan
+        pd.testing.assert_frame_equal(estimate_covariance(returns), returns.cov() * 252)
+
+    def test_ledoit_wolf_matches_reference(self, returns):
+        x = returns.values - returns.values.mean(axis=0)
+        n, p = x.shape
+        sample = x.T @ x / n
+        mu = np.trace(sample) / p
+        delta = np.sum((sample - mu * np.eye(p)) ** 2) / p
+        beta = sum(np.sum((np.outer(row, row) - sample) ** 2) for row in x) / (n * n * p)
+        shrinkage = min(beta, delta) / delta
+
+        shrunk, intensity = ledoit_wolf_shrinkage(ReturnMoments.from_values(returns.values))
+
+        assert intensity == pytest.approx(shrinkage, rel=1e-9)
+        np.testing.assert_allclose(shrunk, (1 - shrinkage) * sample + shrinkage * mu * np.eye(p), rtol=1e-9)
+
+    def test_ewma_matches_pandas(self, returns):
+        expected = returns.ewm(halflife=21).cov(bias=False).loc[returns.index[-1]]
+        np.testing.assert_allclose(
+            estimate_covariance(returns, "ewma", halflife=21).values, expected.values * 252, rtol=1e-8
+        )
+
+    def test_factor_model_keeps_variances_and_is_psd(self, returns):
+        cov = estimate_covariance(returns, "factor", n_factors=2).values
+
+        np.testing.assert_allclose(np.diag(cov), np.diag(returns.cov().values * 252), rtol=1e-10)
+        assert np.linalg.eigvalsh(cov).min() > 0
+
+    def test_unknown_estimator_rejected(self, returns):
+        with pytest.raises(ValueError):
+            estimate_covariance(returns, "robust")
+        with pytest.raises(ValueError):
+            estimate_covariance(returns, "sample", halflife=10)
+
+
+class TestCovarianceCache:
+    """Keyed caching and incremental window updates."""
+
+    def test_same_window_is_a_hit(self, returns):
+        cache = CovarianceCache()
+        first = cache.get(returns.iloc[:200])
+        second = cache.get(returns.iloc[:200].copy())
+
+        assert second is first
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.parametrize("estimator,params", [
+        ("sample", {}),
+        ("ledoit_wolf", {}),
+        ("ewma", {"halflife": 21}),
+        ("factor", {"n_factors": 3}),
+    ])
+    def test_rolling_window_updates_incrementally(self, returns, estimator, params):
+        cache = CovarianceCache()
+        cache.get(returns.iloc[:250], estimator, **params)
+
+        for end in range(251, 301):
+            rolled = cache.get(returns.iloc[end - 250:end], estimator, **params)
+
+        stats = cache.get_stats()
+        assert stats["full_computes"] == 1
+        assert stats["incremental_updates"] == 50
+        np.testing.assert_allclose(
+            rolled.values, estimate_covariance(returns.iloc[50:], estimator, **params).values,
+            rtol=1e-8, atol=1e-14
+        )
+
+    def test_appended_day_extends_window(self, returns):
+        cache = CovarianceCache()
+        cache.get(returns.iloc[:200])
+        extended = cache.get(returns.iloc[:201])
+
+        assert cache.get_stats()["incremental_updates"] == 1
+        np.testing.assert_allclose(extended.values, returns.iloc[:201].cov().values * 252, rtol=1e-9)
+
+    def test_revised_history_forces_full_compute(self, returns):
+        cache = CovarianceCache()
+        cache.get(returns.iloc[:200])
+
+        revised = returns.iloc[:201].copy()
+        revised.iloc[5, 0] += 0.01
+        cache.get(revised)
+
+        assert cache.get_stats()["full_computes"] == 2
+
+    def test_estimator_and_tickers_are_part_of_key(self, returns):
+        cache = CovarianceCache()
+        cache.get(returns)
+        cache.get(returns, "ledoit_wolf")
+        cache.get(returns[returns.columns[:5]])
+
+        assert cache.get_stats()["full_computes"] == 3
+
+    def test_lru_bound(self, returns):
+        cache = CovarianceCache(max_entries=2)
+        for end in (100, 150, 200):
+            cache.get(returns.iloc[:end])
+
+        assert cache.get_stats()["entries"] == 2
+
+    def test_optimizers_share_cache(self, returns):
+        cache = CovarianceCache()
+        first = PortfolioOptimizer(returns, cov_estimator="ledoit_wolf", cov_cache=cache)
+        second = PortfolioOptimizer(returns, cov_estimator="ledoit_wolf", cov_cache=cache)
+
+        assert second.cov_matrix is first.cov_matrix
+        assert second.min_volatility().volatility > 0
@@ -14,6 +14,9 @@ Tests validate that:
 import pytest
 import numpy as np
 import pandas as pd
+from unittest.mock import patch
+
+import src.portfolio.optimizer as optimizer_module
 from src.portfolio.optimizer import (
     Portfolio,
     OptimizationConstraints,
@@ -289,6 +292,86 @@ class TestPortfolioOptimizer:
         assert sum(portfolio.weights.values()) <= 1.0 + 1e-4
 
 
+# ============================================================================
+# Solver Engine (Week 12)
+# ============================================================================
+
+class TestSolverEngine:
+    """Closed-form / active-set solutions agree with SLSQP."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(7)
+        market = rng.normal(0, 0.01, (500, 1))
+        self.returns = pd.DataFrame(
+            rng.normal(0.003, 0.02, (500, 12)) + market,
+            columns=[f"A{i}" for i in range(12)]
+        )
+        self.optimizer = PortfolioOptimizer(self.returns)
+
+    def _slsqp_min_vol(self, constraints, target_return=None):
+        opt = self.optimizer
+        result = opt._solve_slsqp(opt._volatility_with_grad, opt._equal_weights(), constraints, target_return)
+        return result.fun
+
+    def test_unbounded_min_vol_matches_closed_form(self):
+        constraints = OptimizationConstraints(min_weight=-5.0, max_weight=5.0)
+        portfolio = self.optimizer.min_volatility(constraints)
+
+        inv_ones = np.linalg.solve(self.optimizer._cov, np.ones(12))
+        expected = inv_ones / inv_ones.sum()
+
+        np.testing.assert_allclose(list(portfolio.weights.values()), expected, atol=1e-10)
+
+    @pytest.mark.parametrize("bounds", [(0.0, 1.0), (0.02, 0.2)])
+    def test_bounded_min_vol_not_worse_than_slsqp(self, bounds):
+        constraints = OptimizationConstraints(min_weight=bounds[0], max_weight=bounds[1])
+        portfolio = self.optimizer.min_volatility(constraints)
+
+        weights = np.array(list(portfolio.weights.values()))
+        assert weights.min() >= bounds[0] - 1e-9
+        assert weights.max() <= bounds[1] + 1e-9
+        assert weights.sum() == pytest.approx(1.0)
+        assert portfolio.volatility <= self._slsqp_min_vol(constraints) + 1e-7
+
+    def test_tangency_portfolio_used_when_within_bounds(self):
+        constraints = OptimizationConstraints(min_weight=-5.0, max_weight=5.0)
+
+        with patch.object(optimizer_module, 'minimize') as minimize:
+            portfolio = self.optimizer.max_sharpe_ratio(rf_rate=0.02, constraints=constraints)
+
+        minimize.assert_not_called()
+        opt = self.optimizer
+        slsqp = opt._solve_slsqp(lambda w: opt._neg_sharpe_with_grad(w, 0.02), opt._equal_weights(), constraints)
+        assert portfolio.sharpe_ratio == pytest.approx(-slsqp.fun, rel=1e-5)
+
+    def test_analytic_sharpe_gradient(self):
+        rng = np.random.default_rng(0)
+        w = rng.dirichlet(np.ones(12))
+        _, gradient = self.optimizer._neg_sharpe_with_grad(w, 0.02)
+
+        eps = 1e-7
+        numeric = np.array([
+            (self.optimizer._neg_sharpe_with_grad(w + eps * e, 0.02)[0]
+             - self.optimizer._neg_sharpe_with_grad(w - eps * e, 0.02)[0]) / (2 * eps)
+            for e in np.eye(12)
+        ])
+        np.testing.assert_allclose(gradient, numeric, rtol=1e-4, atol=1e-6)
+
+    def test_frontier_points_optimal_without_slsqp(self):
+        """Bounded frontier is traced by KKT solves, and matches SLSQP."""
+        constraints = OptimizationConstraints(min_weight=0.0, max_weight=0.25)
+
+        with patch.object(optimizer_module, 'minimize', wraps=optimizer_module.minimize) as minimize:
+            frontier = self.optimizer.efficient_frontier(n_points=15, rf_rate=0.02, constraints=constraints)
+            frontier_calls = minimize.call_count
+
+        # Only the bounded max Sharpe endpoint may need SLSQP
+        assert frontier_calls <= 1
+        assert len(frontier) == 15
+        for portfolio in frontier[::4]:
+            assert portfolio.volatility <= self._slsqp_min_vol(constraints, portfolio.expected_return) + 1e-6
+
+
 # ============================================================================
 # Integration Tests
 # ============================================================================
@@ -0,0 +1,162 @@
+"""
+Unit tests for the multi-hop sub-query cache.
+
+Week 12: Bounded, TTL-aware and shareable sub-query cache.
+"""
+
+import threading
+import time
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.reasoning.multi_hop import MultiHopOrchestrator
+from src.reasoning.subquery_cache import (
+    LocalSharedBackend,
+    RedisCacheBackend,
+    SubQueryCache,
+)
+
+
+def _cache(**kwargs):
+    return SubQueryCache(today=lambda: date(2026, 3, 2), **kwargs)
+
+
+class TestKeys:
+    """Cache keys."""
+
+    def test_query_text_is_not_part_of_key(self):
+        cache = _cache()
+        a = cache.make_key("calculate", "sharpe_ratio", {"ticker": "AAPL", "query": "Sharpe of AAPL?"})
+        b = cache.make_key("calculate", "sharpe_ratio", {"ticker": "AAPL", "query": "Compare AAPL and MSFT"})
+        assert a == b
+
+    def test_as_of_date_is_part_of_key(self):
+        today = date(2026, 3, 2)
+        cache = SubQueryCache(today=lambda: today)
+        key_today = cache.make_key("calculate", "beta", {"ticker": "AAPL"})
+
+        today = date(2026, 3, 3)
+        assert cache.make_key("calculate", "beta", {"ticker": "AAPL"}) != key_today
+        assert "2025-12-31" in cache.make_key("calculate", "beta", {"ticker": "AAPL", "end_date": "2025-12-31"})
+
+    def test_historical_results_live_longer(self):
+        cache = _cache(ttl_seconds=60, historical_ttl_seconds=3600)
+        assert cache.ttl_for({"ticker": "AAPL"}) == 60
+        assert cache.ttl_for({"ticker": "AAPL", "end_date": "2025-12-31"}) == 3600
+
+
+class TestEviction:
+    """Size and TTL bounds."""
+
+    def test_lru_bound(self):
+        cache = _cache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.get_or_compute(key, lambda: {"value": 1})
+
+        assert len(cache) == 2
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        cache = _cache()
+        compute = MagicMock(return_value={"value": 1})
+
+        cache.get_or_compute("k", compute, ttl_seconds=0.05)
+        cache.get_or_compute("k", compute, ttl_seconds=0.05)
+        time.sleep(0.06)
+        cache.get_or_compute("k", compute, ttl_seconds=0.05)
+
+        assert compute.call_count == 2
+
+    def test_error_results_not_cached(self):
+        cache = _cache()
+        compute = MagicMock(return_value={"error": "no data"})
+
+        cache.get_or_compute("k", compute)
+        cache.get_or_compute("k", compute)
+
+        assert compute.call_count == 2
+        assert len(cache) == 0
+
+
+class TestSingleFlight:
+    """Concurrent identical sub-queries."""
+
+    def test_concurrent_callers_compute_once(self):
+        cache = _cache()
+        calls = []
+        gate = threading.Event()
+
+        def compute():
+            calls.append(1)
+            gate.wait(timeout=2)
+            return {"value": 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [{"value": 42}] * 5
+        assert cache.get_stats()["coalesced"] == 4
+
+    def test_waiters_see_leader_exception(self):
+        cache = _cache()
+        gate = threading.Event()
+        errors = []
+
+        def compute():
+            gate.wait(timeout=2)
+            raise RuntimeError("fetch failed")
+
+        def call():
+            try:
+                cache.get_or_compute("k", compute)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+
+        assert errors == ["fetch failed"] * 3
+
+
+class TestSharedBackend:
+    """Reuse across orchestrators."""
+
+    def test_orchestrators_share_per_ticker_calculations(self):
+        shared = LocalSharedBackend()
+        first = MultiHopOrchestrator(cache=SubQueryCache(shared=shared))
+        second = MultiHopOrchestrator(cache=SubQueryCache(shared=shared))
+
+        first.execute("Calculate the Sharpe ratio for AAPL")
+        with patch.object(second, '_execute_calculate', wraps=second._execute_calculate) as calculate:
+            result = second.execute("Compare the Sharpe ratios of AAPL and MSFT")
+
+        assert result.success is True
+        assert [c.args[0].params["ticker"] for c in calculate.call_args_list] == ["MSFT"]
+        assert second.cache.get_stats()["shared_hits"] == 1
+
+    def test_redis_backend_uses_ttl_and_degrades_on_errors(self):
+        client = MagicMock()
+        backend = RedisCacheBackend(client=client)
+
+        backend.set("k", '{"value": 1}', ttl_seconds=90.5)
+        client.set.assert_called_once_with("k", '{"value": 1}', ex=90)
+
+        client.get.side_effect = ConnectionError("down")
+        assert backend.get("k") is None
@@ -0,0 +1,207 @@
+"""
+Unit tests for WebSocket fan-out.
+
+Week 12: Per-connection outbound queues, coalescing, slow-consumer eviction,
+cross-replica pub/sub.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.api.websocket import ConnectionManager, StatusMessage
+from src.api.ws_pubsub import LocalBroker, LocalPubSub, QueryEvent
+
+
+class FakeWebSocket:
+    """Records sent payloads; can be paused to simulate a slow client."""
+
+    def __init__(self, paused: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._gate = asyncio.Event()
+        if not paused:
+            self._gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        await self._gate.wait()
+        self.sent.append(payload)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+    def resume(self):
+        self._gate.set()
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def _status(query_id: str, progress: float) -> str:
+    return StatusMessage(query_id=query_id, status="running", progress=progress).to_json()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others():
+    """A stalled socket must not delay delivery to other subscribers."""
+    manager = ConnectionManager()
+    slow, fast = FakeWebSocket(paused=True), FakeWebSocket()
+    await manager.connect(slow, "slow")
+    await manager.connect(fast, "fast")
+    await manager.subscribe("slow", "q1")
+    await manager.subscribe("fast", "q1")
+
+    await asyncio.wait_for(manager.broadcast_to_query_subscribers('{"n": 1}', "q1"), timeout=1)
+    await _settle()
+
+    assert fast.sent == ['{"n": 1}']
+    assert slow.sent == []
+
+    slow.resume()
+    await _settle()
+    assert slow.sent == ['{"n": 1}']
+
+
+@pytest.mark.asyncio
+async def test_payload_shared_across_recipients():
+    """Every recipient gets the very same serialized string object."""
+    manager = ConnectionManager()
+    sockets = [FakeWebSocket() for _ in range(3)]
+    for i, ws in enumerate(sockets):
+        await manager.connect(ws, f"c{i}")
+
+    payload = json.dumps({"type": "announcement"})
+    await manager.broadcast_to_all(payload)
+    await _settle()
+
+    assert all(ws.sent[0] is payload for ws in sockets)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_coalesces_status_updates():
+    """Overflowing status updates keep only the latest progress per query."""
+    manager = ConnectionManager(max_queue_size=3)
+    ws = FakeWebSocket(paused=True)
+    await manager.connect(ws, "c1")
+    await manager.subscribe("c1", "q1")
+    await _settle()  # Writer is now blocked on the paused socket
+
+    for i in range(10):
+        await manager.broadcast_to_query_subscribers(
+            _status("q1", i / 10), "q1", coalesce_key="status:q1"
+        )
+
+    assert "c1" in manager.active_connections
+    assert manager.get_stats()["coalesced_messages"] > 0
+
+    ws.resume()
+    await _settle()
+    assert json.loads(ws.sent[-1])["progress"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected():
+    """Non-coalescable backlog beyond the bound drops the client."""
+    manager = ConnectionManager(max_queue_size=3)
+    ws = FakeWebSocket(paused=True)
+    await manager.connect(ws, "c1")
+    await manager.subscribe("c1", "q1")
+
+    for i in range(5):
+        await manager.broadcast_to_query_subscribers(f'{{"n": {i}}}', "q1")
+
+    assert "c1" not in manager.active_connections
+    assert "q1" not in manager.subscriptions
+    assert ws.closed_with == 1013
+    assert manager.get_stats()["slow_consumer_disconnects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_send_error_disconnects():
+    """A socket raising on send is cleaned up by its writer task."""
+    manager = ConnectionManager()
+
+    class BrokenWebSocket(FakeWebSocket):
+        async def send_text(self, payload):
+            raise RuntimeError("broken pipe")
+
+    await manager.connect(BrokenWebSocket(), "c1")
+    await manager.send_personal_message('{"n": 1}', "c1")
+    await _settle()
+
+    assert "c1" not in manager.active_connections
+
+
+# ==============================================================================
+# Cross-replica pub/sub (Week 12)
+# ==============================================================================
+
+async def _replicas(count: int = 2):
+    broker = LocalBroker()
+    managers = []
+    for i in range(count):
+        manager = ConnectionManager()
+        await manager.attach_pubsub(LocalPubSub(broker, replica_id=f"pod-{i}"))
+        managers.append(manager)
+    return broker, managers
+
+
+@pytest.mark.asyncio
+async def test_event_reaches_subscriber_on_other_replica():
+    """Query running on pod-0 updates a client connected to pod-1."""
+    _, (pod_a, pod_b) = await _replicas()
+    ws = FakeWebSocket()
+    await pod_b.connect(ws, "client")
+    await pod_b.subscribe("client", "q1")
+
+    await pod_a.publish(_status("q1", 0.5), "q1", coalesce_key="status:q1")
+    await _settle()
+
+    assert json.loads(ws.sent[0])["progress"] == 0.5
+    stats = pod_b.get_stats()
+    assert stats["remote_events_received"] == 1
+    assert stats["delivery_lag_p95_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_replica_subscribes_only_to_followed_queries():
+    """Backbone subscriptions track local interest and are released."""
+    broker, (pod_a, pod_b) = await _replicas()
+    await pod_b.connect(FakeWebSocket(), "c1")
+    await pod_b.subscribe("c1", "q1")
+
+    assert pod_b.pubsub.subscribed == {"q1"}
+    assert pod_a.pubsub.subscribed == set()
+
+    await pod_b.disconnect("c1")
+    assert pod_b.pubsub.subscribed == set()
+    assert broker._subscribers == {}
+
+
+@pytest.mark.asyncio
+async def test_local_subscriber_not_delivered_twice():
+    """The publishing replica serves its own sockets once, not via the echo."""
+    _, (pod_a, pod_b) = await _replicas()
+    local, remote = FakeWebSocket(), FakeWebSocket()
+    await pod_a.connect(local, "local")
+    await pod_a.subscribe("local", "q1")
+    await pod_b.connect(remote, "remote")
+    await pod_b.subscribe("remote", "q1")
+
+    await pod_a.publish('{"n": 1}', "q1")
+    await _settle()
+
+    assert local.sent == ['{"n": 1}']
+    assert remote.sent == ['{"n": 1}']
+    assert pod_a.get_stats()["remote_events_received"] == 0
+
+
+def test_query_event_wire_roundtrip():
+    event = QueryEvent(query_id="q1", payload='{"a": 1}', coalesce_key="status:q1", origin="pod-0")
+    assert QueryEvent.from_wire(event.to_wire()) == event
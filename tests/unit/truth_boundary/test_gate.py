@@ -362,3 +362,45 @@ def test_week2_day3_success_criteria(gate):
     - VerifiedFact creation: ✅
     - Batch processing: ✅
     """)
+
+
+# ==============================================================================
+# Week 12: Structured result channel
+# ==============================================================================
+
+def _result(**kwargs):
+    defaults = dict(
+        status='success', exit_code=0, stdout='', stderr='', duration_ms=10,
+        memory_used_mb=1.0, executed_at=datetime.now(UTC).isoformat(), code_hash='abc'
+    )
+    defaults.update(kwargs)
+    return ExecutionResult(**defaults)
+
+
+def test_result_document_preferred_over_stdout(gate):
+    """The emitted document is parsed as-is; stdout is not scanned."""
+    exec_result = _result(
+        stdout='{"sharpe_ratio": 9.99}\nsharpe_ratio: 9.99',
+        result_json='{"sharpe_ratio": 1.42}'
+    )
+
+    validation = gate.validate(exec_result)
+
+    assert validation.is_valid
+    assert validation.extracted_values == {'sharpe_ratio': 1.42}
+
+
+def test_malformed_result_document_is_rejected(gate):
+    validation = gate.validate(_result(result_json='{"sharpe_ratio": 1.4'))
+
+    assert not validation.is_valid
+    assert 'Malformed result document' in validation.error_message
+
+
+def test_truncated_output_warns(gate):
+    validation = gate.validate(_result(
+        stdout='mean: 0.5', stdout_bytes=5_000_000, output_truncated=True
+    ))
+
+    assert validation.is_valid
+    assert validation.warnings and 'truncated' in validation.warnings[0]
@@ -0,0 +1,56 @@
+"""
+Unit tests for the linear-time numeric extractor.
+
+Week 12: Same matches as the legacy regex, without its backtracking.
+"""
+
+import random
+import re
+import time
+
+import pytest
+
+from src.truth_boundary.gate import TruthBoundaryGate
+from src.truth_boundary.numeric_extractor import extract_numbers, iter_numbers
+
+
+LEGACY_PATTERN = re.compile(r'([a-zA-Z_][\w\s\-]*?)[\s:=]+(-?\d+\.?\d*(?:[eE][+-]?\d+)?%?)')
+
+
+@pytest.mark.parametrize("stdout,expected", [
+    ("correlation: 0.95", {'correlation': 0.95}),
+    ("mean_return = -0.0234", {'mean_return': -0.0234}),
+    ("P-value 1e-05", {'P_value': 1e-05}),
+    ("Total Return: 12.5%", {'Total_Return': 12.5}),
+    ("Correlation:\n0.95", {'Correlation': 0.95}),
+    ("a: b: 3", {'b': 3.0}),
+    ("Sharpe (annual): 1.2", {}),
+])
+def test_formats(stdout, expected):
+    assert extract_numbers(stdout) == expected
+    assert TruthBoundaryGate.parse_numerical_output(stdout) == expected
+
+
+def test_matches_legacy_regex_on_random_inputs():
+    """Differential check against re.findall with the old pattern."""
+    alphabet = list("ab_ xE-e.:=\n\t%(5190é")
+    rng = random.Random(12)
+
+    for _ in range(20_000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert list(iter_numbers(text)) == LEGACY_PATTERN.findall(text), repr(text)
+
+
+@pytest.mark.parametrize("text", [
+    "a" + " " * 1_000_000 + "x",
+    "key" + "\t \n" * 300_000 + "x",
+    "alpha beta gamma " * 60_000,
+    "key :=: " * 120_000,
+    "a 1e" * 250_000,
+    "a(" * 500_000,
+])
+def test_adversarial_inputs_stay_linear(text):
+    """~1MB inputs that make the legacy regex run for minutes."""
+    start = time.perf_counter()
+    extract_numbers(text)
+    assert time.perf_counter() - start < 2.0
@@ -0,0 +1,123 @@
+"""
+Unit tests for bounded VEE output capture.
+
+Week 12: Streamed, capped stdout/stderr with a framed result channel.
+No Docker needed: the runner is exercised with a fake container.
+"""
+
+import json
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.truth_boundary.gate import TruthBoundaryGate
+from src.vee.output_capture import RESULT_BEGIN, RESULT_END, RESULT_PREAMBLE, OutputCapture
+from src.vee.sandbox_runner import SandboxRunner
+
+
+def frame(payload: dict) -> bytes:
+    return b"\n" + RESULT_BEGIN + json.dumps(payload).encode() + RESULT_END + b"\n"
+
+
+class TestOutputCapture:
+    """Frame extraction, tail and cap."""
+
+    def test_frame_split_across_chunks(self):
+        capture = OutputCapture()
+        data = b"progress 1\n" + frame({'sharpe': 1.2}) + b"done\n"
+        for i in range(0, len(data), 7):
+            capture.feed_stdout(data[i:i + 7])
+        capture.close()
+
+        assert json.loads(capture.result_json) == {'sharpe': 1.2}
+        assert capture.stdout == "progress 1\n\ndone\n"
+        assert not capture.truncated
+
+    def test_sentinel_mid_line_is_plain_output(self):
+        capture = OutputCapture()
+        capture.feed_stdout(b"echo " + RESULT_BEGIN + b"{}" + RESULT_END + b"\n")
+
+        assert capture.result_json is None
+        assert RESULT_BEGIN.decode() in capture.stdout
+
+    def test_tail_is_bounded(self):
+        capture = OutputCapture(tail_bytes=100)
+        for i in range(10_000):
+            capture.feed_stdout(f"line {i}\n".encode())
+
+        assert capture.stdout.endswith("line 9999\n")
+        assert len(capture.stdout) <= 100
+        assert capture.stdout_bytes > 80_000
+        assert capture.truncated and not capture.limit_exceeded
+
+    def test_cap_stops_reading(self):
+        capture = OutputCapture(max_bytes=1000)
+        capture.feed_stderr(b"x" * 600)
+        capture.feed_stdout(b"y" * 600)
+        capture.feed_stdout(b"z" * 600)
+
+        assert capture.limit_exceeded
+        assert capture.total_bytes == 1000
+
+    def test_oversized_result_is_dropped(self):
+        capture = OutputCapture(max_result_bytes=64)
+        capture.feed_stdout(frame({'values': list(range(100))}))
+        capture.feed_stdout(b"after\n")
+
+        assert capture.result_json is None
+        assert capture.result_truncated
+        assert capture.stdout.strip() == "after"
+
+    def test_preamble_publishes_result_dict(self):
+        code = RESULT_PREAMBLE + "result = {'correlation': 0.87}\nprint('not json')\n"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True).stdout
+
+        capture = OutputCapture()
+        capture.feed_stdout(out)
+        capture.close()
+
+        assert json.loads(capture.result_json) == {'correlation': 0.87}
+        assert capture.stdout.strip() == "not json"
+
+
+class TestSandboxStreaming:
+    """SandboxRunner reads through OutputCapture."""
+
+    @pytest.fixture
+    def make_runner(self):
+        def make(chunks, **kwargs):
+            container = MagicMock()
+            container.attach.return_value = iter(chunks)
+            container.wait.return_value = {'StatusCode': 0}
+            container.stats.return_value = {'memory_stats': {'usage': 0}}
+            client = MagicMock()
+            client.containers.run.return_value = container
+            with patch('src.vee.sandbox_runner.docker.from_env', return_value=client):
+                return SandboxRunner(**kwargs), container
+        return make
+
+    def test_result_channel_reaches_gate(self, make_runner):
+        runner, _ = make_runner([
+            (b"noise {not json}\n", None),
+            (frame({'sharpe_ratio': 1.42}), b"FutureWarning: ignored\n"),
+        ])
+        result = runner.execute("emit_result({'sharpe_ratio': 1.42})")
+
+        assert result.status == "success"
+        assert result.result_json is not None
+        validation = TruthBoundaryGate().validate(result)
+        assert validation.is_valid
+        assert validation.extracted_values == {'sharpe_ratio': 1.42}
+
+    def test_output_cap_kills_container(self, make_runner):
+        runner, container = make_runner([(b"a" * 4096, None)] * 100, max_output_bytes=10_000)
+        result = runner.execute("while True: print('a' * 4096)")
+
+        container.kill.assert_called()
+        assert result.status == "error"
+        assert result.exit_code == -3
+        assert result.stdout_bytes == 10_000
+        assert result.output_truncated
+        assert len(result.stdout) <= runner.output_tail_bytes